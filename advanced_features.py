@@ -12,14 +12,15 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import schedule
 import threading
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-import pandas as pd
 from config import Config
 
+def chrome_driver():
+    """A Chrome WebDriver; selenium is only imported when a browser is needed"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+    return webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+
 class AdvancedFeatures:
     def __init__(self):
         self.config = Config()
@@ -266,6 +267,7 @@ class AdvancedFeatures:
     def scrape_news_headlines(self, url):
         """Scrape news headlines"""
         try:
+            from bs4 import BeautifulSoup
             response = requests.get(url)
             soup = BeautifulSoup(response.content, 'html.parser')
             
@@ -332,7 +334,8 @@ class AdvancedFeatures:
     def scrape_custom_website(self, url, selectors):
         """Scrape custom website with specific selectors"""
         try:
-            driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+            from selenium.webdriver.common.by import By
+            driver = chrome_driver()
             driver.get(url)
             
             scraped_data = {}
@@ -354,7 +357,8 @@ class AdvancedFeatures:
         def price_monitor():
             while True:
                 try:
-                    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
+                    from selenium.webdriver.common.by import By
+                    driver = chrome_driver()
                     driver.get(url)
                     
                     # Find price element (customize selector as needed)
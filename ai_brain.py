@@ -3,102 +3,312 @@ JARVIS AI Brain Module
 Advanced AI capabilities using OpenAI GPT
 """
 
-import openai
-import json
-import requests
+import asyncio
+import time
+from collections import Counter
 from datetime import datetime
 from config import Config
-import speech_recognition as sr
-import pyttsx3
+from keyword_matcher import match_keywords
+from response_cache import ResponseCache
+from sentence_stream import SentenceSegmenter, split_sentences
+from conversation_context import ConversationContext
+from async_brain import AsyncBrainClient
+from intent_classifier import GENERAL, IntentClassifier, label_utterance, seed_examples
+from model_artifact import ModelArtifactError
+from model_trainer import BackgroundTrainer
+from preference_store import PreferenceStore
+from metrics import LLM_CACHE, LLM_FALLBACKS, LLM_SECONDS
+from tracing import span
 
 class AIBrain:
     def __init__(self):
         self.config = Config()
-        self.client = openai.OpenAI(api_key=self.config.OPENAI_API_KEY)
-        self.conversation_history = []
+        import openai  # Deferred so routed commands never pay for loading the SDK
+        self.client = openai.OpenAI(
+            api_key=self.config.OPENAI_API_KEY,
+            base_url=self.config.OPENAI_BASE_URL,
+            timeout=self.config.BRAIN_DEADLINE_SECONDS
+        )
+        self.conversation = self.new_conversation()
         self.user_preferences = self.load_preferences()
+        self.response_cache = self.new_response_cache()
+        self.async_client = self.new_async_client()
+        self.intent_model_dir = 'intent_model'
+        self.intent_history_fn = None
+        self.intent_history_rows = 0
+        self.intent_classifier = self.load_intent_classifier()
+        self.intent_trainer = BackgroundTrainer(
+            self.build_intent_classifier,
+            self.swap_intent_classifier,
+            debounce_seconds=self.config.TRAINING_DEBOUNCE_SECONDS,
+            name="jarvis-intent-trainer"
+        )
         
-    def load_preferences(self):
-        """Load user preferences from file"""
+    def new_conversation(self):
+        """Create an empty conversation context"""
+        return ConversationContext(
+            max_turns=self.config.CONTEXT_MAX_TURNS,
+            token_budget=self.config.CONTEXT_TOKEN_BUDGET,
+            model=self.config.AI_MODEL
+        )
+    
+    def new_response_cache(self):
+        """Create the response cache, or None when it is disabled"""
+        if not self.config.RESPONSE_CACHE_ENABLED:
+            return None
+        return ResponseCache(
+            max_entries=self.config.RESPONSE_CACHE_MAX_ENTRIES,
+            ttl_seconds=self.config.RESPONSE_CACHE_TTL_SECONDS,
+            disk_file=self.config.RESPONSE_CACHE_FILE or None,
+            similarity_threshold=self.config.RESPONSE_CACHE_SIMILARITY or None
+        )
+    
+    def new_async_client(self):
+        """Create the deadline/retry/circuit-breaker client, or None to call the API directly"""
+        if not self.config.BRAIN_ASYNC_CLIENT:
+            return None
+        return AsyncBrainClient(
+            self,
+            deadline=self.config.BRAIN_DEADLINE_SECONDS,
+            max_concurrency=self.config.BRAIN_MAX_CONCURRENCY,
+            max_retries=self.config.BRAIN_MAX_RETRIES,
+            hedge=self.config.BRAIN_HEDGE,
+            hedge_percentile=self.config.BRAIN_HEDGE_PERCENTILE,
+            failure_threshold=self.config.BRAIN_BREAKER_FAILURES,
+            reset_timeout=self.config.BRAIN_BREAKER_RESET_SECONDS
+        )
+    
+    def load_intent_classifier(self):
+        """Load the local intent classifier, training it from the keyword tables on first run"""
+        if not self.config.INTENT_CLASSIFIER_ENABLED:
+            return None
+        try:
+            classifier = IntentClassifier.load(self.intent_model_dir, verify=self.config.MODEL_VERIFY_CHECKSUMS)
+            if classifier is not None:
+                return classifier
+        except (ModelArtifactError, KeyError) as e:
+            print(f"Intent model load error: {e}")
+        
+        try:
+            classifier = self.build_intent_classifier()
+            classifier.save(self.intent_model_dir)
+            return classifier
+        except Exception as e:
+            print(f"Intent model training error: {e}")
+            return None
+    
+    def build_intent_classifier(self):
+        """Train a classifier on the seed examples plus any attached interaction history"""
+        examples = seed_examples()
+        seed_counts = Counter(label for _, label in examples)
+        history = self.intent_history_fn() if self.intent_history_fn else []
+        # History is labelled by the keyword router, so most of it is unmatched GENERAL
+        # chat; each label takes at most as many (newest) utterances as it has seeds
+        taken = Counter()
+        for text in history:
+            label = label_utterance(text)
+            if taken[label] < seed_counts[label]:
+                taken[label] += 1
+                examples.append((text, label))
+        return IntentClassifier.train(examples, metadata={"history_rows": self.intent_history_rows})
+    
+    def swap_intent_classifier(self, classifier):
+        """Serve a retrained classifier and persist it"""
+        self.intent_classifier = classifier
         try:
-            with open('user_preferences.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {
-                "name": "Sir",
-                "preferred_voice": "male",
-                "interests": [],
-                "schedule": {},
-                "security_level": "high"
-            }
+            classifier.save(self.intent_model_dir)
+        except OSError as e:
+            print(f"Intent model save error: {e}")
+    
+    def attach_intent_history(self, history_fn, history_rows):
+        """Also learn from interaction history, retraining in the background once enough is new"""
+        self.intent_history_fn = history_fn
+        self.intent_history_rows = history_rows
+        if self.intent_classifier is None:
+            return
+        trained_rows = self.intent_classifier.metadata.get("history_rows", 0)
+        if history_rows - trained_rows >= self.config.INTENT_RETRAIN_ROWS:
+            self.intent_trainer.request()
+    
+    def load_preferences(self):
+        """Open the preference store and return its live preference document"""
+        self.preferences_store = PreferenceStore(
+            path=self.config.PREFERENCES_FILE,
+            feedback_file=self.config.FEEDBACK_LOG_FILE,
+            flush_interval=self.config.PREFERENCES_FLUSH_SECONDS,
+            fsync=self.config.JOURNAL_FSYNC
+        )
+        return self.preferences_store.data
     
     def save_preferences(self):
-        """Save user preferences to file"""
-        with open('user_preferences.json', 'w') as f:
-            json.dump(self.user_preferences, f, indent=2)
+        """Schedule a write of the user preferences (coalesced, written in the background)"""
+        self.preferences_store.mark_dirty()
     
     def process_command(self, user_input):
         """Process user command with AI understanding"""
         try:
-            # Add context to the prompt
-            context = f"""
-            You are JARVIS, Tony Stark's AI assistant. You are highly intelligent, 
-            witty, and capable of handling any task. The user is {self.user_preferences.get('name', 'Sir')}.
-            
-            Current time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-            Previous conversation: {self.conversation_history[-3:] if self.conversation_history else 'None'}
-            
-            User said: {user_input}
+            # Repeated prompts are answered from the cache without a round trip
+            ai_response = self.cached_response(user_input)
+            if ai_response is None:
+                start = time.perf_counter()
+                with span("llm.request") as request, LLM_SECONDS.time(mode="request"):
+                    ai_response, fallback = self.fetch_response(user_input)
+                    request.set(fallback=fallback)
+                if fallback:
+                    LLM_FALLBACKS.inc()
+                if self.response_cache and not fallback:
+                    self.response_cache.put(user_input, ai_response, time.perf_counter() - start)
             
-            Respond as JARVIS would - be helpful, intelligent, and slightly witty. 
-            If the user asks for something you can do, acknowledge it and explain how you'll help.
-            If it's something complex, break it down into steps.
-            """
-            
-            response = self.client.chat.completions.create(
-                model=self.config.AI_MODEL,
-                messages=[
-                    {"role": "system", "content": context},
-                    {"role": "user", "content": user_input}
-                ],
-                max_tokens=self.config.MAX_TOKENS,
-                temperature=self.config.TEMPERATURE
-            )
+            self.remember_exchange(user_input, ai_response)
+            return ai_response
             
-            ai_response = response.choices[0].message.content
-            self.conversation_history.append({
-                "timestamp": datetime.now().isoformat(),
-                "user": user_input,
-                "jarvis": ai_response
-            })
+        except Exception as e:
+            return f"I apologize, Sir. I'm experiencing some technical difficulties: {str(e)}"
+    
+    def process_command_streaming(self, user_input, on_sentence):
+        """Process a command while streaming the reply, one sentence at a time.
+        
+        on_sentence is called with each complete sentence as soon as the model
+        has produced it (e.g. to queue it for speech); the full reply is
+        returned once generation has finished. If the stream fails before
+        anything was produced the reply comes from the guarded non-streaming
+        path instead; if it fails part-way, what was produced is kept.
+        """
+        try:
+            ai_response = self.cached_response(user_input)
+            if ai_response is not None:
+                for sentence in split_sentences(ai_response):
+                    on_sentence(sentence)
+            else:
+                start = time.perf_counter()
+                segmenter = SentenceSegmenter()
+                parts = []
+                first_sentence = True
+                fallback = False
+                with span("llm.stream") as stream, LLM_SECONDS.time(mode="stream"):
+                    try:
+                        for delta in self.stream_completion(user_input):
+                            parts.append(delta)
+                            for sentence in segmenter.feed(delta):
+                                if first_sentence:
+                                    stream.set(first_sentence_ms=(time.perf_counter() - start) * 1000)
+                                    first_sentence = False
+                                on_sentence(sentence)
+                    except Exception as e:
+                        print(f"Brain stream error: {e!r}")
+                        fallback = True
+                        if not parts:
+                            if isinstance(e, asyncio.TimeoutError) and self.async_client is not None:
+                                # The deadline is spent; answer now rather than wait out another one
+                                ai_response = self.async_client.fallback(user_input, 1).text
+                            else:
+                                ai_response, fallback = self.fetch_response(user_input)
+                            parts.append(ai_response)
+                            for sentence in segmenter.feed(ai_response):
+                                on_sentence(sentence)
+                    for sentence in segmenter.flush():
+                        on_sentence(sentence)
+                    stream.set(fallback=fallback)
+                
+                ai_response = "".join(parts)
+                if fallback:
+                    LLM_FALLBACKS.inc()
+                if self.response_cache and not fallback:
+                    self.response_cache.put(user_input, ai_response, time.perf_counter() - start)
             
+            self.remember_exchange(user_input, ai_response)
             return ai_response
             
         except Exception as e:
-            return f"I apologize, Sir. I'm experiencing some technical difficulties: {str(e)}"
+            apology = f"I apologize, Sir. I'm experiencing some technical difficulties: {str(e)}"
+            on_sentence(apology)
+            return apology
     
-    def analyze_intent(self, user_input):
-        """Analyze user intent and categorize the request"""
-        intents = {
-            "system_control": ["shutdown", "restart", "sleep", "lock", "volume", "brightness"],
-            "web_search": ["search", "google", "find", "look up", "what is"],
-            "entertainment": ["play", "music", "video", "movie", "youtube", "netflix"],
-            "productivity": ["schedule", "reminder", "calendar", "email", "document"],
-            "information": ["weather", "news", "time", "date", "stock", "price"],
-            "communication": ["call", "message", "email", "text", "contact"],
-            "file_management": ["file", "folder", "document", "save", "delete", "organize"],
-            "security": ["security", "lock", "encrypt", "backup", "scan"],
-            "emergency": ["help", "emergency", "urgent", "911", "police", "fire"]
-        }
+    def cached_response(self, user_input):
+        """A cached reply to this prompt, or None"""
+        if not self.response_cache:
+            return None
+        with span("llm.cache_lookup"):
+            ai_response = self.response_cache.get(user_input)
+        LLM_CACHE.inc(result="miss" if ai_response is None else "hit")
+        return ai_response
+    
+    def remember_exchange(self, user_input, ai_response):
+        """Add an exchange to the bounded conversation context"""
+        self.conversation.add_turn(user_input, ai_response)
+    
+    def build_messages(self, user_input):
+        """System context, budgeted history and the user's message for a chat completion"""
+        # Earlier turns go in as chat messages (or summary lines), not in the system text
+        context = (
+            "You are JARVIS, Tony Stark's AI assistant. You are highly intelligent, "
+            f"witty, and capable of handling any task. The user is {self.user_preferences.get('name', 'Sir')}.\n"
+            f"Current time: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
+            "Respond as JARVIS would - be helpful, intelligent, and slightly witty. "
+            "If the user asks for something you can do, acknowledge it and explain how you'll help. "
+            "If it's something complex, break it down into steps."
+        )
         
-        user_input_lower = user_input.lower()
-        detected_intents = []
+        return self.conversation.build_messages(context, user_input)
+    
+    def fetch_response(self, user_input):
+        """Reply text and whether it is a canned fallback rather than a model answer"""
+        if self.async_client is None:
+            return self.request_completion(user_input), False
+        reply = self.async_client.run(user_input)
+        return reply.text, reply.fallback
+    
+    def request_completion(self, user_input):
+        """Ask the chat model for a JARVIS-style reply"""
+        response = self.client.chat.completions.create(
+            model=self.config.AI_MODEL,
+            messages=self.build_messages(user_input),
+            max_tokens=self.config.MAX_TOKENS,
+            temperature=self.config.TEMPERATURE
+        )
         
-        for intent, keywords in intents.items():
-            if any(keyword in user_input_lower for keyword in keywords):
-                detected_intents.append(intent)
+        return response.choices[0].message.content
+    
+    def stream_completion(self, user_input):
+        """Yield the chat model's reply in pieces as it is generated"""
+        if self.async_client is not None:
+            # Same breaker, concurrency limit and deadline as non-streaming requests
+            yield from self.async_client.stream(user_input, self.build_messages(user_input))
+            return
+        stream = self.client.chat.completions.create(
+            model=self.config.AI_MODEL,
+            messages=self.build_messages(user_input),
+            max_tokens=self.config.MAX_TOKENS,
+            temperature=self.config.TEMPERATURE,
+            stream=True
+        )
         
-        return detected_intents
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
+    def get_cache_stats(self):
+        """Response cache hit rate and model latency saved"""
+        return self.response_cache.stats() if self.response_cache else {}
+    
+    def get_client_stats(self):
+        """Retry, hedge, fallback and circuit breaker counters of the async client"""
+        return self.async_client.stats() if self.async_client else {}
+    
+    def analyze_intent(self, user_input):
+        """Analyze user intent and categorize the request"""
+        # One pass of the shared compiled matcher (see keyword_matcher.INTENT_KEYWORDS)
+        return list(match_keywords(user_input).intents)
+    
+    def predict_intent(self, user_input):
+        """Routable intent from the local classifier, or None to leave the utterance to the LLM"""
+        if self.intent_classifier is None:
+            return None
+        with span("intent.predict"):
+            prediction = self.intent_classifier.predict(user_input)
+        if prediction.intent == GENERAL or prediction.confidence < self.config.INTENT_CONFIDENCE_THRESHOLD:
+            return None
+        return prediction.intent
     
     def generate_response(self, user_input, intent_type=None):
         """Generate contextual response based on intent"""
@@ -114,18 +324,17 @@ class AIBrain:
     def learn_from_interaction(self, user_input, response, user_feedback=None):
         """Learn from user interactions to improve responses"""
         if user_feedback:
-            self.user_preferences["feedback"] = self.user_preferences.get("feedback", [])
-            self.user_preferences["feedback"].append({
+            # One appended line per event; the preference document is left alone
+            self.preferences_store.append_feedback({
                 "input": user_input,
                 "response": response,
                 "feedback": user_feedback,
                 "timestamp": datetime.now().isoformat()
             })
-            self.save_preferences()
     
-    def get_smart_suggestions(self, context=""):
-        """Provide smart suggestions based on context and time"""
-        current_hour = datetime.now().hour
+    def get_smart_suggestions(self, context="", hour=None):
+        """Provide smart suggestions based on context and time (of the given hour, default now)"""
+        current_hour = datetime.now().hour if hour is None else hour
         
         suggestions = []
         
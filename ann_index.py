@@ -0,0 +1,181 @@
+"""
+JARVIS Approximate Interaction Index
+Random-projection LSH over the cached TF-IDF rows
+"""
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.preprocessing import normalize
+
+from interaction_index import InteractionIndex
+
+
+class _BucketTable:
+    """Hash-key -> row-position lookup for one LSH table.
+
+    Most entries live in sorted numpy arrays searched with searchsorted;
+    new rows go to a small dict that is merged in once it grows past a
+    fraction of the main arrays, keeping inserts amortized cheap without a
+    Python object per row.
+    """
+
+    def __init__(self):
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.positions = np.zeros(0, dtype=np.int64)
+        self.delta = {}
+        self.delta_size = 0
+
+    def insert(self, keys, positions):
+        if len(keys) > 1024:
+            # Bulk loads go straight into the sorted arrays
+            self.merge(keys, positions)
+            return
+        for key, position in zip(keys.tolist(), positions.tolist()):
+            self.delta.setdefault(key, []).append(position)
+        self.delta_size += len(keys)
+        if self.delta_size > max(1024, len(self.keys) // 10):
+            self.merge()
+
+    def merge(self, extra_keys=None, extra_positions=None):
+        parts_keys, parts_positions = [self.keys], [self.positions]
+        if self.delta_size:
+            parts_keys.append(np.fromiter(
+                (key for key, positions in self.delta.items() for _ in positions),
+                dtype=np.int64, count=self.delta_size
+            ))
+            parts_positions.append(np.fromiter(
+                (position for positions in self.delta.values() for position in positions),
+                dtype=np.int64, count=self.delta_size
+            ))
+        if extra_keys is not None:
+            parts_keys.append(np.asarray(extra_keys, dtype=np.int64))
+            parts_positions.append(np.asarray(extra_positions, dtype=np.int64))
+        if len(parts_keys) == 1:
+            return
+        keys = np.concatenate(parts_keys)
+        positions = np.concatenate(parts_positions)
+        order = np.argsort(keys, kind='stable')
+        self.keys, self.positions = keys[order], positions[order]
+        self.delta = {}
+        self.delta_size = 0
+
+    def lookup(self, keys):
+        probe = np.asarray(keys, dtype=np.int64)
+        lows = np.searchsorted(self.keys, probe, side='left')
+        highs = np.searchsorted(self.keys, probe, side='right')
+        found = [self.positions[lo:hi] for lo, hi in zip(lows, highs) if hi > lo]
+        if self.delta:
+            for key in keys:
+                if key in self.delta:
+                    found.append(np.array(self.delta[key], dtype=np.int64))
+        return found
+
+
+class LSHInteractionIndex(InteractionIndex):
+    """InteractionIndex with random-projection (SimHash) candidate search.
+
+    Each of ``n_tables`` tables hashes a row to ``n_bits`` sign bits of
+    random projections. A query only scores rows sharing a bucket
+    with it in at least one table (plus, with ``multi_probe``, buckets one
+    bit flip away), then re-ranks those candidates exactly. More tables or
+    probes raise recall; more bits shrink buckets and lower latency.
+    """
+
+    def __init__(self, index_dir='interaction_index', n_tables=8, n_bits=12,
+                 multi_probe=True, seed=42):
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.multi_probe = multi_probe
+        self.seed = seed
+        self.planes = None
+        self.last_candidates = 0
+        super().__init__(index_dir)
+
+    def clear(self, n_features=0):
+        super().clear(n_features)
+        self.planes = None
+        self.tables = [_BucketTable() for _ in range(self.n_tables)]
+
+    def _ensure_planes(self):
+        if self.planes is None or self.planes.shape[0] != self.n_features:
+            # Random +/-1 planes work as well as Gaussian ones for SimHash and
+            # keep wide hashed feature spaces small. They are derived from the
+            # seed, so they never need persisting.
+            rng = np.random.default_rng(self.seed)
+            self.planes = rng.choice(
+                np.array([-1, 1], dtype=np.int8),
+                size=(self.n_features, self.n_tables * self.n_bits)
+            )
+        return self.planes
+
+    def _hash(self, vectors):
+        """Return an (n_rows, n_tables) array of bucket keys"""
+        vectors = csr_matrix(vectors)
+        planes = self._ensure_planes()
+
+        # Project through only the plane rows of features that occur here
+        columns, remapped = np.unique(vectors.indices, return_inverse=True)
+        compact = csr_matrix(
+            (vectors.data, remapped.ravel(), vectors.indptr),
+            shape=(vectors.shape[0], len(columns))
+        )
+        projections = np.asarray(compact @ planes[columns].astype(np.float32))
+
+        bits = (projections > 0).reshape(-1, self.n_tables, self.n_bits)
+        weights = 1 << np.arange(self.n_bits, dtype=np.int64)
+        return bits.astype(np.int64) @ weights
+
+    def add_rows(self, vectors, row_ids):
+        start = self.n_rows
+        super().add_rows(vectors, row_ids)
+        self._insert_range(start, self.n_rows)
+
+    def _insert_range(self, start, stop):
+        if stop <= start:
+            return
+        keys = self._hash(self.matrix[start:stop])
+        positions = np.arange(start, stop, dtype=np.int64)
+        for table, table_keys in zip(self.tables, keys.T):
+            table.insert(table_keys, positions)
+
+    def from_arrays(self, artifact, prefix=''):
+        loaded = super().from_arrays(artifact, prefix)
+        if loaded:
+            for offset in range(0, self.n_rows, 100_000):
+                self._insert_range(offset, min(offset + 100_000, self.n_rows))
+        return loaded
+
+    def _probe_keys(self, key):
+        if not self.multi_probe:
+            return [key]
+        return [key] + [key ^ (1 << bit) for bit in range(self.n_bits)]
+
+    def candidates(self, query):
+        """Row positions sharing a probed bucket with the query vector"""
+        query_keys = self._hash(query)[0]
+        found = []
+        for table, key in zip(self.tables, query_keys.tolist()):
+            found.extend(table.lookup(self._probe_keys(key)))
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(found))
+
+    def query(self, vector, k=3, threshold=0.3):
+        """Approximate top-k: exact re-ranking over LSH candidates only"""
+        if not self.n_rows:
+            return []
+
+        query = normalize(csr_matrix(vector, dtype=np.float32), norm='l2')
+        positions = self.candidates(query)
+        self.last_candidates = len(positions)
+        if not len(positions):
+            return []
+
+        scores = self.matrix[positions].dot(query.toarray().ravel())
+
+        keep = np.flatnonzero(scores > threshold)
+        if len(keep) > k:
+            keep = keep[np.argpartition(scores[keep], -k)[-k:]]
+        keep = keep[np.argsort(-scores[keep], kind='stable')]
+
+        return [(int(self._row_ids[positions[i]]), float(scores[i])) for i in keep]
@@ -0,0 +1,436 @@
+"""
+JARVIS Async Brain Client
+Deadlines, retries, circuit breaking and hedging for AI brain requests
+"""
+
+import asyncio
+import queue
+import random
+import threading
+import time
+from collections import deque, namedtuple
+
+import openai
+
+BrainReply = namedtuple("BrainReply", ["text", "fallback", "attempts", "hedged"])
+
+# Errors worth another attempt; anything else fails the request at once
+RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError
+)
+
+# Intents AIBrain.generate_response answers without calling the model
+CANNED_INTENTS = ("emergency", "system_control", "web_search")
+
+FALLBACK_RESPONSE = ("My language systems are not responding at the moment, Sir. "
+                     "I can still run local commands for you.")
+
+
+class BrainUnavailable(Exception):
+    """Raised by AsyncBrainClient.stream when the circuit breaker refuses the request"""
+
+
+def _retrieve_exception(task):
+    # A losing hedge's error is expected (it may land after cancellation); mark it retrieved
+    if not task.cancelled():
+        task.exception()
+
+
+class CircuitBreaker:
+    """Stops calling an upstream that keeps failing.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    requests are refused for ``reset_timeout`` seconds. Then a single trial
+    request is let through (half-open): success closes the breaker again,
+    failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if self.clock() - self.opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self):
+        """True if a request may be sent now"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.clock() - self.opened_at < self.reset_timeout or self.trial_running:
+                return False
+            self.trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+            self.trial_running = False
+
+
+class LatencyTracker:
+    """Sliding window of recent request latencies"""
+
+    def __init__(self, window=200, min_samples=20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+
+    def percentile(self, q):
+        """The q-th percentile (0-100), or None until enough samples exist"""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+class AsyncBrainClient:
+    """asyncio chat-completions client for AIBrain.
+
+    One AsyncOpenAI client (and so one pooled HTTP connection set) serves
+    every request. Each request gets a deadline covering queueing, retries
+    and backoff; at most ``max_concurrency`` requests are in flight.
+    Retryable errors are retried with full-jitter exponential backoff.
+    Once enough latencies are known, a request still running past the
+    ``hedge_percentile`` latency is hedged with a second identical request
+    and the first answer wins. The percentile should sit below the slow
+    tail being cut (p90 hedges a 5% tail; p95 would wait it out), and the
+    trigger is capped at ``hedge_median_factor`` times the median, so a
+    burst of slow answers in the window does not push it out of reach.
+    A backup holds a concurrency slot of its own and is only sent if one
+    is free, so hedging never pushes more than ``max_concurrency``
+    requests upstream.
+    When the circuit breaker is open or a request fails for good, a canned
+    answer is returned instead (marked ``fallback``).
+
+    ``stream`` sends a streamed request under the same breaker and
+    concurrency limit, with a deadline on the first chunk (and on any stall
+    after it); it is not retried or hedged, since part of the reply may
+    already have been spoken, so callers fall back to ``run`` on error.
+
+    ``run`` and ``stream`` are blocking bridges for the voice loop: requests
+    execute on a private event loop thread.
+    """
+
+    def __init__(self, brain, deadline=10.0, max_concurrency=4, max_retries=2,
+                 backoff_base=0.25, backoff_max=2.0, hedge=True, hedge_percentile=90,
+                 hedge_median_factor=3.0, hedge_min_samples=5, failure_threshold=5, reset_timeout=30.0):
+        self.brain = brain
+        self.deadline = deadline
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_median_factor = hedge_median_factor
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latencies = LatencyTracker(min_samples=hedge_min_samples)
+
+        self.client = None
+        self.semaphore = None
+        self.loop = None
+        self._loop_thread = None
+        self._loop_lock = threading.Lock()
+
+        self.counters = {
+            "requests": 0,
+            "streams": 0,
+            "successes": 0,
+            "attempts": 0,
+            "retries": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "hedges_skipped": 0,
+            "timeouts": 0,
+            "errors": 0,
+            "fallbacks": 0,
+            "breaker_rejections": 0
+        }
+
+    def _ensure_client(self):
+        # Created lazily so that they bind to the loop the requests run on
+        if self.client is None:
+            self.client = openai.AsyncOpenAI(
+                api_key=self.brain.config.OPENAI_API_KEY,
+                base_url=self.brain.config.OPENAI_BASE_URL,
+                max_retries=0
+            )
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    # Requests
+
+    async def complete(self, user_input, messages=None):
+        """Answer a prompt within the deadline; never raises"""
+        self._ensure_client()
+        self.counters["requests"] += 1
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline
+        messages = messages or self.brain.build_messages(user_input)
+
+        if not self.breaker.allow():
+            self.counters["breaker_rejections"] += 1
+            return self.fallback(user_input, attempts=0)
+
+        attempts = []
+        try:
+            # wait_for cancels the attempts when the deadline passes
+            return await asyncio.wait_for(self._attempt(messages, deadline, attempts), self.deadline)
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+        except Exception as e:
+            print(f"Brain request error: {e}")
+            self.counters["errors"] += 1
+
+        self.breaker.record_failure()
+        return self.fallback(user_input, len(attempts))
+
+    async def _attempt(self, messages, deadline, attempts):
+        """Send the request until it succeeds or the retries run out; attempts gets one entry per try"""
+        loop = asyncio.get_running_loop()
+        async with self.semaphore:
+            while True:
+                attempts.append(loop.time())
+                try:
+                    text, hedged = await self._hedged_request(messages)
+                    self.breaker.record_success()
+                    self.counters["successes"] += 1
+                    return BrainReply(text, False, len(attempts), hedged)
+                except RETRYABLE_ERRORS:
+                    if len(attempts) > self.max_retries:
+                        raise
+                self.counters["retries"] += 1
+                # The first retry goes out at once; later ones back off
+                if len(attempts) > 1:
+                    delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (len(attempts) - 2)))
+                    await asyncio.sleep(min(delay, max(deadline - loop.time(), 0)))
+
+    async def _request(self, messages):
+        self.counters["attempts"] += 1
+        start = time.perf_counter()
+        response = await self.client.chat.completions.create(
+            model=self.brain.config.AI_MODEL,
+            messages=messages,
+            max_tokens=self.brain.config.MAX_TOKENS,
+            temperature=self.brain.config.TEMPERATURE
+        )
+        self.latencies.record(time.perf_counter() - start)
+        return response.choices[0].message.content
+
+    async def _hedged_request(self, messages):
+        """Send one request, and a backup if the first outlives the hedge percentile latency.
+
+        A backup that fails while the primary is still running is replaced,
+        up to ``max_retries`` times, so one fast error does not leave the
+        request waiting on a slow primary.
+        """
+        primary = asyncio.ensure_future(self._request(messages))
+        threshold = self.hedge_threshold() if self.hedge else None
+        if threshold is None:
+            return await primary, False
+
+        backups = []
+        primary.add_done_callback(_retrieve_exception)
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=threshold)
+            if done:
+                return primary.result(), False
+
+            backup = await self._backup_request(messages)
+            if backup is None:
+                return await primary, False
+            backups.append(backup)
+            pending = {primary, backup}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.counters["hedge_wins"] += 1
+                        return task.result(), True
+                if primary in pending and len(backups) <= self.max_retries:
+                    backup = await self._backup_request(messages)
+                    if backup is not None:
+                        backups.append(backup)
+                        pending.add(backup)
+            # All failed; surface the primary's error
+            return primary.result(), True
+        finally:
+            for task in (primary, *backups):
+                if not task.done():
+                    task.cancel()
+
+    async def _backup_request(self, messages):
+        """A backup request holding its own concurrency slot, or None if none is free"""
+        if self.semaphore.locked():
+            self.counters["hedges_skipped"] += 1
+            return None
+        await self.semaphore.acquire()  # A slot is free, so this does not wait
+        self.counters["hedges"] += 1
+        backup = asyncio.ensure_future(self._request(messages))
+        backup.add_done_callback(_retrieve_exception)
+        # Released however the backup ends, even if it is cancelled before it starts
+        backup.add_done_callback(lambda task: self.semaphore.release())
+        return backup
+
+    def hedge_threshold(self):
+        """Seconds after which a request is hedged, or None until enough latencies are known"""
+        threshold = self.latencies.percentile(self.hedge_percentile)
+        if threshold is None:
+            return None
+        return min(threshold, self.latencies.percentile(50) * self.hedge_median_factor)
+
+    def fallback(self, user_input, attempts):
+        """Canned generate_response answer for the prompt's intent"""
+        self.counters["fallbacks"] += 1
+        for intent in self.brain.analyze_intent(user_input):
+            if intent in CANNED_INTENTS:
+                return BrainReply(self.brain.generate_response(user_input, intent), True, attempts, False)
+        return BrainReply(FALLBACK_RESPONSE, True, attempts, False)
+
+    # Streaming
+
+    async def _open_stream(self, messages):
+        """The response stream, its chunk iterator and its first chunk (None if it is empty)"""
+        self.counters["attempts"] += 1
+        stream = await self.client.chat.completions.create(
+            model=self.brain.config.AI_MODEL,
+            messages=messages,
+            max_tokens=self.brain.config.MAX_TOKENS,
+            temperature=self.brain.config.TEMPERATURE,
+            stream=True
+        )
+        chunks = stream.__aiter__()
+        try:
+            return stream, chunks, await chunks.__anext__()
+        except StopAsyncIteration:
+            return stream, chunks, None
+        except BaseException:
+            await stream.close()
+            raise
+
+    async def _pump_stream(self, messages, pieces):
+        """Put ("text", piece) items on pieces, then ("done", None) or ("error", exception)"""
+        self._ensure_client()
+        self.counters["requests"] += 1
+        self.counters["streams"] += 1
+        received = False
+        stream = None
+        try:
+            async with self.semaphore:
+                stream, chunks, chunk = await asyncio.wait_for(self._open_stream(messages), self.deadline)
+                while chunk is not None:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        pieces.put(("text", chunk.choices[0].delta.content))
+                        received = True
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), self.deadline)
+                    except StopAsyncIteration:
+                        chunk = None
+            self.breaker.record_success()
+            self.counters["successes"] += 1
+            pieces.put(("done", None))
+        except asyncio.CancelledError:
+            # The reader stopped early; only a stream that never answered counts against the server
+            if received:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+            raise
+        except Exception as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self.counters["timeouts"] += 1
+            else:
+                self.counters["errors"] += 1
+            self.breaker.record_failure()
+            pieces.put(("error", e))
+        finally:
+            if stream is not None:
+                await stream.close()
+
+    # Blocking bridges
+
+    def _ensure_loop(self):
+        with self._loop_lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self.loop.run_forever, name="jarvis-brain-loop", daemon=True
+                )
+                self._loop_thread.start()
+
+    def run(self, user_input, messages=None):
+        """Run complete() on the client's event loop thread and wait for the reply"""
+        self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self.complete(user_input, messages), self.loop)
+        return future.result()
+
+    def stream(self, user_input, messages=None):
+        """Yield the reply in pieces as they arrive.
+
+        Raises BrainUnavailable when the breaker is open, and the request's
+        error (asyncio.TimeoutError past the deadline) if the stream fails.
+        """
+        if not self.breaker.allow():
+            self.counters["breaker_rejections"] += 1
+            raise BrainUnavailable("AI brain circuit breaker is open")
+        self._ensure_loop()
+        pieces = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._pump_stream(messages or self.brain.build_messages(user_input), pieces), self.loop
+        )
+        try:
+            while True:
+                kind, value = pieces.get()
+                if kind == "text":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            future.cancel()
+
+    def stats(self):
+        stats = dict(self.counters)
+        stats["breaker_state"] = self.breaker.state
+        stats["p95_latency"] = self.latencies.percentile(95)
+        stats["hedge_threshold"] = self.hedge_threshold()
+        return stats
+
+    def close(self):
+        with self._loop_lock:
+            if self.loop is None:
+                return
+            if self.client is not None:
+                asyncio.run_coroutine_threadsafe(self.client.close(), self.loop).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._loop_thread.join()
+            self.loop.close()
+            self.loop = None
+            self.client = None
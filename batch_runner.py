@@ -0,0 +1,302 @@
+"""
+JARVIS Batch Runner
+Replays command transcripts headlessly, with recording stubs for speech and actions
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+OFFLINE_REPLY = "Certainly, Sir. This is an offline batch reply."
+
+# Subsystems whose calls are recorded instead of performed
+STUBBED_SUBSYSTEMS = ("automation", "advanced_features", "emergency_security", "learning_system", "prefetcher")
+
+# Module-level functions the EnhancedJARVIS handlers call for speech or side effects
+STUBBED_FUNCTIONS = ("weather", "speak_news", "youtube", "joke")
+
+
+def plain(value):
+    return value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+
+
+class ActionRecorder:
+    """Collects the actions of the utterance running on the current thread"""
+
+    def __init__(self):
+        self.local = threading.local()
+
+    def begin(self, replies=()):
+        self.local.actions = []
+        self.local.replies = list(replies)
+
+    def end(self):
+        actions, self.local.actions = self.local.actions, None
+        return actions
+
+    def record(self, action, args=(), kwargs=None):
+        actions = getattr(self.local, "actions", None)
+        if actions is not None:
+            entry = {"action": action, "args": [plain(arg) for arg in args]}
+            if kwargs:
+                entry["kwargs"] = {key: plain(value) for key, value in kwargs.items()}
+            actions.append(entry)
+
+    def next_reply(self):
+        """The scripted answer to a follow-up question, or None when the script has run out"""
+        replies = getattr(self.local, "replies", None)
+        return replies.pop(0) if replies else None
+
+
+class RecordingStub:
+    """Stands in for a subsystem: every method call is recorded and answered with a placeholder"""
+
+    def __init__(self, name, recorder):
+        self._name = name
+        self._recorder = recorder
+
+    def __getattr__(self, attribute):
+        if attribute.startswith("__"):
+            raise AttributeError(attribute)
+        action = f"{self._name}.{attribute}"
+
+        def call(*args, **kwargs):
+            self._recorder.record(action, args, kwargs)
+            return f"[{action}]"
+        return call
+
+
+class RecordingVoice(RecordingStub):
+    """Voice system stub: records speech and answers follow-up questions from the transcript"""
+
+    def __init__(self, recorder, wake_word="jarvis"):
+        super().__init__("voice", recorder)
+        self.wake_word = wake_word
+
+    def speak(self, text, voice_type="jarvis_male", add_prefix=True, priority=None):
+        self._recorder.record("voice.speak", (text,))
+
+    def wait_for_speech(self):
+        pass
+
+    def listen_for_command(self, timeout=10):
+        reply = self._recorder.next_reply()
+        self._recorder.record("voice.listen", (reply,))
+        return reply
+
+
+class TranscriptConversations:
+    """Gives the transcript replaying on each thread a conversation context of its own"""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.local = threading.local()
+
+    def begin(self):
+        self.local.conversation = self.factory()
+
+    def __getattr__(self, attribute):
+        if attribute.startswith("__"):
+            raise AttributeError(attribute)
+        return getattr(self.local.conversation, attribute)
+
+
+def recording_function(name, recorder):
+    def call(*args, **kwargs):
+        recorder.record(name, args, kwargs)
+    return call
+
+
+@contextmanager
+def recorded_side_effects(module, recorder):
+    """Swap the module's speech and side-effecting helpers for recorders while replaying"""
+    replacements = {name: recording_function(name, recorder) for name in STUBBED_FUNCTIONS}
+    replacements["webbrowser"] = RecordingStub("webbrowser", recorder)
+    saved = {name: getattr(module, name) for name in replacements}
+    for name, replacement in replacements.items():
+        setattr(module, name, replacement)
+    try:
+        yield
+    finally:
+        for name, original in saved.items():
+            setattr(module, name, original)
+
+
+def build_jarvis(recorder, offline=False):
+    """An EnhancedJARVIS with the real router, handlers and AI brain, and everything else stubbed"""
+    import jarvis_enhanced
+    from ai_brain import AIBrain
+
+    jarvis = jarvis_enhanced.EnhancedJARVIS()
+    jarvis.voice_system = RecordingVoice(recorder, jarvis.config.WAKE_WORD.lower())
+    for name in STUBBED_SUBSYSTEMS:
+        setattr(jarvis, name, RecordingStub(name, recorder))
+    # Built directly: the lazy builder would attach the (stubbed) learning history
+    jarvis.ai_brain = AIBrain()
+    # Concurrent transcripts share the brain but must not share its conversation
+    jarvis.ai_brain.conversation = TranscriptConversations(jarvis.ai_brain.new_conversation)
+
+    if offline:
+        def fetch_response(user_input):
+            recorder.record("llm", (user_input,))
+            return OFFLINE_REPLY, False
+
+        def stream_completion(user_input):
+            recorder.record("llm", (user_input,))
+            yield OFFLINE_REPLY
+
+        jarvis.ai_brain.fetch_response = fetch_response
+        jarvis.ai_brain.stream_completion = stream_completion
+        # Canned replies must not end up in the persistent response cache
+        jarvis.ai_brain.response_cache = None
+    return jarvis
+
+
+def read_transcripts(lines):
+    """Group JSONL utterances into transcripts, keeping their order.
+
+    Each line is a JSON string or an object with ``text`` and optionally
+    ``transcript`` (an id) and ``replies`` (answers to follow-up
+    questions). Lines without a transcript id are independent transcripts
+    of their own.
+    """
+    transcripts = OrderedDict()
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        item = json.loads(line)
+        if isinstance(item, str):
+            item = {"text": item}
+        transcript = str(item.get("transcript", f"line-{number}"))
+        transcripts.setdefault(transcript, []).append(item)
+    return transcripts
+
+
+def replay(jarvis, transcripts, recorder, concurrency=1, stream=False):
+    """Run every transcript, up to concurrency at a time; returns one result per utterance"""
+    def run_transcript(transcript, items):
+        jarvis.ai_brain.conversation.begin()
+        results = []
+        for index, item in enumerate(items):
+            text = item["text"].lower()
+            recorder.begin(item.get("replies", ()))
+            first_sentence = []
+
+            def on_sentence(sentence):
+                if not first_sentence:
+                    first_sentence.append(time.perf_counter() - start)
+                recorder.record("voice.speak", (sentence,))
+
+            start = time.perf_counter()
+            response, error = None, None
+            try:
+                # Not execute_enhanced_query, which turns handler errors into an apology
+                response = jarvis.dispatch_query(text, on_sentence=on_sentence if stream else None)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            seconds = time.perf_counter() - start
+
+            route = jarvis.router.pop_last_route()
+            results.append({
+                "transcript": transcript,
+                "index": index,
+                "text": text,
+                "route": route if route and route != "default" else "converse",
+                "response": response,
+                "error": error,
+                "seconds": seconds,
+                "first_sentence_seconds": first_sentence[0] if first_sentence else None,
+                "actions": recorder.end()
+            })
+        return results
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="jarvis-batch") as pool:
+        futures = [pool.submit(run_transcript, transcript, items) for transcript, items in transcripts.items()]
+        return [result for future in futures for result in future.result()]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else None
+
+
+def summarize(results, elapsed):
+    """Latency percentiles per route and overall, throughput and error count"""
+    by_route = defaultdict(list)
+    for result in results:
+        by_route[result["route"]].append(result["seconds"])
+    by_route["all"] = [result["seconds"] for result in results]
+
+    routes = {}
+    for route, latencies in sorted(by_route.items(), key=lambda item: (item[0] == "all", -len(item[1]))):
+        routes[route] = {
+            "count": len(latencies),
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": max(latencies) if latencies else None
+        }
+    return {
+        "utterances": len(results),
+        "errors": sum(1 for result in results if result["error"]),
+        "elapsed_seconds": elapsed,
+        "throughput_per_second": len(results) / elapsed if elapsed else None,
+        "routes": routes
+    }
+
+
+def print_summary(summary, stream=sys.stdout):
+    print(f"{'route':>20} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}", file=stream)
+    for route, values in summary["routes"].items():
+        if not values["count"]:
+            continue
+        print(f"{route:>20} {values['count']:>6} " + " ".join(
+            f"{values[key] * 1000:>8.1f}" for key in ("p50", "p95", "p99", "max")), file=stream)
+    print(f"{summary['utterances']} utterances in {summary['elapsed_seconds']:.2f}s "
+          f"({summary['throughput_per_second'] or 0:.1f}/s), {summary['errors']} errors", file=stream)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="batch", description=__doc__.splitlines()[2])
+    parser.add_argument("input", nargs="?", default="-", help="JSONL transcript file ('-' for stdin)")
+    parser.add_argument("--concurrency", type=int, default=1, help="transcripts replayed at once")
+    parser.add_argument("--offline", action="store_true", help="answer LLM requests with a canned reply")
+    parser.add_argument("--stream", action="store_true", help="stream AI replies sentence by sentence")
+    parser.add_argument("--output", help="write one JSON result per utterance to this file")
+    parser.add_argument("--summary", help="write the summary as JSON to this file")
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        transcripts = read_transcripts(sys.stdin)
+    else:
+        with open(args.input) as f:
+            transcripts = read_transcripts(f)
+
+    recorder = ActionRecorder()
+    jarvis = build_jarvis(recorder, offline=args.offline)
+    import jarvis_enhanced
+    with recorded_side_effects(jarvis_enhanced, recorder):
+        start = time.perf_counter()
+        results = replay(jarvis, transcripts, recorder, concurrency=args.concurrency, stream=args.stream)
+        elapsed = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, "w") as f:
+            for result in results:
+                f.write(json.dumps(result) + "\n")
+    summary = summarize(results, elapsed)
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(summary, f, indent=2)
+    print_summary(summary)
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
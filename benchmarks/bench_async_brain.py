@@ -0,0 +1,111 @@
+"""
+Benchmark: AI brain requests against a faulty server, direct vs async client
+
+Points AIBrain at the stub OpenAI-compatible server with injected errors
+and a latency tail, then answers the same prompts with the direct
+request_completion call and with the AsyncBrainClient (deadline, jittered
+retries, hedging and circuit breaker). Reports how many prompts got a
+model answer, how many got a fallback or an error, and latency percentiles.
+A final phase takes the server "down" to show the breaker failing fast.
+
+Usage: python benchmarks/bench_async_brain.py [--requests 200] [--error-rate 0.1] [--slow-rate 0.05]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_llm_server import StubLLMServer
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+def report(name, latencies, answered, fallbacks, errors):
+    print(f"{name:>8} {answered:>9} {fallbacks:>10} {errors:>7} "
+          f"{statistics.median(latencies):>8.3f} {percentile(latencies, 95):>8.3f} "
+          f"{percentile(latencies, 99):>8.3f} {max(latencies):>8.3f}")
+
+
+def run_direct(brain, prompts):
+    latencies, answered, errors = [], 0, 0
+    for prompt in prompts:
+        start = time.perf_counter()
+        try:
+            brain.request_completion(prompt)
+            answered += 1
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+    return latencies, answered, 0, errors
+
+
+def run_async(client, prompts):
+    latencies, answered, fallbacks = [], 0, 0
+    for prompt in prompts:
+        start = time.perf_counter()
+        reply = client.run(prompt)
+        latencies.append(time.perf_counter() - start)
+        if reply.fallback:
+            fallbacks += 1
+        else:
+            answered += 1
+    return latencies, answered, fallbacks, 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--first-token-delay", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--slow-rate", type=float, default=0.05)
+    parser.add_argument("--slow-delay", type=float, default=1.0)
+    parser.add_argument("--deadline", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    server = StubLLMServer(first_token_delay=args.first_token_delay, token_delay=0.0,
+                           error_rate=args.error_rate, slow_rate=args.slow_rate,
+                           slow_delay=args.slow_delay, seed=args.seed)
+    os.environ["OPENAI_BASE_URL"] = server.start()
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+    os.environ["BRAIN_DEADLINE_SECONDS"] = str(args.deadline)
+
+    from ai_brain import AIBrain
+    from async_brain import AsyncBrainClient
+    brain = AIBrain()
+    brain.client = brain.client.with_options(max_retries=0)
+    client = AsyncBrainClient(brain, deadline=args.deadline)
+
+    prompts = [f"Status report number {i}" for i in range(args.requests)]
+    print(f"{args.requests} prompts, {args.error_rate:.0%} errors, {args.slow_rate:.0%} slowed by "
+          f"{args.slow_delay}s, deadline {args.deadline}s\n")
+    print(f"{'client':>8} {'answered':>9} {'fallbacks':>10} {'errors':>7} "
+          f"{'p50 (s)':>8} {'p95 (s)':>8} {'p99 (s)':>8} {'max (s)':>8}")
+    report("direct", *run_direct(brain, prompts))
+    report("async", *run_async(client, prompts))
+
+    stats = client.stats()
+    print(f"\nasync client: {stats['attempts']} attempts, {stats['retries']} retries, "
+          f"{stats['hedges']} hedges ({stats['hedge_wins']} won), {stats['timeouts']} deadline misses")
+
+    # Server down: the breaker opens after a few failures and later prompts fall back at once
+    server.error_rate = 1.0
+    latencies = run_async(client, prompts[:20])[0]
+    stats = client.stats()
+    print(f"server down: breaker {stats['breaker_state']}, {stats['breaker_rejections']} rejected, "
+          f"median fallback latency {statistics.median(latencies) * 1000:.2f} ms")
+
+    client.close()
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
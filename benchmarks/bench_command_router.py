@@ -0,0 +1,98 @@
+"""
+Benchmark: compiled CommandRouter vs an if/elif substring chain
+
+Uses the jarvis_simple command table (the front-ends cannot be imported
+without their speech dependencies, so the patterns are listed here) and
+synthetic tables with more commands. For each table it checks that the
+router picks the same command as the equivalent elif chain for every
+test utterance, then times both. The chain's cost grows with the number
+of commands; the router's grows with the utterance length.
+
+Usage: python benchmarks/bench_command_router.py [--iterations 20000]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from command_router import CommandRouter
+
+SIMPLE_TABLE = [
+    ("wikipedia", ["wikipedia"]), ("search_youtube", ["search youtube"]),
+    ("open_youtube", ["open youtube"]), ("open_google", ["open google"]),
+    ("open_amazon", ["open amazon"]), ("open_stackoverflow", ["open stackoverflow"]),
+    ("cpu", ["cpu"]), ("joke", ["joke"]), ("screenshot", ["screenshot"]), ("time", ["the time"]),
+    ("search", ["search"]), ("location", ["location"]), ("news", ["news"]), ("voice", ["voice"]),
+    ("shutdown", ["shutdown"]), ("restart", ["restart"]), ("sleep", ["sleep"]), ("lock", ["lock"]),
+    ("volume_up", ["volume up"]), ("volume_down", ["volume down"]), ("mute", ["mute"]),
+    ("are_you_there", ["jarvis are you there"]), ("jarvis_who_made_you", ["jarvis who made you"]),
+    ("your_name", ["your name"]), ("who_made_you", ["who made you"]), ("stands for", ["stands for"]),
+    ("your_friend", ["your friend"]), ("remember", ["remember that"]),
+    ("recall", ["do you remember anything"]), ("goodbye", ["goodbye", "exit"]),
+]
+
+UTTERANCES = [
+    "jarvis open youtube please", "what is the time", "search youtube for lo-fi beats",
+    "tell me a joke", "volume down a bit", "who made you", "jarvis who made you",
+    "remember that the keys are in the drawer", "goodbye jarvis", "could you lock the screen",
+    "what is the weather like in the mountains this weekend", "play something nice",
+    "search for the best pizza place nearby", "wikipedia alan turing", "exit",
+]
+
+
+def chain(table):
+    """The equivalent elif chain as a function"""
+    def route(query):
+        for name, patterns in table:
+            for pattern in patterns:
+                if pattern in query:
+                    return name
+        return None
+    return route
+
+
+def synthetic_table(size, seed=1):
+    rng = random.Random(seed)
+    table = list(SIMPLE_TABLE)
+    while len(table) < size:
+        words = " ".join("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8)))
+                         for _ in range(rng.randint(1, 3)))
+        table.append((f"command_{len(table)}", [words]))
+    return table
+
+
+def build_router(table):
+    router = CommandRouter()
+    for name, patterns in table:
+        router.add(name, lambda query, name=name: name, patterns)
+    return router
+
+
+def per_call(function, iterations):
+    start = time.perf_counter()
+    for position in range(iterations):
+        function(UTTERANCES[position % len(UTTERANCES)])
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'commands':>9} {'elif chain (us)':>16} {'router (us)':>12} {'same routes':>12}")
+    for size in (len(SIMPLE_TABLE), 100, 300, 1000):
+        table = synthetic_table(size)
+        route_chain, router = chain(table), build_router(table)
+        agree = all(route_chain(text) == router.dispatch(text) for text in UTTERANCES)
+        print(f"{size:>9} {per_call(route_chain, args.iterations):>16.2f} "
+              f"{per_call(router.dispatch, args.iterations):>12.2f} {str(agree):>12}")
+
+
+if __name__ == "__main__":
+    main()
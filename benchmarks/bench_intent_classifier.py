@@ -0,0 +1,105 @@
+"""
+Benchmark: local intent classifier vs keyword-only routing
+
+Trains the character n-gram classifier on the seed examples and scores it
+on hand-written paraphrases it has not seen. Reports how many utterances
+the keyword matcher alone routes, how many the classifier routes
+confidently on top of that (and how accurately), how many still escalate
+to the LLM, the expected calibration error of the probabilities, and
+prediction latency.
+
+Usage: python benchmarks/bench_intent_classifier.py [--threshold 0.8]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intent_classifier import GENERAL, IntentClassifier, label_utterance, seed_examples
+
+EVAL_SET = [
+    ("switch the pc off", "system_control"), ("turn the sound up", "system_control"),
+    ("reboot my laptop", "system_control"), ("make the display darker", "system_control"),
+    ("power off the computer", "system_control"),
+    ("clean up my desktop folder", "file_management"), ("remove the old downloads", "file_management"),
+    ("rename my files", "file_management"), ("move the photos somewhere safe", "file_management"),
+    ("who wrote romeo and juliet", "web_search"), ("how far away is the moon", "web_search"),
+    ("who discovered penicillin", "web_search"), ("how do i change a tire", "web_search"),
+    ("put on some rock", "entertainment"), ("i want to hear the beatles", "entertainment"),
+    ("start my playlist", "entertainment"), ("skip to the next song", "entertainment"),
+    ("remind me to buy milk", "productivity"), ("set an alarm for six", "productivity"),
+    ("add lunch with anna to my agenda", "productivity"), ("book a meeting for monday", "productivity"),
+    ("will it rain today", "information"), ("how hot is it outside", "information"),
+    ("what are the headlines", "information"), ("how are the markets today", "information"),
+    ("ring my mother", "communication"), ("write to my boss", "communication"),
+    ("dial the office", "communication"), ("ping sarah on slack", "communication"),
+    ("somebody call an ambulance", "emergency"), ("there is smoke everywhere", "emergency"),
+    ("i am hurt badly", "emergency"),
+    ("how is your day going", GENERAL), ("tell me something interesting", GENERAL),
+    ("what do you think of humans", GENERAL), ("write me a haiku", GENERAL),
+    ("i am feeling sad", GENERAL), ("who built you", GENERAL), ("explain relativity", GENERAL),
+    ("thanks a lot", GENERAL), ("good night jarvis", GENERAL), ("recommend a movie plot", GENERAL),
+]
+
+
+def expected_calibration_error(confidences, correct, bins=10):
+    confidences, correct = np.asarray(confidences), np.asarray(correct, dtype=float)
+    error = 0.0
+    for low in np.linspace(0, 1, bins, endpoint=False):
+        mask = (confidences > low) & (confidences <= low + 1 / bins)
+        if mask.any():
+            error += mask.mean() * abs(confidences[mask].mean() - correct[mask].mean())
+    return error
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    classifier = IntentClassifier.train(seed_examples())
+    print(f"trained on {classifier.metadata['examples']} examples in {time.perf_counter() - start:.2f}s "
+          f"(temperature {classifier.temperature:.2f})\n")
+
+    keyword_routed = classified = classified_correct = escalated = 0
+    confidences, correct = [], []
+    for text, expected in EVAL_SET:
+        prediction = classifier.predict(text)
+        confidences.append(prediction.confidence)
+        correct.append(prediction.intent == expected)
+        if label_utterance(text) != GENERAL:
+            keyword_routed += 1
+        elif prediction.intent != GENERAL and prediction.confidence >= args.threshold:
+            classified += 1
+            classified_correct += prediction.intent == expected
+        else:
+            escalated += 1
+
+    routable = sum(expected != GENERAL for _, expected in EVAL_SET)
+    print(f"{len(EVAL_SET)} utterances ({routable} routable)")
+    print(f"  routed by keywords:         {keyword_routed}")
+    print(f"  routed by classifier:       {classified} ({classified_correct} correct)")
+    print(f"  escalated to the LLM:       {escalated}")
+    print(f"  top-1 accuracy:             {np.mean(correct):.2%}")
+    print(f"  expected calibration error: {expected_calibration_error(confidences, correct):.3f}")
+
+    texts = [text for text, _ in EVAL_SET]
+    latencies = []
+    for position in range(args.iterations):
+        start = time.perf_counter()
+        classifier.predict(texts[position % len(texts)])
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1e6
+    print(f"\nprediction latency: p50 {np.percentile(latencies, 50):.0f} us, "
+          f"p99 {np.percentile(latencies, 99):.0f} us")
+
+
+if __name__ == "__main__":
+    main()
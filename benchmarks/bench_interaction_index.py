@@ -0,0 +1,99 @@
+"""
+Benchmark: similar-interaction lookup latency in LearningSystem
+
+Compares InteractionIndex queries (one sparse mat-vec + partial sort) at
+10k, 100k and 1M indexed interactions. Pass --legacy to also time the old
+per-interaction transform/cosine loop on the smallest size.
+
+Usage: python benchmarks/bench_interaction_index.py [--sizes 10000 100000 1000000] [--legacy]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from interaction_index import InteractionIndex
+
+VERBS = ["open", "search", "play", "send", "create", "find", "show", "tell", "check", "set"]
+OBJECTS = ["music", "weather", "news", "email", "calendar", "youtube", "file", "reminder",
+           "joke", "stock price", "system status", "wikipedia", "notes", "alarm", "browser"]
+MODIFIERS = ["for today", "please", "now", "for tomorrow", "about python", "in london",
+             "from my boss", "on the desktop", "by queen", "for the meeting", ""]
+
+
+def synthetic_utterances(count, seed=42):
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(MODIFIERS)} {rng.randrange(500)}".strip()
+        for _ in range(count)
+    ]
+
+
+def time_queries(fn, queries):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--legacy", action="store_true")
+    args = parser.parse_args()
+
+    pool_texts = synthetic_utterances(20_000)
+    vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+    pool = vectorizer.fit_transform(pool_texts)
+    query_texts = synthetic_utterances(args.queries, seed=7)
+    query_vectors = [vectorizer.transform([text]) for text in query_texts]
+
+    rng = np.random.default_rng(0)
+    print(f"{'interactions':>12}  {'build (s)':>9}  {'p50 (ms)':>9}  {'p95 (ms)':>9}")
+
+    for size in args.sizes:
+        rows = rng.integers(0, pool.shape[0], size=size)
+
+        start = time.perf_counter()
+        index = InteractionIndex(index_dir=os.devnull)
+        index.clear(len(vectorizer.vocabulary_))
+        for offset in range(0, size, 50_000):
+            chunk = rows[offset:offset + 50_000]
+            index.add_rows(pool[chunk], np.arange(offset, offset + len(chunk)))
+        build = time.perf_counter() - start
+
+        p50, p95 = time_queries(lambda q: index.query(q, k=3, threshold=0.3), query_vectors)
+        print(f"{size:>12,}  {build:>9.2f}  {p50:>9.3f}  {p95:>9.3f}")
+
+    if args.legacy:
+        size = min(args.sizes)
+        texts = [pool_texts[i] for i in rng.integers(0, len(pool_texts), size=size)]
+
+        def legacy(query):
+            similar = []
+            for text in texts:
+                similarity = cosine_similarity(query, vectorizer.transform([text]))[0][0]
+                if similarity > 0.3:
+                    similar.append((text, similarity))
+            similar.sort(key=lambda x: x[1], reverse=True)
+            return similar[:3]
+
+        p50, p95 = time_queries(legacy, query_vectors[:3])
+        print(f"{size:>12,}  {'legacy':>9}  {p50:>9.1f}  {p95:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
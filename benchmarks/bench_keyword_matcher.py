@@ -0,0 +1,68 @@
+"""
+Benchmark: compiled keyword matcher vs the per-keyword substring loops
+
+The old path scanned each utterance once per keyword in
+AIBrain.analyze_intent and LearningSystem.extract_interests, plus a separate
+command regex. The new path is one KeywordMatcher.match pass (uncached here,
+so the numbers show the scan itself, not the LRU cache).
+
+Usage: python benchmarks/bench_keyword_matcher.py [--utterances 20000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from keyword_matcher import COMMAND_VERBS, DEFAULT_MATCHER, INTENT_KEYWORDS, INTEREST_KEYWORDS
+from bench_interaction_index import synthetic_utterances
+
+COMMAND_PATTERN = re.compile(r'\b(' + '|'.join(COMMAND_VERBS) + r')\b')
+
+
+def legacy_scan(text):
+    intents = [intent for intent, keywords in INTENT_KEYWORDS.items()
+               if any(keyword in text for keyword in keywords)]
+    interests = [category for category, keywords in INTEREST_KEYWORDS.items()
+                 if any(keyword in text for keyword in keywords)]
+    commands = COMMAND_PATTERN.findall(text)
+    return intents, interests, commands
+
+
+def compiled_scan(text):
+    return DEFAULT_MATCHER.match(text)
+
+
+def bench(fn, texts, repeats=3):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for text in texts:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--utterances", type=int, default=20_000)
+    args = parser.parse_args()
+
+    texts = [text.lower() for text in synthetic_utterances(args.utterances)]
+    texts += [
+        "jarvis what is the weather forecast for my flight tomorrow",
+        "please play the new album by my favourite artist and then search for concert tickets",
+        "send an email to the team about the game score and organize the documents folder",
+    ] * (args.utterances // 100)
+
+    legacy = bench(legacy_scan, texts)
+    compiled = bench(compiled_scan, texts)
+    print(f"legacy loops:     {legacy:7.2f} us/utterance")
+    print(f"compiled matcher: {compiled:7.2f} us/utterance  ({legacy / compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: cost and accuracy of the in-process metrics
+
+Times a counter increment and a histogram timer block with metrics off
+(the default) and on, compares histogram percentiles against exact ones
+for log-normal latencies, and scrapes the local HTTP endpoint once.
+
+Usage: python benchmarks/bench_metrics.py [--samples 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import MetricsRegistry, start_metrics_server, registry
+
+
+def per_call(function, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        function()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=100000)
+    args = parser.parse_args()
+
+    bench = MetricsRegistry()
+    hits = bench.counter("bench_hits_total", "Benchmark hits", ["route"])
+    seconds = bench.histogram("bench_seconds", "Benchmark durations", ["stage"])
+
+    def timed():
+        with seconds.time(stage="handler"):
+            pass
+
+    for enabled in (False, True):
+        bench.enabled = enabled
+        label = "on: " if enabled else "off:"
+        print(f"metrics {label} counter {per_call(lambda: hits.inc(route='weather'), args.samples):5.2f} us, "
+              f"histogram timer {per_call(timed, args.samples):5.2f} us")
+
+    rng = random.Random(7)
+    latencies = [rng.lognormvariate(-1.5, 1.0) for _ in range(args.samples)]
+    for value in latencies:
+        seconds.observe(value, stage="llm")
+    latencies.sort()
+    print(f"{'quantile':>9} {'exact ms':>10} {'histogram ms':>13} {'error':>7}")
+    for fraction in (0.5, 0.9, 0.99, 0.999):
+        exact = latencies[max(0, round(len(latencies) * fraction) - 1)]
+        recorded = seconds.percentile(fraction, stage="llm")
+        print(f"{fraction:>9} {exact * 1000:>10.2f} {recorded * 1000:>13.2f} {abs(recorded - exact) / exact:>7.2%}")
+
+    start = time.perf_counter()
+    bench.render()
+    print(f"render: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    registry.enabled = True
+    registry.metrics.update(bench.metrics)
+    server = start_metrics_server(0)
+    port = server.server_address[1]
+    start = time.perf_counter()
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+        body = response.read().decode()
+    print(f"scrape: {(time.perf_counter() - start) * 1000:.2f} ms, {len(body.splitlines())} lines, "
+          f"{response.headers['Content-Type']}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: feedback recording, full-file rewrite vs write-behind store
+
+The old AIBrain.learn_from_interaction appended feedback to the preference
+document and rewrote the whole JSON file on every event, so each event
+cost O(feedback so far). PreferenceStore appends one line to a feedback
+log and coalesces document writes. Reports per-event latency and the
+bytes written for a feedback-heavy session.
+
+Usage: python benchmarks/bench_preference_writes.py [--events 2000]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preference_store import DEFAULT_PREFERENCES, PreferenceStore
+
+
+def feedback_event(position):
+    return {
+        "input": f"Play something relaxing number {position}",
+        "response": "Playing a calm playlist for you, Sir.",
+        "feedback": "good",
+        "timestamp": datetime.now().isoformat()
+    }
+
+
+def run_rewrite(directory, events):
+    path = os.path.join(directory, 'user_preferences.json')
+    preferences = dict(DEFAULT_PREFERENCES)
+    written = 0
+    start = time.perf_counter()
+    for position in range(events):
+        preferences["feedback"] = preferences.get("feedback", [])
+        preferences["feedback"].append(feedback_event(position))
+        with open(path, 'w') as f:
+            json.dump(preferences, f, indent=2)
+        written += os.path.getsize(path)
+    return time.perf_counter() - start, written
+
+
+def run_write_behind(directory, events):
+    store = PreferenceStore(
+        path=os.path.join(directory, 'user_preferences.json'),
+        feedback_file=os.path.join(directory, 'user_feedback.jsonl'),
+        flush_interval=2.0
+    )
+    start = time.perf_counter()
+    for position in range(events):
+        store.append_feedback(feedback_event(position))
+        with store.lock:
+            store.data["last_feedback"] = position
+        store.mark_dirty()
+    elapsed = time.perf_counter() - start
+    store.close()
+    written = (os.path.getsize(store.feedback_file)
+               + store.writes * os.path.getsize(store.path))
+    return elapsed, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{args.events} feedback events\n")
+    print(f"{'store':>12} {'per event (us)':>15} {'bytes written':>14}")
+    for name, run in (("rewrite", run_rewrite), ("write-behind", run_write_behind)):
+        with tempfile.TemporaryDirectory() as directory:
+            elapsed, written = run(directory, args.events)
+        print(f"{name:>12} {elapsed / args.events * 1e6:>15.1f} {written:>14,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: greeting latency with and without speculative prefetch
+
+Replays a day on a simulated clock. Weather, news and status fetchers
+sleep for typical network/API latencies; the user's active hours come
+from a LearningAggregates history. Reports the time the greeting spends
+waiting for briefing data when every fetch happens on demand versus when
+PrefetchScheduler has warmed the cache shortly before the active hour.
+
+Usage: python benchmarks/bench_prefetch_greeting.py [--weather-latency 0.8]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from learning_aggregates import LearningAggregates
+from prefetch import PrefetchScheduler
+
+
+class SimulatedClock:
+    def __init__(self, start):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+def slow(value, seconds):
+    def fetch(*args):
+        time.sleep(seconds)
+        return value
+    return fetch
+
+
+def greet(prefetcher):
+    """What wish_me reads from the prefetcher"""
+    start = time.perf_counter()
+    prefetcher.get("weather")
+    prefetcher.get("system_status")
+    prefetcher.get("suggestions")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--weather-latency", type=float, default=0.8)
+    parser.add_argument("--news-latency", type=float, default=0.5)
+    parser.add_argument("--status-latency", type=float, default=1.0)  # psutil.cpu_percent sampling
+    args = parser.parse_args()
+
+    # Mostly active at 7:00 and 19:00
+    aggregates = LearningAggregates()
+    for hour, count in ((7, 40), (8, 10), (13, 3), (19, 30)):
+        aggregates.hour_counts[hour] = count
+    aggregates.successes = sum(aggregates.hour_counts)
+    print(f"active hours: {aggregates.active_hours()}")
+
+    for mode in ("on demand", "prefetch"):
+        clock = SimulatedClock(datetime(2026, 10, 19, 6, 0))
+        prefetcher = PrefetchScheduler(aggregates.active_hours, lead_minutes=10, clock=clock)
+        prefetcher.register("weather", slow(["Sunny, 18 degrees"], args.weather_latency), 1800)
+        prefetcher.register("news", slow(["Headline"], args.news_latency), 1800)
+        prefetcher.register("system_status", slow("CPU at 3%", args.status_latency), 900)
+        prefetcher.register("suggestions", slow(["Shall I read the news?"], 0.0), 3600, hourly=True)
+
+        # Walk the scheduler's minute ticks up to the user's 7:02 greeting
+        while clock.now < datetime(2026, 10, 19, 7, 2):
+            if mode == "prefetch":
+                hour = prefetcher.due_hour()
+                if hour is not None:
+                    prefetcher.warm(hour)
+            clock.now += timedelta(minutes=1)
+        waited = greet(prefetcher)
+        print(f"{mode:>10}: greeting waited {waited * 1000:8.1f} ms for briefing data "
+              f"({prefetcher.stats['hits']} hits, {prefetcher.stats['misses']} misses, "
+              f"{prefetcher.stats['prefetched']} prefetched)")
+
+
+if __name__ == "__main__":
+    main()
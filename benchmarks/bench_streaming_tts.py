@@ -0,0 +1,98 @@
+"""
+Benchmark: time to first audio, blocking vs streamed AI replies
+
+Points AIBrain at the stub OpenAI-compatible server and compares
+process_command (speech starts after the full completion) with
+process_command_streaming (each sentence is queued for speech as soon as
+it is complete). Speech is simulated by a worker thread that "speaks" at
+a fixed words-per-second rate, so the numbers also show when the last
+sentence finishes.
+
+Usage: python benchmarks/bench_streaming_tts.py [--token-delay 0.05] [--first-token-delay 0.3]
+"""
+
+import argparse
+import os
+import queue
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_llm_server import StubLLMServer
+
+
+class SimulatedSpeaker:
+    """Speech queue whose worker sleeps for the time speaking would take"""
+
+    def __init__(self, words_per_second=3.0):
+        self.words_per_second = words_per_second
+        self.queue = queue.Queue()
+        self.first_audio = None
+        self.finished = None
+        threading.Thread(target=self._worker, daemon=True).start()
+
+    def speak(self, text):
+        self.queue.put(text)
+
+    def _worker(self):
+        while True:
+            text = self.queue.get()
+            if self.first_audio is None:
+                self.first_audio = time.perf_counter()
+            time.sleep(len(text.split()) / self.words_per_second)
+            self.finished = time.perf_counter()
+            self.queue.task_done()
+
+    def wait(self):
+        self.queue.join()
+
+
+def run_blocking(brain, prompt, words_per_second):
+    speaker = SimulatedSpeaker(words_per_second)
+    start = time.perf_counter()
+    speaker.speak(brain.process_command(prompt))
+    speaker.wait()
+    return speaker.first_audio - start, speaker.finished - start
+
+
+def run_streaming(brain, prompt, words_per_second):
+    speaker = SimulatedSpeaker(words_per_second)
+    start = time.perf_counter()
+    brain.process_command_streaming(prompt, speaker.speak)
+    speaker.wait()
+    return speaker.first_audio - start, speaker.finished - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--first-token-delay", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.05)
+    parser.add_argument("--words-per-second", type=float, default=3.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    server = StubLLMServer(first_token_delay=args.first_token_delay, token_delay=args.token_delay)
+    os.environ["OPENAI_BASE_URL"] = server.start()
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+    from ai_brain import AIBrain
+    brain = AIBrain()
+
+    print(f"{len(server.tokens())} tokens, first token after {args.first_token_delay}s, "
+          f"then one every {args.token_delay}s; speech at {args.words_per_second} words/s\n")
+    print(f"{'mode':>10} {'first audio (s)':>16} {'speech done (s)':>16}")
+    for name, run in (("blocking", run_blocking), ("streaming", run_streaming)):
+        results = [run(brain, "Walk me through the plan", args.words_per_second) for _ in range(args.runs)]
+        first = statistics.median(result[0] for result in results)
+        done = statistics.median(result[1] for result in results)
+        print(f"{name:>10} {first:>16.3f} {done:>16.3f}")
+
+    server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: cost of a tracing span on the hot path
+
+Times an empty ``with span(...)`` block with tracing off (the default,
+a shared no-op span) and on (ids, timestamps and a queue hand-off; the
+JSON encoding and file write happen on the listener thread), then
+checks every span reached the rotating trace file.
+
+Usage: python benchmarks/bench_tracing.py [--spans 100000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tracing import read_spans, span, tracer
+
+
+def per_span(count):
+    start = time.perf_counter()
+    for position in range(count):
+        with span("bench.stage", position=position):
+            pass
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--spans", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"tracing off: {per_span(args.spans):6.2f} us per span")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "trace.jsonl")
+        tracer.configure(path, max_bytes=2 * 2**20, backup_count=20)
+        print(f"tracing on:  {per_span(args.spans):6.2f} us per span")
+        tracer.close()
+        written = sum(1 for _ in read_spans(path))
+        files = len(os.listdir(directory))
+        print(f"{written} of {args.spans} spans written across {files} rotated files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark: blocking speak() vs the SpeechWorker
+
+A simulated pyttsx3 engine charges typical SAPI costs: reading the voice
+list, a fixed start-up per runAndWait and a time per word, firing
+started-word callbacks and honouring stop(). A burst of short messages
+(as a handler plus streamed sentences produce) is spoken the old way,
+one blocking say/runAndWait per call re-reading the voices, and through
+the worker. Reports how long the caller is blocked, total time to speak
+everything, runAndWait calls, and how quickly an interrupt silences a
+long answer (within one word).
+
+Usage: python benchmarks/bench_tts_worker.py [--messages 8]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tts_worker import SpeechWorker
+
+Voice = namedtuple("Voice", ["id", "name"])
+
+
+class SimulatedEngine:
+    def __init__(self, voices_seconds=0.02, startup_seconds=0.15, word_seconds=0.05):
+        self.voices_seconds = voices_seconds
+        self.startup_seconds = startup_seconds
+        self.word_seconds = word_seconds
+        self.voices = [Voice("male", "English Male"), Voice("female", "English Female")]
+        self.properties = {"voice": "male"}
+        self.callbacks = []
+        self.pending = []
+        self.stopped = threading.Event()
+        self.runs = 0
+        self.voice_reads = 0
+
+    def getProperty(self, name):
+        if name == "voices":
+            self.voice_reads += 1
+            time.sleep(self.voices_seconds)
+            return self.voices
+        return self.properties.get(name)
+
+    def setProperty(self, name, value):
+        self.properties[name] = value
+
+    def connect(self, topic, callback):
+        self.callbacks.append(callback)
+
+    def say(self, text):
+        self.pending.append(text)
+
+    def runAndWait(self):
+        self.runs += 1
+        self.stopped.clear()
+        time.sleep(self.startup_seconds)
+        for text in self.pending:
+            for position, word in enumerate(text.split()):
+                for callback in self.callbacks:
+                    callback("utterance", position, len(word))
+                if self.stopped.wait(self.word_seconds):
+                    self.pending = []
+                    return
+        self.pending = []
+
+    def stop(self):
+        self.stopped.set()
+
+
+def blocking_speak(engine, text, voice_index=0):
+    """The previous EnhancedVoiceSystem.speak: everything on the caller's thread"""
+    voices = engine.getProperty("voices")
+    engine.setProperty("voice", voices[voice_index].id)
+    engine.say(text)
+    engine.runAndWait()
+
+
+def messages(count):
+    return [f"Sentence number {position} of the answer, Sir." for position in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'speak':>9} {'caller blocked (s)':>19} {'all spoken (s)':>15} {'runAndWait':>11} {'voice reads':>12}")
+    engine = SimulatedEngine()
+    start = time.perf_counter()
+    for text in messages(args.messages):
+        blocking_speak(engine, text)
+    total = time.perf_counter() - start
+    print(f"{'blocking':>9} {total:>19.3f} {total:>15.3f} {engine.runs:>11} {engine.voice_reads:>12}")
+
+    engine = SimulatedEngine()
+    worker = SpeechWorker(lambda: engine, {"jarvis_male": 0, "jarvis_female": 1})
+    time.sleep(0.1)  # Engine set-up happens on the worker thread, off the caller's path
+    # While the first message is spoken the rest arrive and are coalesced
+    start = time.perf_counter()
+    handles = [worker.speak(messages(1)[0], "jarvis_male")]
+    time.sleep(0.01)
+    handles += [worker.speak(text, "jarvis_male") for text in messages(args.messages)[1:]]
+    blocked = time.perf_counter() - start - 0.01
+    worker.wait()
+    total = time.perf_counter() - start
+    print(f"{'worker':>9} {blocked:>19.6f} {total:>15.3f} {engine.runs:>11} {engine.voice_reads:>12}")
+    print(f"{'':>9} stats: {worker.stats}")
+
+    # The engine stops at the next word, so the delay depends on where in a word the interrupt lands
+    long_answer = " ".join(messages(args.messages))
+    delays = []
+    for offset in range(5):
+        handle = worker.speak(long_answer, "jarvis_male")
+        time.sleep(0.5 + offset * engine.word_seconds / 5)
+        start = time.perf_counter()
+        worker.interrupt()
+        handle.wait()
+        delays.append((time.perf_counter() - start) * 1000)
+    print(f"interrupt: speech stopped {sum(delays) / len(delays):.1f} ms (max {max(delays):.1f} ms) "
+          f"after interrupt(), interrupted={handle.interrupted}")
+    worker.close()
+
+
+if __name__ == "__main__":
+    main()
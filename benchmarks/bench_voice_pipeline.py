@@ -0,0 +1,168 @@
+"""
+Benchmark: sequential voice loop vs the pipelined VoicePipeline
+
+A simulated user says wake-word commands on a fixed, seeded schedule,
+sometimes while JARVIS is still answering the previous one. Capture
+blocks until an utterance has been spoken completely, and misses any
+utterance that began while nobody was listening. Recognition, handling
+(three streamed sentences) and speech sleep for typical latencies.
+
+The sequential loop mirrors run_voice_mode: listen, recognize, respond
+and wait for speech. The pipeline keeps capturing meanwhile and barges
+in. Reports commands heard, missed, answered, and the latency from the
+end of an utterance to the start of its answer.
+
+Usage: python benchmarks/bench_voice_pipeline.py [--commands 12]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from voice_pipeline import VoicePipeline
+
+Spoken = namedtuple("Spoken", ["start", "end", "text"])
+
+
+class SimulatedUser:
+    def __init__(self, commands, gap, utterance_seconds, seed=7):
+        rng = random.Random(seed)
+        self.utterances = []
+        start = 0.3
+        for position in range(commands):
+            self.utterances.append(Spoken(start, start + utterance_seconds, f"jarvis command {position}"))
+            start += utterance_seconds + rng.uniform(*gap)
+        self.heard = set()
+        self.answered = {}
+        self.t0 = None
+
+    def begin(self):
+        self.t0 = time.perf_counter()
+
+    def now(self):
+        return time.perf_counter() - self.t0
+
+    def done(self):
+        return self.now() > self.utterances[-1].end + 0.2
+
+    def capture(self, timeout=1.0):
+        """The next utterance that starts after listening began, or None after timeout"""
+        listening_since = self.now()
+        for utterance in self.utterances:
+            if utterance.start >= listening_since and utterance.text not in self.heard:
+                if utterance.start - listening_since > timeout:
+                    break
+                time.sleep(max(0.0, utterance.end - self.now()))
+                self.heard.add(utterance.text)
+                return utterance.text
+        time.sleep(timeout)
+        return None
+
+    def answer_started(self, text):
+        for utterance in self.utterances:
+            if utterance.text == text and text not in self.answered:
+                self.answered[text] = self.now() - utterance.end
+
+
+class SimulatedAssistant:
+    def __init__(self, user, recognize_seconds, handle_seconds, sentence_seconds):
+        self.user = user
+        self.recognize_seconds = recognize_seconds
+        self.handle_seconds = handle_seconds
+        self.sentence_seconds = sentence_seconds
+        self.interrupted = threading.Event()
+
+    def recognize(self, audio):
+        time.sleep(self.recognize_seconds)
+        return audio
+
+    def handle(self, text, on_sentence):
+        for position in range(3):
+            time.sleep(self.handle_seconds / 3)
+            on_sentence(f"{text}|sentence {position}")
+        return f"{text}|done"
+
+    def speak(self, sentence, first=True):
+        if first:
+            self.user.answer_started(sentence.split("|")[0])
+        self.interrupted.clear()
+        self.interrupted.wait(self.sentence_seconds)
+
+    def interrupt(self):
+        self.interrupted.set()
+
+
+def run_sequential(user, assistant):
+    """listen_for_wake_word -> execute_enhanced_query -> wait_for_speech, one at a time"""
+    speech = ThreadPoolExecutor(max_workers=1)
+    user.begin()
+    while not user.done():
+        audio = user.capture()
+        if audio is None:
+            continue
+        text = assistant.recognize(audio)
+        pending = []
+        assistant.handle(text, lambda sentence: pending.append(
+            speech.submit(assistant.speak, sentence, not pending)))
+        for future in pending:
+            future.result()
+    speech.shutdown()
+    return {}
+
+
+async def run_pipelined(user, assistant):
+    pipeline = VoicePipeline(
+        capture=user.capture, recognize=assistant.recognize, handle=assistant.handle,
+        speak=assistant.speak, interrupt=assistant.interrupt, wake_word="jarvis"
+    )
+    user.begin()
+    runner = asyncio.create_task(pipeline.run())
+    while not user.done():
+        await asyncio.sleep(0.05)
+    # Let the last answer start
+    await asyncio.sleep(assistant.recognize_seconds + assistant.handle_seconds)
+    pipeline.stop()
+    await runner
+    return pipeline.stats()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--commands", type=int, default=12)
+    parser.add_argument("--recognize", type=float, default=0.3)
+    parser.add_argument("--handle", type=float, default=0.6)
+    parser.add_argument("--sentence", type=float, default=0.5)
+    args = parser.parse_args()
+
+    print(f"{'loop':>10} {'heard':>6} {'missed':>7} {'answered':>9} {'p50 (s)':>8} {'p95 (s)':>8} {'barge-ins':>10}")
+    for name in ("sequential", "pipelined"):
+        user = SimulatedUser(args.commands, gap=(0.4, 2.5), utterance_seconds=0.6)
+        assistant = SimulatedAssistant(user, args.recognize, args.handle, args.sentence)
+        if name == "sequential":
+            stats = run_sequential(user, assistant)
+        else:
+            stats = asyncio.run(run_pipelined(user, assistant))
+        latencies = list(user.answered.values())
+        print(f"{name:>10} {len(user.heard):>6} {args.commands - len(user.heard):>7} {len(latencies):>9} "
+              f"{percentile(latencies, 0.5):>8.2f} {percentile(latencies, 0.95):>8.2f} "
+              f"{stats.get('barge_ins', 0):>10}")
+        if stats:
+            depths = {stage: values["max_depth"] for stage, values in stats["stages"].items()}
+            print(f"{'':>10} max queue depth per stage: {depths}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Evaluation: LSH interaction index recall and latency against exact search
+
+For each (tables, bits, multi-probe) setting, every query is answered by
+both the exact InteractionIndex and LSHInteractionIndex using the same
+top-k and cosine threshold that LearningSystem.predict_user_intent uses.
+Recall is the fraction of exact results the LSH index matched; since
+duplicate utterances tie on score, an approximate hit counts when its
+similarity reaches the lowest exact similarity for that query.
+
+Usage: python benchmarks/eval_ann_recall.py [--size 100000] [--threshold 0.3]
+"""
+
+import argparse
+import itertools
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from ann_index import LSHInteractionIndex
+from interaction_index import InteractionIndex
+from bench_interaction_index import synthetic_utterances
+
+
+def timed_queries(index, queries, k, threshold):
+    results, timings, candidates = [], [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(index.query(query, k=k, threshold=threshold))
+        timings.append((time.perf_counter() - start) * 1000)
+        candidates.append(getattr(index, 'last_candidates', len(index)))
+    return results, statistics.median(timings), statistics.mean(candidates)
+
+
+def recall(exact_results, approx_results):
+    found = expected = 0
+    for exact, approx in zip(exact_results, approx_results):
+        if not exact:
+            continue
+        lowest = exact[-1][1] - 1e-6
+        found += min(len(exact), sum(1 for _, score in approx if score >= lowest))
+        expected += len(exact)
+    return found / expected if expected else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.3)
+    parser.add_argument("--tables", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--bits", type=int, nargs="+", default=[8, 12, 16])
+    args = parser.parse_args()
+
+    pool_texts = synthetic_utterances(20_000)
+    vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+    pool = vectorizer.fit_transform(pool_texts)
+    rows = np.random.default_rng(0).integers(0, pool.shape[0], size=args.size)
+    data = pool[rows]
+    queries = [vectorizer.transform([text]) for text in synthetic_utterances(args.queries, seed=7)]
+
+    exact = InteractionIndex(index_dir=os.devnull)
+    exact.add_rows(data, np.arange(args.size))
+    exact_results, exact_p50, _ = timed_queries(exact, queries, args.k, args.threshold)
+    print(f"exact: p50 {exact_p50:.3f} ms over {args.size:,} rows\n")
+
+    print(f"{'tables':>6} {'bits':>5} {'probe':>6} {'recall':>7} {'p50 (ms)':>9} {'candidates':>11} {'build (s)':>9}")
+    for n_tables, n_bits, multi_probe in itertools.product(args.tables, args.bits, [False, True]):
+        start = time.perf_counter()
+        lsh = LSHInteractionIndex(index_dir=os.devnull, n_tables=n_tables, n_bits=n_bits,
+                                  multi_probe=multi_probe)
+        lsh.add_rows(data, np.arange(args.size))
+        build = time.perf_counter() - start
+
+        results, p50, candidates = timed_queries(lsh, queries, args.k, args.threshold)
+        print(f"{n_tables:>6} {n_bits:>5} {str(multi_probe):>6} {recall(exact_results, results):>7.3f} "
+              f"{p50:>9.3f} {candidates:>11,.0f} {build:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Stub OpenAI-compatible chat-completions server
+
+Serves POST /v1/chat/completions from a canned reply, split into word
+tokens, with a configurable delay before the first token and between
+tokens. Both plain and ``stream=True`` (server-sent events) requests are
+supported, so AIBrain can be pointed at it with OPENAI_BASE_URL.
+
+Faults can be injected: ``error_rate`` of requests fail with a 500 or 503,
+and ``slow_rate`` of them take ``slow_delay`` extra seconds (a latency tail).
+
+Usage: python benchmarks/stub_llm_server.py [--port 8001] [--token-delay 0.05]
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = (
+    "Certainly, Sir. I have reviewed the request and everything appears to be in order. "
+    "The first step is to gather the relevant files, which should take only a moment. "
+    "After that I will summarize the findings and present the options. "
+    "Shall I proceed?"
+)
+
+
+class StubLLMServer:
+    """Threaded HTTP server emitting a canned completion token by token"""
+
+    def __init__(self, reply=DEFAULT_REPLY, first_token_delay=0.3, token_delay=0.05,
+                 host="127.0.0.1", port=0, error_rate=0.0, slow_rate=0.0, slow_delay=2.0, seed=None):
+        self.reply = reply
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_delay = slow_delay
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.slow = 0
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def tokens(self):
+        return re.findall(r"\S+\s*", self.reply)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def handle_one_request(self):
+                try:
+                    super().handle_one_request()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client gave up (timed out or hedged); nothing to do
+
+            def do_POST(self):
+                if not self.path.endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with server.lock:
+                    server.requests += 1
+                    fail = server.random.random() < server.error_rate
+                    slow = server.random.random() < server.slow_rate
+                    server.errors += fail
+                    server.slow += slow
+                if slow:
+                    time.sleep(server.slow_delay)
+                if fail:
+                    self.fail()
+                elif body.get("stream"):
+                    self.stream(body)
+                else:
+                    self.complete(body)
+
+            def fail(self):
+                status = 500 if server.random.random() < 0.5 else 503
+                payload = json.dumps({"error": {"message": "Injected failure", "type": "server_error"}}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def complete(self, body):
+                time.sleep(server.first_token_delay + server.token_delay * len(server.tokens()))
+                payload = json.dumps({
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": server.reply},
+                        "finish_reason": "stop"
+                    }]
+                }).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def stream(self, body):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+
+                time.sleep(server.first_token_delay)
+                tokens = server.tokens()
+                for position, token in enumerate(tokens):
+                    if position:
+                        time.sleep(server.token_delay)
+                    self.event(body, {"content": token}, None)
+                self.event(body, {}, "stop")
+                self.wfile.write(b"data: [DONE]\n\n")
+                self.wfile.flush()
+
+            def event(self, body, delta, finish_reason):
+                chunk = {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body.get("model", "stub"),
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                self.wfile.flush()
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--first-token-delay", type=float, default=0.3)
+    parser.add_argument("--token-delay", type=float, default=0.05)
+    parser.add_argument("--reply", default=DEFAULT_REPLY)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--slow-rate", type=float, default=0.0)
+    parser.add_argument("--slow-delay", type=float, default=2.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.reply, args.first_token_delay, args.token_delay, args.host, args.port,
+                           args.error_rate, args.slow_rate, args.slow_delay, args.seed)
+    print(f"Stub LLM server at {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
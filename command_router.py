@@ -0,0 +1,156 @@
+"""
+JARVIS Command Router
+Declarative command table compiled into a single-pass matcher
+"""
+
+import re
+import threading
+from collections import Counter, namedtuple
+
+from metrics import HANDLER_SECONDS, ROUTE_HITS
+from tracing import span
+
+Route = namedtuple("Route", ["name", "handler", "clauses", "tags", "priority", "order"])
+
+
+class CommandRouter:
+    """Routes an utterance to the best-matching registered command.
+
+    Each route has substring patterns and/or tags. A pattern is a string,
+    or a tuple of strings that must all occur; the route matches if any of
+    its patterns does (substring semantics, like the ``'x' in query``
+    chains it replaces) or if one of its tags is passed to ``dispatch``
+    (e.g. the keyword intents of the utterance). Among matching routes the
+    highest ``priority`` wins, then the one registered first, so a table
+    written in the old ``elif`` order behaves the same.
+
+    All pattern terms are compiled into one trie-shaped regular expression
+    scanned with a lookahead at every position, which finds the longest
+    term starting there; the shorter terms that are its prefixes are added
+    from a precomputed table. One scan therefore finds every occurring
+    term, in time linear in the utterance length rather than in the
+    number of routes. Hits per route are counted, and each thread's last
+    dispatched route is kept for ``pop_last_route``.
+    """
+
+    def __init__(self, default=None):
+        self.default = default
+        self.routes = []
+        self.hits = Counter()
+        self.unmatched = 0
+        self._local = threading.local()
+        self._scanner = None
+        self._ranked = []
+        self._term_clauses = {}
+        self._tag_ranks = {}
+        self._term_prefixes = {}
+
+    def add(self, name, handler, patterns=(), tags=(), priority=0):
+        """Register a route; patterns are strings or tuples of strings that must all occur"""
+        clauses = tuple(
+            (pattern.lower(),) if isinstance(pattern, str) else tuple(term.lower() for term in pattern)
+            for pattern in patterns
+        )
+        self.routes.append(Route(name, handler, clauses, frozenset(tags), priority, len(self.routes)))
+        self._scanner = None
+        return self
+
+    # Compilation
+
+    def compile(self):
+        # Routes are referred to by rank, so the best match is the smallest rank
+        self._ranked = sorted(self.routes, key=lambda route: (-route.priority, route.order))
+        self._term_clauses = {}
+        self._tag_ranks = {}
+        for rank, route in enumerate(self._ranked):
+            for clause in route.clauses:
+                for term in clause:
+                    self._term_clauses.setdefault(term, []).append((rank, clause))
+            for tag in route.tags:
+                self._tag_ranks.setdefault(tag, []).append(rank)
+
+        terms = set(self._term_clauses)
+        # Every term that is a prefix of another one matches wherever that one does
+        self._term_prefixes = {
+            term: [other for other in terms if term.startswith(other)]
+            for term in terms
+        }
+        if terms:
+            self._scanner = re.compile(f"(?=({self._trie_pattern(terms)}))")
+        else:
+            self._scanner = re.compile(r"(?!)")
+
+    @staticmethod
+    def _trie_pattern(terms):
+        trie = {}
+        for term in terms:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        def build(node):
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+            # Greedy optional group: the longest term at a position is found first
+            return f"(?:{body})?" if "" in node else body
+
+        return build(trie)
+
+    # Matching
+
+    def terms_in(self, text):
+        """Every registered term occurring in text"""
+        if self._scanner is None:
+            self.compile()
+        found = set()
+        for longest in set(self._scanner.findall(text.lower())):
+            found.update(self._term_prefixes[longest])
+        return found
+
+    def match(self, text, tags=()):
+        """The route that should handle text, or None"""
+        found = self.terms_in(text)
+        best = len(self._ranked)
+        for term in found:
+            for rank, clause in self._term_clauses[term]:
+                if rank < best and (len(clause) == 1 or all(other in found for other in clause)):
+                    best = rank
+        for tag in tags:
+            for rank in self._tag_ranks.get(tag, ()):
+                best = min(best, rank)
+        return self._ranked[best] if best < len(self._ranked) else None
+
+    def dispatch(self, text, *args, tags=(), default=None, **kwargs):
+        """Call the matching route's handler (or the default) with text and any extra arguments"""
+        route = self.match(text, tags)
+        if route is None:
+            self.unmatched += 1
+            default = default or self.default
+            if not default:
+                self._local.route = None
+                return None
+            self._local.route = "default"
+            ROUTE_HITS.inc(route="default")
+            with span("handler.default"), HANDLER_SECONDS.time(route="default"):
+                return default(text, *args, **kwargs)
+        self._local.route = route.name
+        self.hits[route.name] += 1
+        ROUTE_HITS.inc(route=route.name)
+        with span(f"handler.{route.name}"), HANDLER_SECONDS.time(route=route.name):
+            return route.handler(text, *args, **kwargs)
+
+    def pop_last_route(self):
+        """Name of the route this thread dispatched to last ("default" for the fallback), then forget it.
+
+        A handler that dispatches again (e.g. a fallback that predicted an
+        intent) leaves the inner route, the one that actually answered.
+        """
+        route, self._local.route = getattr(self._local, "route", None), None
+        return route
+
+    def stats(self):
+        """Hit count per route, most used first, plus unmatched utterances"""
+        return {"hits": dict(self.hits.most_common()), "unmatched": self.unmatched}
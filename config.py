@@ -25,6 +25,11 @@ class Config:
     SECURITY_LEVEL = os.getenv('SECURITY_LEVEL', 'high')
     AUTO_UPDATE = os.getenv('AUTO_UPDATE', 'true').lower() == 'true'
     LEARNING_MODE = os.getenv('LEARNING_MODE', 'enabled')
+    VOICE_PIPELINE_ENABLED = os.getenv('VOICE_PIPELINE_ENABLED', 'true').lower() == 'true'  # overlap listening and answering
+    VOICE_QUEUE_SIZE = int(os.getenv('VOICE_QUEUE_SIZE', '4'))  # items buffered between pipeline stages
+    VOICE_PHRASE_TIME_LIMIT = float(os.getenv('VOICE_PHRASE_TIME_LIMIT', '10'))  # longest captured utterance
+    TTS_BARGE_IN = os.getenv('TTS_BARGE_IN', 'true').lower() == 'true'  # keep listening while speaking
+    TTS_COALESCE_CHARS = int(os.getenv('TTS_COALESCE_CHARS', '400'))  # longest text spoken as one utterance
     
     # System Paths
     CHROME_PATH = os.getenv('CHROME_PATH', 'C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe')
@@ -49,6 +54,78 @@ class Config:
     AI_MODEL = "gpt-3.5-turbo"
     MAX_TOKENS = 150
     TEMPERATURE = 0.7
+    OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL') or None  # e.g. a local OpenAI-compatible server
+    STREAM_RESPONSES = os.getenv('STREAM_RESPONSES', 'true').lower() == 'true'
+    CONTEXT_MAX_TURNS = int(os.getenv('CONTEXT_MAX_TURNS', '20'))
+    CONTEXT_TOKEN_BUDGET = int(os.getenv('CONTEXT_TOKEN_BUDGET', '1200'))  # prompt tokens, excluding the reply
+    BRAIN_ASYNC_CLIENT = os.getenv('BRAIN_ASYNC_CLIENT', 'true').lower() == 'true'
+    BRAIN_DEADLINE_SECONDS = float(os.getenv('BRAIN_DEADLINE_SECONDS', '10'))  # per request, including retries
+    BRAIN_MAX_CONCURRENCY = int(os.getenv('BRAIN_MAX_CONCURRENCY', '4'))
+    BRAIN_MAX_RETRIES = int(os.getenv('BRAIN_MAX_RETRIES', '2'))
+    BRAIN_HEDGE = os.getenv('BRAIN_HEDGE', 'true').lower() == 'true'  # re-send requests slower than the percentile below
+    BRAIN_HEDGE_PERCENTILE = float(os.getenv('BRAIN_HEDGE_PERCENTILE', '90'))  # keep below the slow tail's share
+    BRAIN_BREAKER_FAILURES = int(os.getenv('BRAIN_BREAKER_FAILURES', '5'))
+    BRAIN_BREAKER_RESET_SECONDS = float(os.getenv('BRAIN_BREAKER_RESET_SECONDS', '30'))
+    INTENT_CLASSIFIER_ENABLED = os.getenv('INTENT_CLASSIFIER_ENABLED', 'true').lower() == 'true'
+    INTENT_CONFIDENCE_THRESHOLD = float(os.getenv('INTENT_CONFIDENCE_THRESHOLD', '0.8'))  # below this, ask the LLM
+    INTENT_RETRAIN_ROWS = int(os.getenv('INTENT_RETRAIN_ROWS', '50'))  # new history rows before a retrain
+    
+    # Learning System Settings
+    LEARNING_DATA_DIR = os.getenv('LEARNING_DATA_DIR', 'learning_data')
+    LEARNING_STORE_BACKEND = os.getenv('LEARNING_STORE_BACKEND', 'journal')  # 'journal' or 'sqlite'
+    JOURNAL_SEGMENT_MAX_BYTES = int(os.getenv('JOURNAL_SEGMENT_MAX_BYTES', str(4 * 1024 * 1024)))
+    JOURNAL_COMPACT_SEGMENTS = int(os.getenv('JOURNAL_COMPACT_SEGMENTS', '8'))
+    JOURNAL_FSYNC = os.getenv('JOURNAL_FSYNC', 'false').lower() == 'true'
+    TRAINING_DEBOUNCE_SECONDS = float(os.getenv('TRAINING_DEBOUNCE_SECONDS', '5'))
+    LEARNING_MODEL_MODE = os.getenv('LEARNING_MODEL_MODE', 'batch')  # 'batch' or 'online'
+    ONLINE_HASH_FEATURES = int(os.getenv('ONLINE_HASH_FEATURES', str(2 ** 16)))
+    ONLINE_BATCH_SIZE = int(os.getenv('ONLINE_BATCH_SIZE', '8'))
+    ONLINE_SAVE_EVERY = int(os.getenv('ONLINE_SAVE_EVERY', '50'))
+    AGGREGATE_DECAY_HOURS = float(os.getenv('AGGREGATE_DECAY_HOURS', '168'))
+    LEARNING_INDEX_BACKEND = os.getenv('LEARNING_INDEX_BACKEND', 'exact')  # 'exact' or 'lsh'
+    LSH_TABLES = int(os.getenv('LSH_TABLES', '16'))
+    LSH_BITS = int(os.getenv('LSH_BITS', '16'))
+    LSH_MULTI_PROBE = os.getenv('LSH_MULTI_PROBE', 'true').lower() == 'true'
+    MODEL_VERIFY_CHECKSUMS = os.getenv('MODEL_VERIFY_CHECKSUMS', 'true').lower() == 'true'
+    RETENTION_RAW_DAYS = int(os.getenv('RETENTION_RAW_DAYS', '90'))  # 0 keeps raw history forever
+    RETENTION_DEDUPE = os.getenv('RETENTION_DEDUPE', 'true').lower() == 'true'
+    PREFERENCES_FILE = os.getenv('PREFERENCES_FILE', 'user_preferences.json')
+    FEEDBACK_LOG_FILE = os.getenv('FEEDBACK_LOG_FILE', 'user_feedback.jsonl')
+    PREFERENCES_FLUSH_SECONDS = float(os.getenv('PREFERENCES_FLUSH_SECONDS', '2'))  # write-behind delay
+
+    # Response Cache Settings
+    RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '256'))
+    RESPONSE_CACHE_TTL_SECONDS = float(os.getenv('RESPONSE_CACHE_TTL_SECONDS', str(24 * 3600)))
+    RESPONSE_CACHE_FILE = os.getenv('RESPONSE_CACHE_FILE', 'response_cache.db')  # empty disables the disk tier
+    RESPONSE_CACHE_SIMILARITY = float(os.getenv('RESPONSE_CACHE_SIMILARITY', '0'))  # 0 disables the similarity tier
+    
+    # Prefetch Settings
+    PREFETCH_ENABLED = os.getenv('PREFETCH_ENABLED', 'true').lower() == 'true'
+    PREFETCH_LEAD_MINUTES = int(os.getenv('PREFETCH_LEAD_MINUTES', '10'))  # warm this long before active hours
+    PREFETCH_MIN_ACTIVITY_SHARE = float(os.getenv('PREFETCH_MIN_ACTIVITY_SHARE', '0.05'))
+    PREFETCH_WEATHER_TTL = float(os.getenv('PREFETCH_WEATHER_TTL', '1800'))
+    PREFETCH_NEWS_TTL = float(os.getenv('PREFETCH_NEWS_TTL', '1800'))
+    PREFETCH_STATUS_TTL = float(os.getenv('PREFETCH_STATUS_TTL', '900'))
+    
+    # Startup Settings
+    WARMUP_ENABLED = os.getenv('WARMUP_ENABLED', 'true').lower() == 'true'  # load subsystems in the background after the greeting
+    WARMUP_SUBSYSTEMS = os.getenv(
+        'WARMUP_SUBSYSTEMS', 'ai_brain,learning_system,automation,emergency_security,advanced_features'
+    ).split(',')
+    STARTUP_BUDGET_SECONDS = float(os.getenv('STARTUP_BUDGET_SECONDS', '1.0'))  # import to first listen
+    STARTUP_MEMORY_BUDGET_MB = float(os.getenv('STARTUP_MEMORY_BUDGET_MB', '0'))  # RSS at first listen; 0 disables
+    
+    # Tracing Settings
+    TRACE_ENABLED = os.getenv('TRACE_ENABLED', 'false').lower() == 'true'
+    TRACE_FILE = os.getenv('TRACE_FILE', 'jarvis_trace.jsonl')
+    TRACE_MAX_BYTES = int(os.getenv('TRACE_MAX_BYTES', str(5 * 1024 * 1024)))  # rotate the trace file at this size
+    TRACE_BACKUP_COUNT = int(os.getenv('TRACE_BACKUP_COUNT', '3'))
+    
+    # Metrics Settings
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')  # Prometheus text format at /metrics
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '9464'))
     
     # Notification Settings
     ENABLE_NOTIFICATIONS = True
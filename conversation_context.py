@@ -0,0 +1,130 @@
+"""
+JARVIS Conversation Context
+Token-budgeted chat history for AI brain prompts
+"""
+
+import re
+from collections import deque
+from datetime import datetime
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+MESSAGE_OVERHEAD_TOKENS = 4  # Role and separators per chat message
+
+
+class TokenCounter:
+    """Counts tokens with tiktoken when installed, otherwise estimates them"""
+
+    def __init__(self, model="gpt-3.5-turbo"):
+        self.encoding = None
+        if tiktoken is not None:
+            try:
+                self.encoding = tiktoken.encoding_for_model(model)
+            except KeyError:
+                self.encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count(self, text):
+        if not text:
+            return 0
+        if self.encoding is not None:
+            return len(self.encoding.encode(text))
+        # Roughly one token per word or punctuation mark, a bit more for long words
+        return sum(1 + len(piece) // 8 for piece in re.findall(r"\w+|[^\w\s]", text))
+
+
+class ConversationContext:
+    """Bounded conversation memory that builds prompts within a token budget.
+
+    The last ``max_turns`` exchanges are kept in a ring buffer; older ones
+    are reduced to one short summary line each (at most ``max_summary_lines``
+    of them), so memory does not grow with session length. ``build_messages``
+    returns the system prompt, as many recent turns as fit in
+    ``token_budget`` as proper user/assistant messages, a summary of the
+    rest, and the new user message exactly once.
+    """
+
+    def __init__(self, max_turns=20, token_budget=1200, summary_words=12,
+                 max_summary_lines=20, model="gpt-3.5-turbo"):
+        self.turns = deque(maxlen=max_turns)
+        self.summary_lines = deque(maxlen=max_summary_lines)
+        self.token_budget = token_budget
+        self.summary_words = summary_words
+        self.counter = TokenCounter(model)
+        self.last_prompt_tokens = 0
+
+    def __len__(self):
+        return len(self.turns)
+
+    def add_turn(self, user_input, response):
+        """Record an exchange, summarizing the turn it pushes out of the buffer"""
+        if len(self.turns) == self.turns.maxlen:
+            self.summary_lines.append(self.summarize_turn(self.turns[0]))
+        self.turns.append({
+            "timestamp": datetime.now().isoformat(),
+            "user": user_input,
+            "jarvis": response,
+            "tokens": self.counter.count(user_input) + self.counter.count(response) + 2 * MESSAGE_OVERHEAD_TOKENS
+        })
+
+    def recent(self, count=3):
+        return list(self.turns)[-count:]
+
+    def clear(self):
+        self.turns.clear()
+        self.summary_lines.clear()
+
+    def summarize_turn(self, turn):
+        """One line per turn: the start of what the user asked and of the reply"""
+        return f"- User: {self._shorten(turn['user'])} / JARVIS: {self._shorten(turn['jarvis'])}"
+
+    def _shorten(self, text):
+        words = text.split()
+        if len(words) <= self.summary_words:
+            return text.strip()
+        return " ".join(words[:self.summary_words]) + " ..."
+
+    def build_messages(self, system_prompt, user_input):
+        """Chat messages for the next request, fitted to the token budget"""
+        fixed = (self.counter.count(system_prompt) + self.counter.count(user_input)
+                 + 2 * MESSAGE_OVERHEAD_TOKENS)
+        available = self.token_budget - fixed
+
+        # Newest turns first, verbatim, while they fit
+        included = []
+        turns = list(self.turns)
+        while turns and turns[-1]["tokens"] <= available:
+            turn = turns.pop()
+            included.append(turn)
+            available -= turn["tokens"]
+        included.reverse()
+
+        # Everything older is summarized, keeping the newest lines that fit
+        lines = list(self.summary_lines) + [self.summarize_turn(turn) for turn in turns]
+        kept = []
+        header = "Earlier in this conversation:"
+        available -= self.counter.count(header)
+        for line in reversed(lines):
+            cost = self.counter.count(line)
+            if cost > available:
+                break
+            kept.append(line)
+            available -= cost
+        kept.reverse()
+
+        system = system_prompt
+        if kept:
+            system = f"{system_prompt}\n\n{header}\n" + "\n".join(kept)
+
+        messages = [{"role": "system", "content": system}]
+        for turn in included:
+            messages.append({"role": "user", "content": turn["user"]})
+            messages.append({"role": "assistant", "content": turn["jarvis"]})
+        messages.append({"role": "user", "content": user_input})
+
+        self.last_prompt_tokens = sum(
+            self.counter.count(message["content"]) + MESSAGE_OVERHEAD_TOKENS for message in messages
+        )
+        return messages
@@ -12,9 +12,8 @@ import smtplib
 from datetime import datetime, timedelta
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-import cv2
-import numpy as np
 from config import Config
+from metrics import MONITOR_LOOP_SECONDS
 import psutil
 import requests
 
@@ -284,6 +283,7 @@ class EmergencySecuritySystem:
             # Backup important files
             important_files = [
                 'user_preferences.json',
+                'user_feedback.jsonl',
                 'security_log.json',
                 'emergency_contacts.json',
                 'automation_rules.json'
@@ -326,24 +326,25 @@ class EmergencySecuritySystem:
         def monitor():
             while self.system_monitoring:
                 try:
-                    # Monitor system resources
-                    cpu_percent = psutil.cpu_percent()
-                    memory = psutil.virtual_memory()
+                    with MONITOR_LOOP_SECONDS.time(loop="emergency"):
+                        # Monitor system resources
+                        cpu_percent = psutil.cpu_percent()
+                        memory = psutil.virtual_memory()
                     
-                    # Alert if resources are critically low
-                    if cpu_percent > 90:
-                        self.log_security_event(
-                            "high_cpu",
-                            f"CPU usage critically high: {cpu_percent}%",
-                            "high"
-                        )
+                        # Alert if resources are critically low
+                        if cpu_percent > 90:
+                            self.log_security_event(
+                                "high_cpu",
+                                f"CPU usage critically high: {cpu_percent}%",
+                                "high"
+                            )
                     
-                    if memory.percent > 90:
-                        self.log_security_event(
-                            "high_memory",
-                            f"Memory usage critically high: {memory.percent}%",
-                            "high"
-                        )
+                        if memory.percent > 90:
+                            self.log_security_event(
+                                "high_memory",
+                                f"Memory usage critically high: {memory.percent}%",
+                                "high"
+                            )
                     
                     time.sleep(30)  # Check every 30 seconds
                     
@@ -359,9 +360,10 @@ class EmergencySecuritySystem:
             while self.emergency_mode:
                 try:
                     # Monitor for suspicious activities
-                    self.monitor_network_activity()
-                    self.monitor_file_access()
-                    self.monitor_process_activity()
+                    with MONITOR_LOOP_SECONDS.time(loop="security"):
+                        self.monitor_network_activity()
+                        self.monitor_file_access()
+                        self.monitor_process_activity()
                     
                     time.sleep(60)  # Check every minute
                     
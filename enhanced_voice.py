@@ -8,10 +8,11 @@ import pyttsx3
 import threading
 import time
 import queue
-import keyboard
+import random
 from config import Config
-import numpy as np
-from scipy.io import wavfile
+from metrics import STT_SECONDS
+from tracing import span
+from tts_worker import PRIORITY_NORMAL, SpeechWorker
 import os
 
 class EnhancedVoiceSystem:
@@ -19,10 +20,6 @@ class EnhancedVoiceSystem:
         self.config = Config()
         self.recognizer = sr.Recognizer()
         self.microphone = sr.Microphone()
-        self.engine = pyttsx3.init()
-        
-        # Configure TTS engine
-        self.setup_tts()
         
         # Voice recognition settings
         self.recognizer.pause_threshold = 0.8
@@ -37,6 +34,12 @@ class EnhancedVoiceSystem:
         # Audio queue for continuous listening
         self.audio_queue = queue.Queue()
         
+        # One listener at a time; follow-up questions take priority over continuous capture
+        self.mic_lock = threading.Lock()
+        self.follow_up = threading.Event()
+        self.follow_up_audio = queue.Queue(1)  # A phrase continuous capture recorded as the answer
+        self.ambient_adjusted = False
+        
         # Voice profiles
         self.voice_profiles = {
             "jarvis_male": 0,
@@ -44,39 +47,117 @@ class EnhancedVoiceSystem:
             "friday": 1
         }
         
-    def setup_tts(self):
-        """Setup text-to-speech engine with enhanced voices"""
-        voices = self.engine.getProperty('voices')
+        # Speech worker: owns the TTS engine and speaks queued text in the background
+        self.speech = SpeechWorker(self.create_engine, self.voice_profiles, self.config.TTS_COALESCE_CHARS)
+        
+    def create_engine(self):
+        """Setup text-to-speech engine with enhanced voices (runs on the speech worker thread)"""
+        engine = pyttsx3.init()
+        voices = engine.getProperty('voices')
         
         # Set voice properties
-        self.engine.setProperty('rate', self.config.VOICE_SPEED)
-        self.engine.setProperty('volume', self.config.VOICE_VOLUME)
+        engine.setProperty('rate', self.config.VOICE_SPEED)
+        engine.setProperty('volume', self.config.VOICE_VOLUME)
         
         # Try to find the best voice
         for voice in voices:
             if 'english' in voice.name.lower() and 'male' in voice.name.lower():
-                self.engine.setProperty('voice', voice.id)
+                engine.setProperty('voice', voice.id)
                 break
+        return engine
+    
+    def speak(self, text, voice_type="jarvis_male", add_prefix=True, priority=PRIORITY_NORMAL):
+        """Queue text for the speech worker and return its SpeechHandle without waiting.
+        
+        Call wait() on the handle to block until it has been spoken.
+        """
+        # Add JARVIS-style speaking patterns
+        if add_prefix and not text.startswith(("Yes", "No", "I", "Sir", "Of course")):
+            text = f"Yes Sir, {text}"
+        return self.speech.speak(text, voice_type, priority)
+    
+    def wait_for_speech(self):
+        """Block until everything queued has been spoken"""
+        self.speech.wait()
+    
+    def stop_speaking(self):
+        """Cut off the current utterance and drop queued speech (urgent messages are kept)"""
+        self.speech.interrupt()
     
-    def speak(self, text, voice_type="jarvis_male"):
-        """Enhanced speak function with voice selection"""
+    def is_echo(self, text):
+        """Whether heard text is JARVIS's own speech picked up by the microphone"""
+        return any(text in handle.text.lower() for handle in self.speech.speaking())
+    
+    def listen_follow_up(self, timeout=10, phrase_time_limit=10, adjust_seconds=0):
+        """Audio of the answer to a follow-up question; continuous capture pauses meanwhile.
+        
+        If continuous capture is in the middle of a phrase when the question
+        has been spoken, that phrase is the answer and is handed over here
+        instead of going to the voice pipeline. Raises sr.WaitTimeoutError
+        like Recognizer.listen.
+        """
+        # Let the question finish first, so the microphone does not hear it
+        self.wait_for_speech()
+        self.follow_up.set()
         try:
-            # Set voice based on type
-            voices = self.engine.getProperty('voices')
-            if voice_type in self.voice_profiles:
-                voice_id = self.voice_profiles[voice_type]
-                if voice_id < len(voices):
-                    self.engine.setProperty('voice', voices[voice_id].id)
-            
-            # Add JARVIS-style speaking patterns
-            if not text.startswith(("Yes", "No", "I", "Sir", "Of course")):
-                text = f"Yes Sir, {text}"
-            
-            self.engine.say(text)
-            self.engine.runAndWait()
-            
+            while not self.mic_lock.acquire(timeout=0.05):
+                try:
+                    return self.follow_up_audio.get_nowait()
+                except queue.Empty:
+                    continue
+            try:
+                # Capture may have handed over its phrase just before releasing the microphone
+                try:
+                    return self.follow_up_audio.get_nowait()
+                except queue.Empty:
+                    pass
+                with self.microphone as source:
+                    if adjust_seconds:
+                        self.recognizer.adjust_for_ambient_noise(source, duration=adjust_seconds)
+                    return self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+            finally:
+                self.follow_up.clear()
+                self.mic_lock.release()
+        finally:
+            self.follow_up.clear()
+    
+    def capture_phrase(self, timeout=1, phrase_time_limit=10):
+        """Record one phrase for the voice pipeline; None if nothing was said within timeout"""
+        if self.follow_up.is_set():
+            time.sleep(0.1)
+            return None
+        try:
+            with self.mic_lock, self.microphone as source:
+                if not self.ambient_adjusted:
+                    self.recognizer.adjust_for_ambient_noise(source, duration=1)
+                    self.ambient_adjusted = True
+                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+                if self.follow_up.is_set():
+                    # A follow-up question was asked while this phrase was recorded: it is the answer
+                    try:
+                        self.follow_up_audio.put_nowait(audio)
+                    except queue.Full:
+                        pass
+                    return None
+                return audio
+        except sr.WaitTimeoutError:
+            return None
         except Exception as e:
-            print(f"TTS Error: {e}")
+            print(f"Audio capture error: {e}")
+            time.sleep(1)
+            return None
+    
+    def recognize(self, audio):
+        """Lower-cased text of captured audio, or None if it was not understood"""
+        try:
+            with span("stt.recognize"), STT_SECONDS.time(kind="command"):
+                text = self.recognizer.recognize_google(audio).lower()
+            return None if self.is_echo(text) else text
+        except sr.UnknownValueError:
+            return None
+        except sr.RequestError as e:
+            print(f"Recognition error: {e}")
+            return None
     
     def listen_for_wake_word(self):
         """Continuously listen for wake word"""
@@ -85,16 +166,21 @@ class EnhancedVoiceSystem:
         
         while True:
             try:
+                # With barge-in, listening goes on while JARVIS speaks
+                if not self.config.TTS_BARGE_IN:
+                    self.wait_for_speech()
                 with self.microphone as source:
                     # Listen for audio with timeout
                     audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=3)
                 
                 try:
                     # Recognize speech
-                    text = self.recognizer.recognize_google(audio).lower()
+                    with span("stt.wake_word"), STT_SECONDS.time(kind="wake_word"):
+                        text = self.recognizer.recognize_google(audio).lower()
                     
-                    # Check for wake word
-                    if self.wake_word in text:
+                    # Check for wake word; the user talking over JARVIS cuts it off
+                    if self.wake_word in text and not self.is_echo(text):
+                        self.stop_speaking()
                         self.is_awake = True
                         self.speak("Yes Sir, I'm listening")
                         return text
@@ -113,12 +199,11 @@ class EnhancedVoiceSystem:
     def listen_for_command(self, timeout=10):
         """Listen for user command after wake word"""
         try:
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=10)
+            audio = self.listen_follow_up(timeout=timeout, phrase_time_limit=10, adjust_seconds=0.5)
             
             try:
-                command = self.recognizer.recognize_google(audio)
+                with span("stt.recognize", follow_up=True), STT_SECONDS.time(kind="follow_up"):
+                    command = self.recognizer.recognize_google(audio)
                 print(f"Command recognized: {command}")
                 return command.lower()
             except sr.UnknownValueError:
@@ -155,8 +240,7 @@ class EnhancedVoiceSystem:
         self.speak("Voice authentication required, Sir. Please say your passphrase")
         
         try:
-            with self.microphone as source:
-                audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=5)
+            audio = self.listen_follow_up(timeout=5, phrase_time_limit=5)
             
             voice_text = self.recognizer.recognize_google(audio).lower()
             
@@ -177,8 +261,7 @@ class EnhancedVoiceSystem:
         self.speak("Emergency protocols activated. What assistance do you require?")
         
         try:
-            with self.microphone as source:
-                audio = self.recognizer.listen(source, timeout=10, phrase_time_limit=15)
+            audio = self.listen_follow_up(timeout=10, phrase_time_limit=15)
             
             emergency_command = self.recognizer.recognize_google(audio).lower()
             return emergency_command
@@ -197,7 +280,7 @@ class EnhancedVoiceSystem:
                 "All systems operational",
                 "Task executed flawlessly"
             ]
-            message = message or np.random.choice(feedback_messages)
+            message = message or random.choice(feedback_messages)
         else:
             feedback_messages = [
                 "I apologize, Sir. There was an issue",
@@ -205,7 +288,7 @@ class EnhancedVoiceSystem:
                 "System error encountered",
                 "Task failed, Sir"
             ]
-            message = message or np.random.choice(feedback_messages)
+            message = message or random.choice(feedback_messages)
         
         self.speak(message)
     
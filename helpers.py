@@ -1,25 +1,40 @@
-import pyttsx3
-import pyautogui
 import psutil
-import pyjokes
-import speech_recognition as sr
 import json
-import requests
-import geocoder
 from difflib import get_close_matches
+from functools import lru_cache
 
+# The speech engine, location lookup and dictionary are loaded on first use,
+# so importing helpers does no TTS driver start-up or network request.
 
-engine = pyttsx3.init()
-voices = engine.getProperty('voices')
-engine.setProperty('voice', voices[0].id)
-g = geocoder.ip('me')
-data = json.load(open('data.json'))
+
+@lru_cache(maxsize=None)
+def tts_engine():
+    import pyttsx3
+    engine = pyttsx3.init()
+    voices = engine.getProperty('voices')
+    engine.setProperty('voice', voices[0].id)
+    return engine
+
+
+@lru_cache(maxsize=None)
+def location():
+    """The geocoded public IP location (one network lookup per process)"""
+    import geocoder
+    return geocoder.ip('me')
+
+
+@lru_cache(maxsize=None)
+def dictionary():
+    with open('data.json') as f:
+        return json.load(f)
 
 def speak(audio) -> None:
+        engine = tts_engine()
         engine.say(audio)
         engine.runAndWait()
 
 def screenshot() -> None:
+    import pyautogui
     img = pyautogui.screenshot()
     img.save('path of folder you want to save/screenshot.png')
 
@@ -32,10 +47,12 @@ def cpu() -> None:
     speak(battery.percent)
 
 def joke() -> None:
+    import pyjokes
     for i in range(5):
         speak(pyjokes.get_jokes()[i])
 
 def takeCommand() -> str:
+    import speech_recognition as sr
     r = sr.Recognizer()
     with sr.Microphone() as source:
         print('Listening...')
@@ -56,25 +73,37 @@ def takeCommand() -> str:
         return 'None'
     return query
 
-def weather():
+def weather_report() -> list:
+    """Fetch the current weather as the lines weather() speaks"""
+    import requests
+    g = location()
     api_url = "https://fcc-weather-api.glitch.me/api/current?lat=" + \
         str(g.latlng[0]) + "&lon=" + str(g.latlng[1])
 
     data = requests.get(api_url)
     data_json = data.json()
-    if data_json['cod'] == 200:
-        main = data_json['main']
-        wind = data_json['wind']
-        weather_desc = data_json['weather'][0]
-        speak(str(data_json['coord']['lat']) + 'latitude' + str(data_json['coord']['lon']) + 'longitude')
-        speak('Current location is ' + data_json['name'] + data_json['sys']['country'] + 'dia')
-        speak('weather type ' + weather_desc['main'])
-        speak('Wind speed is ' + str(wind['speed']) + ' metre per second')
-        speak('Temperature: ' + str(main['temp']) + 'degree celcius')
-        speak('Humidity is ' + str(main['humidity']))
+    if data_json['cod'] != 200:
+        return []
+    main = data_json['main']
+    wind = data_json['wind']
+    weather_desc = data_json['weather'][0]
+    return [
+        str(data_json['coord']['lat']) + 'latitude' + str(data_json['coord']['lon']) + 'longitude',
+        'Current location is ' + data_json['name'] + data_json['sys']['country'] + 'dia',
+        'weather type ' + weather_desc['main'],
+        'Wind speed is ' + str(wind['speed']) + ' metre per second',
+        'Temperature: ' + str(main['temp']) + 'degree celcius',
+        'Humidity is ' + str(main['humidity'])
+    ]
+
+def weather(report=None):
+    """Speak a weather report, fetching one unless a (prefetched) report is given"""
+    for line in weather_report() if report is None else report:
+        speak(line)
 
 
 def translate(word):
+    data = dictionary()
     word = word.lower()
     if word in data:
         speak(data[word])
@@ -0,0 +1,234 @@
+"""
+JARVIS Intent Classifier
+Offline character n-gram intent model for routing commands without the LLM
+"""
+
+import math
+import zlib
+from collections import namedtuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+
+from keyword_matcher import INTENT_KEYWORDS, match_keywords, normalize_utterance
+from model_artifact import ModelArtifact
+
+# The order EnhancedJARVIS.execute_enhanced_query tries intent handlers in;
+# an utterance matching several intents is labelled with the first
+INTENT_PRIORITY = ("emergency", "system_control", "file_management", "web_search",
+                   "entertainment", "productivity", "information", "communication")
+
+GENERAL = "general"  # Open conversation: left to the language model
+
+# Keyword slots are filled into these to give the tables some phrasing variety
+TEMPLATES = ("{}", "{} please", "please {}", "can you {}", "could you {} for me",
+             "i want to {}", "jarvis {}", "{} now", "i need {}", "hey {}")
+
+# Paraphrases the keyword tables do not cover
+SEED_PHRASES = {
+    "emergency": [
+        "i need an ambulance", "somebody is hurt", "call for backup", "i think i am having a heart attack",
+        "there is smoke in the kitchen", "someone broke into the house", "get me a doctor right away",
+        "i fell and cannot get up", "sos"
+    ],
+    "system_control": [
+        "turn the computer off", "power down the machine", "reboot the pc", "make it louder",
+        "turn it down a bit", "dim the screen", "mute the sound", "put the laptop to sleep",
+        "switch off the system", "raise the brightness", "log me out"
+    ],
+    "file_management": [
+        "tidy up my downloads", "move these pictures to the backup drive", "rename that report",
+        "clean up the desktop", "where did i put the spreadsheet", "make a new directory",
+        "copy the photos to my drive", "remove old screenshots"
+    ],
+    "web_search": [
+        "who is the president of france", "how tall is mount everest", "look this up online",
+        "what does photosynthesis mean", "browse for cheap flights", "check wikipedia for black holes",
+        "how do i bake bread", "who invented the telephone"
+    ],
+    "entertainment": [
+        "put on some jazz", "i want to hear taylor swift", "start a film", "next track",
+        "turn on spotify", "queue up my playlist", "show me something funny to watch",
+        "stream the latest episode"
+    ],
+    "productivity": [
+        "remind me to call mom at five", "book a meeting with the team tomorrow",
+        "add dentist to my agenda", "set an alarm for seven", "take a note", "make a to do list",
+        "what is on my agenda today", "block out friday afternoon"
+    ],
+    "information": [
+        "is it going to rain tomorrow", "how cold is it outside", "what is happening in the world",
+        "give me the headlines", "how is the market doing", "what day is it",
+        "what is the forecast", "how much is bitcoin"
+    ],
+    "communication": [
+        "ring my brother", "dial john", "write to sarah", "send a whatsapp to alex",
+        "drop a line to the office", "phone the office", "reply to the last mail", "ping mike on slack"
+    ],
+    GENERAL: [
+        "how are you", "tell me a joke", "who made you", "what do you think about love",
+        "write a poem about the sea", "explain quantum physics simply", "i am bored",
+        "thank you jarvis", "good morning", "what is the meaning of life", "tell me a story",
+        "do you dream", "that was funny", "give me some advice", "let us chat",
+        "how was your day", "are you self aware", "sing me something", "never mind",
+        "what can you do", "you are awesome", "i feel tired today", "talk to me",
+        "summarize the plan for me", "walk me through it", "why is the sky blue",
+        "compare python and java", "translate hello into spanish", "recommend a book"
+    ]
+}
+
+IntentPrediction = namedtuple("IntentPrediction", ["intent", "confidence", "probabilities"])
+
+
+def label_utterance(text):
+    """Routing label of an utterance by its keywords, or GENERAL if it has none"""
+    intents = match_keywords(text).intents
+    for intent in INTENT_PRIORITY:
+        if intent in intents:
+            return intent
+    return GENERAL
+
+
+def seed_examples():
+    """(text, intent) pairs generated from the keyword tables and seed phrases"""
+    examples = []
+    for intent in INTENT_PRIORITY:
+        for keyword in INTENT_KEYWORDS[intent]:
+            label = label_utterance(keyword)  # e.g. "email" routes to productivity
+            examples.extend((template.format(keyword), label) for template in TEMPLATES)
+    for intent, phrases in SEED_PHRASES.items():
+        examples.extend((phrase, intent) for phrase in phrases)
+    return examples
+
+
+class IntentClassifier:
+    """Multinomial logistic regression over hashed character n-grams.
+
+    Utterances are normalized, padded with spaces and cut into character
+    n-grams, which are hashed (CRC-32, so stable across processes) into
+    ``n_features`` buckets with sublinear counts and L2 normalization.
+    Prediction is a gather-and-sum over the weight rows of the present
+    buckets, a softmax with a temperature fitted on held-out examples
+    (so probabilities are calibrated rather than overconfident) and
+    takes well under a millisecond. Weights live in plain numpy arrays
+    saved as a ModelArtifact.
+    """
+
+    def __init__(self, classes, weights, bias, temperature=1.0, ngram_range=(2, 4), metadata=None):
+        self.classes = list(classes)
+        self.weights = weights  # (n_features, n_classes)
+        self.bias = bias
+        self.temperature = temperature
+        self.ngram_range = tuple(ngram_range)
+        self.metadata = metadata or {}
+
+    @property
+    def n_features(self):
+        return self.weights.shape[0]
+
+    @staticmethod
+    def features(text, n_features, ngram_range=(2, 4)):
+        """Hashed bucket indices and weights of an utterance's character n-grams"""
+        padded = f" {normalize_utterance(text)} "
+        low, high = ngram_range
+        buckets = [
+            zlib.crc32(padded[start:start + size].encode()) % n_features
+            for size in range(low, high + 1)
+            for start in range(len(padded) - size + 1)
+        ]
+        if not buckets:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        indices, counts = np.unique(np.array(buckets, dtype=np.int64), return_counts=True)
+        values = 1 + np.log(counts)
+        return indices, values / np.linalg.norm(values)
+
+    @classmethod
+    def feature_matrix(cls, texts, n_features, ngram_range=(2, 4)):
+        rows = [cls.features(text, n_features, ngram_range) for text in texts]
+        indptr = np.cumsum([0] + [len(indices) for indices, _ in rows])
+        indices = np.concatenate([indices for indices, _ in rows])
+        values = np.concatenate([values for _, values in rows])
+        return csr_matrix((values, indices, indptr), shape=(len(texts), n_features))
+
+    # Prediction
+
+    def predict(self, text):
+        """Most likely intent, its probability, and the full distribution"""
+        indices, values = self.features(text, self.n_features, self.ngram_range)
+        logits = (self.bias + values @ self.weights[indices]) / self.temperature
+        logits = np.exp(logits - logits.max())
+        probabilities = logits / logits.sum()
+        best = int(probabilities.argmax())
+        return IntentPrediction(
+            self.classes[best],
+            float(probabilities[best]),
+            dict(zip(self.classes, probabilities.tolist()))
+        )
+
+    # Training
+
+    @classmethod
+    def train(cls, examples, n_features=2 ** 14, ngram_range=(2, 4), C=10.0, calibration_split=0.2,
+              random_state=42, metadata=None):
+        """Fit on (text, intent) pairs, calibrating the temperature on a held-out split"""
+        texts = [text for text, _ in examples]
+        labels = [label for _, label in examples]
+        X = cls.feature_matrix(texts, n_features, ngram_range)
+
+        X_fit, X_held, y_fit, y_held = train_test_split(
+            X, labels, test_size=calibration_split, random_state=random_state, stratify=labels
+        )
+        model = LogisticRegression(C=C, solver='newton-cg', max_iter=200).fit(X_fit, y_fit)
+        temperature = cls.fit_temperature(model.decision_function(X_held), model.classes_, y_held)
+
+        # The final weights use every example; the temperature carries over
+        model = LogisticRegression(C=C, solver='newton-cg', max_iter=200).fit(X, labels)
+        return cls(
+            model.classes_.tolist(),
+            np.ascontiguousarray(model.coef_.T, dtype=np.float32),
+            model.intercept_.astype(np.float32),
+            temperature,
+            ngram_range,
+            dict(metadata or {}, examples=len(examples))
+        )
+
+    @staticmethod
+    def fit_temperature(logits, classes, labels):
+        """Softmax temperature minimizing held-out negative log-likelihood"""
+        targets = np.searchsorted(classes, labels)
+        best, best_loss = 1.0, math.inf
+        for temperature in np.exp(np.linspace(np.log(0.1), np.log(10), 61)):
+            scaled = logits / temperature
+            scaled -= scaled.max(axis=1, keepdims=True)
+            log_probs = scaled - np.log(np.exp(scaled).sum(axis=1, keepdims=True))
+            loss = -log_probs[np.arange(len(targets)), targets].mean()
+            if loss < best_loss:
+                best, best_loss = float(temperature), loss
+        return best
+
+    # Persistence
+
+    def save(self, root):
+        ModelArtifact.save(root, {
+            "classes": np.array(self.classes, dtype=str),
+            "weights": self.weights,
+            "bias": self.bias
+        }, dict(self.metadata, temperature=self.temperature, ngram_range=list(self.ngram_range)))
+
+    @classmethod
+    def load(cls, root, verify=True):
+        """The saved classifier under root, or None if there is none"""
+        artifact = ModelArtifact.open(root, verify=verify)
+        if artifact is None:
+            return None
+        metadata = dict(artifact.metadata)
+        return cls(
+            artifact["classes"].tolist(),
+            artifact["weights"],
+            np.asarray(artifact["bias"]),
+            metadata.pop("temperature"),
+            metadata.pop("ngram_range"),
+            metadata
+        )
@@ -0,0 +1,156 @@
+"""
+JARVIS Interaction Index
+Cached sparse TF-IDF matrix for fast similar-interaction lookup
+"""
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from sklearn.preprocessing import normalize
+
+from model_artifact import ModelArtifact
+
+
+class InteractionIndex:
+    """CSR matrix of L2-normalized TF-IDF rows for successful interactions.
+
+    Rows are kept in growable numpy buffers so that adding one interaction
+    is amortized O(nnz of that row), and a query is a single sparse
+    matrix-vector product followed by a partial sort. A loaded index serves
+    straight from read-only memory-mapped arrays until the first new row
+    forces a copy into growable buffers.
+    """
+
+    ARRAYS = ("data", "indices", "indptr", "row_ids")
+
+    def __init__(self, index_dir='interaction_index'):
+        self.index_dir = index_dir
+        self.saved_rows = 0
+        self.clear()
+
+    def clear(self, n_features=0):
+        """Drop all rows (e.g. after the vectorizer vocabulary changed)"""
+        self.n_features = n_features
+        self.n_rows = 0
+        self._data = np.zeros(1024, dtype=np.float32)
+        self._indices = np.zeros(1024, dtype=np.int32)
+        self._indptr = np.zeros(1025, dtype=np.int64)
+        self._row_ids = np.zeros(1024, dtype=np.int64)
+
+    def __len__(self):
+        return self.n_rows
+
+    @property
+    def last_row_id(self):
+        return int(self._row_ids[self.n_rows - 1]) if self.n_rows else -1
+
+    @staticmethod
+    def _grow(array, needed):
+        if needed <= len(array) and array.flags.writeable:
+            return array
+        grown = np.zeros(max(needed, 2 * len(array)), dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+    def add_rows(self, vectors, row_ids):
+        """Append already-vectorized rows with their interaction ids"""
+        vectors = normalize(csr_matrix(vectors, dtype=np.float32, copy=True), norm='l2', copy=False)
+        vectors.sort_indices()
+        if not self.n_rows:
+            self.n_features = vectors.shape[1]
+
+        nnz = self._indptr[self.n_rows]
+        new_rows = vectors.shape[0]
+        new_nnz = vectors.nnz
+
+        self._data = self._grow(self._data, nnz + new_nnz)
+        self._indices = self._grow(self._indices, nnz + new_nnz)
+        self._indptr = self._grow(self._indptr, self.n_rows + new_rows + 1)
+        self._row_ids = self._grow(self._row_ids, self.n_rows + new_rows)
+
+        self._data[nnz:nnz + new_nnz] = vectors.data
+        self._indices[nnz:nnz + new_nnz] = vectors.indices
+        self._indptr[self.n_rows + 1:self.n_rows + new_rows + 1] = vectors.indptr[1:] + nnz
+        self._row_ids[self.n_rows:self.n_rows + new_rows] = row_ids
+        self.n_rows += new_rows
+
+    def rebuild(self, vectorizer, rows):
+        """Re-vectorize every successful interaction with a freshly fitted vectorizer"""
+        self.clear(len(vectorizer.vocabulary_))
+        self.add_interactions(vectorizer, rows)
+
+    def add(self, vectorizer, row_id, text):
+        """Incrementally index one new successful interaction"""
+        self.add_rows(vectorizer.transform([text]), [row_id])
+
+    def add_interactions(self, vectorizer, rows, chunk_size=10000):
+        """Index the successful ones among (row_id, interaction) pairs"""
+        row_ids, texts = [], []
+        for row_id, interaction in rows:
+            if interaction["success"]:
+                row_ids.append(row_id)
+                texts.append(interaction["user_input"])
+            if len(texts) >= chunk_size:
+                self.add_rows(vectorizer.transform(texts), row_ids)
+                row_ids, texts = [], []
+        if texts:
+            self.add_rows(vectorizer.transform(texts), row_ids)
+
+    @property
+    def matrix(self):
+        """Zero-copy CSR view over the live part of the buffers"""
+        nnz = self._indptr[self.n_rows]
+        return csr_matrix(
+            (self._data[:nnz], self._indices[:nnz], self._indptr[:self.n_rows + 1]),
+            shape=(self.n_rows, self.n_features),
+            copy=False
+        )
+
+    def query(self, vector, k=3, threshold=0.3):
+        """Return up to k (row_id, similarity) pairs above the threshold"""
+        if not self.n_rows:
+            return []
+
+        # A dense query vector keeps this a single CSR mat-vec pass
+        query = normalize(csr_matrix(vector, dtype=np.float32), norm='l2').toarray().ravel()
+        scores = self.matrix.dot(query)
+
+        candidates = np.flatnonzero(scores > threshold)
+        if len(candidates) > k:
+            top = np.argpartition(scores[candidates], -k)[-k:]
+            candidates = candidates[top]
+        candidates = candidates[np.argsort(-scores[candidates], kind='stable')]
+
+        return [(int(self._row_ids[i]), float(scores[i])) for i in candidates]
+
+    def to_arrays(self, prefix=''):
+        """Views of the live part of the buffers, keyed for a ModelArtifact"""
+        nnz = self._indptr[self.n_rows]
+        return {
+            f"{prefix}data": self._data[:nnz],
+            f"{prefix}indices": self._indices[:nnz],
+            f"{prefix}indptr": self._indptr[:self.n_rows + 1],
+            f"{prefix}row_ids": self._row_ids[:self.n_rows]
+        }
+
+    def from_arrays(self, artifact, prefix=''):
+        """Adopt saved arrays without copying them; returns False if absent"""
+        if f"{prefix}row_ids" not in artifact:
+            return False
+        self.clear(int(artifact.metadata[f"{prefix}n_features"]))
+        self._data = artifact[f"{prefix}data"]
+        self._indices = artifact[f"{prefix}indices"]
+        self._indptr = artifact[f"{prefix}indptr"]
+        self._row_ids = artifact[f"{prefix}row_ids"]
+        self.n_rows = len(self._row_ids)
+        self.saved_rows = self.n_rows
+        return True
+
+    def save(self):
+        """Persist the index as a standalone artifact"""
+        ModelArtifact.save(self.index_dir, self.to_arrays(), {"n_features": self.n_features})
+        self.saved_rows = self.n_rows
+
+    def load(self):
+        """Memory-map a saved index; returns False if there is none"""
+        artifact = ModelArtifact.open(self.index_dir)
+        return artifact is not None and self.from_arrays(artifact)
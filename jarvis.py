@@ -11,6 +11,7 @@ from OCR import OCR
 from diction import translate
 from helpers import *
 from youtube import youtube
+from command_router import CommandRouter
 from sys import platform
 import os
 import getpass
@@ -38,6 +39,7 @@ class Jarvis:
         webbrowser.register(
             'chrome', None, webbrowser.BackgroundBrowser(self.chrome_path)
         )
+        self.router = self.build_router()
 
     def wishMe(self) -> None:
         hour = int(datetime.datetime.now().hour)
@@ -60,173 +62,152 @@ class Jarvis:
         server.sendmail('email', to, content)
         server.close()
 
-    def execute_query(self, query):
-        # TODO: make this more concise
-        if 'wikipedia' in query:
-            speak('Searching Wikipedia....')
-            query = query.replace('wikipedia', '')
-            results = wikipedia.summary(query, sentences=2)
-            speak('According to Wikipedia')
-            print(results)
-            speak(results)
-        elif 'youtube downloader' in query:
-            exec(open('youtube_downloader.py').read())
-            
-        
-            
-        elif 'voice' in query:
-            if 'female' in query:
-                engine.setProperty('voice', voices[1].id)
-            else:
-                engine.setProperty('voice', voices[0].id)
-            speak("Hello Sir, I have switched my voice. How is it?")
-
-        if 'jarvis are you there' in query:
-            speak("Yes Sir, at your service")
-        if 'jarvis who made you' in query:
-            speak("Yes Sir, my master build me in AI")
-            
-         
-
-        elif 'open youtube' in query:
-
-            webbrowser.get('chrome').open_new_tab('https://youtube.com')
-            
-        elif 'open amazon' in query:
-            webbrowser.get('chrome').open_new_tab('https://amazon.com')
-
-        elif 'cpu' in query:
-            cpu()
-
-        elif 'joke' in query:
-            joke()
-
-        elif 'screenshot' in query:
-            speak("taking screenshot")
-            screenshot()
-
-        elif 'open google' in query:
-            webbrowser.get('chrome').open_new_tab('https://google.com')
-
-        elif 'open stackoverflow' in query:
-            webbrowser.get('chrome').open_new_tab('https://stackoverflow.com')
-
-        elif 'play music' in query:
-            os.startfile("D:\\RoiNa.mp3")
-
-        elif 'search youtube' in query:
-            speak('What you want to search on Youtube?')
-            youtube(takeCommand())
-        elif 'the time' in query:
-            strTime = datetime.datetime.now().strftime("%H:%M:%S")
-            speak(f'Sir, the time is {strTime}')
-
-        elif 'search' in query:
-            speak('What do you want to search for?')
-            search = takeCommand()
-            url = 'https://google.com/search?q=' + search
-            webbrowser.get('chrome').open_new_tab(
-                url)
-            speak('Here is What I found for' + search)
-
-        elif 'location' in query:
-            speak('What is the location?')
-            location = takeCommand()
-            url = 'https://google.nl/maps/place/' + location + '/&amp;'
-            webbrowser.get('chrome').open_new_tab(url)
-            speak('Here is the location ' + location)
-
-        elif 'your master' in query:
-            if platform == "win32" or "darwin":
-                speak('Gaurav is my master. He created me couple of days ago')
-            elif platform == "linux" or platform == "linux2":
-                name = getpass.getuser()
-                speak(name, 'is my master. He is running me right now')
-
-        elif 'your name' in query:
-            speak('My name is JARVIS')
-        elif 'who made you' in query:
-            speak('I was created by my AI master in 2021')
-            
-        elif 'stands for' in query:
-            speak('J.A.R.V.I.S stands for JUST A RATHER VERY INTELLIGENT SYSTEM')
-        elif 'open code' in query:
-            if platform == "win32":
-                os.startfile(
-                    "C:\\Users\\gs935\\AppData\\Local\\Programs\\Microsoft VS Code\\Code.exe")
-            elif platform == "linux" or platform == "linux2" or "darwin":
-                os.system('code .')
-
-        elif 'shutdown' in query:
-            if platform == "win32":
-                os.system('shutdown /p /f')
-            elif platform == "linux" or platform == "linux2" or "darwin":
-                os.system('poweroff')
-
-        elif 'cpu' in query:
-            cpu()
-        elif 'your friend' in query:
-            speak('My friends are Google assisstant alexa and siri')
-
-        elif 'joke' in query:
-            joke()
-
-        elif 'screenshot' in query:
-            speak("taking screenshot")
-            screenshot()
-
-        elif 'github' in query:
-            webbrowser.get('chrome').open_new_tab(
-                'https://github.com/gauravsingh9356')
-
-        elif 'remember that' in query:
-            speak("what should i remember sir")
-            rememberMessage = takeCommand()
-            speak("you said me to remember"+rememberMessage)
-            remember = open('data.txt', 'w')
-            remember.write(rememberMessage)
-            remember.close()
-
-        elif 'do you remember anything' in query:
-            remember = open('data.txt', 'r')
-            speak("you said me to remember that" + remember.read())
-
-        elif 'sleep' in query:
-            sys.exit()
-
-        elif 'dictionary' in query:
-            speak('What you want to search in your intelligent dictionary?')
-            translate(takeCommand())
-
-        elif 'news' in query:
-            speak('Ofcourse sir..')
-            speak_news()
-            speak('Do you want to read the full news...')
-            test = takeCommand()
-            if 'yes' in test:
-                speak('Ok Sir, Opening browser...')
-                webbrowser.open(getNewsUrl())
-                speak('You can now read the full news from this website.')
-            else:
-                speak('No Problem Sir')
+    def build_router(self):
+        # Command table, in the order commands are tried
+        router = CommandRouter()
+        router.add('wikipedia', self.searchWikipedia, ['wikipedia'])
+        router.add('youtube_downloader', lambda query: exec(open('youtube_downloader.py').read()),
+                   ['youtube downloader'])
+        router.add('voice', self.changeVoice, ['voice'])
+        router.add('are_you_there', lambda query: speak("Yes Sir, at your service"), ['jarvis are you there'])
+        router.add('jarvis_who_made_you', lambda query: speak("Yes Sir, my master build me in AI"),
+                   ['jarvis who made you'])
+        router.add('open_youtube', lambda query: self.openTab('https://youtube.com'), ['open youtube'])
+        router.add('open_amazon', lambda query: self.openTab('https://amazon.com'), ['open amazon'])
+        router.add('cpu', lambda query: cpu(), ['cpu'])
+        router.add('joke', lambda query: joke(), ['joke'])
+        router.add('screenshot', self.takeScreenshot, ['screenshot'])
+        router.add('open_google', lambda query: self.openTab('https://google.com'), ['open google'])
+        router.add('open_stackoverflow', lambda query: self.openTab('https://stackoverflow.com'),
+                   ['open stackoverflow'])
+        router.add('play_music', lambda query: os.startfile("D:\\RoiNa.mp3"), ['play music'])
+        router.add('search_youtube', self.searchYoutube, ['search youtube'])
+        router.add('time', self.tellTime, ['the time'])
+        router.add('search', self.searchGoogle, ['search'])
+        router.add('location', self.showLocation, ['location'])
+        router.add('your_master', self.tellMaster, ['your master'])
+        router.add('your_name', lambda query: speak('My name is JARVIS'), ['your name'])
+        router.add('who_made_you', lambda query: speak('I was created by my AI master in 2021'), ['who made you'])
+        router.add('stands_for', lambda query: speak('J.A.R.V.I.S stands for JUST A RATHER VERY INTELLIGENT SYSTEM'),
+                   ['stands for'])
+        router.add('open_code', self.openCode, ['open code'])
+        router.add('shutdown', self.shutdown, ['shutdown'])
+        router.add('your_friend', lambda query: speak('My friends are Google assisstant alexa and siri'),
+                   ['your friend'])
+        router.add('github', lambda query: self.openTab('https://github.com/gauravsingh9356'), ['github'])
+        router.add('remember', self.remember, ['remember that'])
+        router.add('recall', self.recall, ['do you remember anything'])
+        router.add('sleep', lambda query: sys.exit(), ['sleep'])
+        router.add('dictionary', self.searchDictionary, ['dictionary'])
+        router.add('news', self.readNews, ['news'])
+        router.add('email', self.emailGaurav, ['email to gaurav'])
+        return router
 
-        elif 'voice' in query:
-            if 'female' in query:
-                engine.setProperty('voice', voices[0].id)
-            else:
-                engine.setProperty('voice', voices[1].id)
-            speak("Hello Sir, I have switched my voice. How is it?")
-
-        elif 'email to gaurav' in query:
-            try:
-                speak('What should I say?')
-                content = takeCommand()
-                to = 'email'
-                self.sendEmail(to, content)
-                speak('Email has been sent!')
-
-            except Exception as e:
-                speak('Sorry sir, Not able to send email at the moment')
+    def execute_query(self, query):
+        self.router.dispatch(query)
+
+    def openTab(self, url):
+        webbrowser.get('chrome').open_new_tab(url)
+
+    def searchWikipedia(self, query):
+        speak('Searching Wikipedia....')
+        query = query.replace('wikipedia', '')
+        results = wikipedia.summary(query, sentences=2)
+        speak('According to Wikipedia')
+        print(results)
+        speak(results)
+
+    def changeVoice(self, query):
+        if 'female' in query:
+            engine.setProperty('voice', voices[1].id)
+        else:
+            engine.setProperty('voice', voices[0].id)
+        speak("Hello Sir, I have switched my voice. How is it?")
+
+    def takeScreenshot(self, query):
+        speak("taking screenshot")
+        screenshot()
+
+    def searchYoutube(self, query):
+        speak('What you want to search on Youtube?')
+        youtube(takeCommand())
+
+    def tellTime(self, query):
+        strTime = datetime.datetime.now().strftime("%H:%M:%S")
+        speak(f'Sir, the time is {strTime}')
+
+    def searchGoogle(self, query):
+        speak('What do you want to search for?')
+        search = takeCommand()
+        url = 'https://google.com/search?q=' + search
+        self.openTab(url)
+        speak('Here is What I found for' + search)
+
+    def showLocation(self, query):
+        speak('What is the location?')
+        location = takeCommand()
+        url = 'https://google.nl/maps/place/' + location + '/&amp;'
+        self.openTab(url)
+        speak('Here is the location ' + location)
+
+    def tellMaster(self, query):
+        if platform == "win32" or "darwin":
+            speak('Gaurav is my master. He created me couple of days ago')
+        elif platform == "linux" or platform == "linux2":
+            name = getpass.getuser()
+            speak(name, 'is my master. He is running me right now')
+
+    def openCode(self, query):
+        if platform == "win32":
+            os.startfile(
+                "C:\\Users\\gs935\\AppData\\Local\\Programs\\Microsoft VS Code\\Code.exe")
+        elif platform == "linux" or platform == "linux2" or "darwin":
+            os.system('code .')
+
+    def shutdown(self, query):
+        if platform == "win32":
+            os.system('shutdown /p /f')
+        elif platform == "linux" or platform == "linux2" or "darwin":
+            os.system('poweroff')
+
+    def remember(self, query):
+        speak("what should i remember sir")
+        rememberMessage = takeCommand()
+        speak("you said me to remember"+rememberMessage)
+        remember = open('data.txt', 'w')
+        remember.write(rememberMessage)
+        remember.close()
+
+    def recall(self, query):
+        remember = open('data.txt', 'r')
+        speak("you said me to remember that" + remember.read())
+
+    def searchDictionary(self, query):
+        speak('What you want to search in your intelligent dictionary?')
+        translate(takeCommand())
+
+    def readNews(self, query):
+        speak('Ofcourse sir..')
+        speak_news()
+        speak('Do you want to read the full news...')
+        test = takeCommand()
+        if 'yes' in test:
+            speak('Ok Sir, Opening browser...')
+            webbrowser.open(getNewsUrl())
+            speak('You can now read the full news from this website.')
+        else:
+            speak('No Problem Sir')
+
+    def emailGaurav(self, query):
+        try:
+            speak('What should I say?')
+            content = takeCommand()
+            to = 'email'
+            self.sendEmail(to, content)
+            speak('Email has been sent!')
+
+        except Exception as e:
+            speak('Sorry sir, Not able to send email at the moment')
 
 
 def wakeUpJARVIS():
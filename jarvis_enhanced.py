@@ -7,61 +7,135 @@ import os
 import sys
 import threading
 import time
+import webbrowser
 from datetime import datetime
-import cv2
 import json
 from config import Config
-from enhanced_voice import EnhancedVoiceSystem
-from ai_brain import AIBrain
-from smart_automation import SmartAutomation
-from jarvis_gui import JARVISGUI
-from advanced_features import AdvancedFeatures
-from learning_system import LearningSystem
-from emergency_security import EmergencySecuritySystem
+from prefetch import PrefetchScheduler
+from command_router import CommandRouter
+from keyword_matcher import match_keywords
+from lazy_subsystem import lazy_subsystem, is_loaded, warm_up
+from metrics import configure_metrics
+from tracing import configure_tracing, span
+from tts_worker import PRIORITY_LOW, PRIORITY_URGENT
 
 # Import original modules
 from helpers import *
-from news import speak_news, getNewsUrl
-from OCR import OCR
-from diction import translate
+from news import speak_news, getNewsUrl, get_headlines
 from youtube import youtube
 
 class EnhancedJARVIS:
+    """JARVIS Enhanced front-end.
+
+    Subsystems are built on first use (see lazy_subsystem), importing their
+    modules only then, so the assistant can greet and listen without
+    loading OpenAI, scikit-learn, OpenCV or Selenium first. After the
+    greeting, the rest are optionally warmed up on a background thread.
+    """
+    
     def __init__(self):
         self.config = Config()
-        self.voice_system = EnhancedVoiceSystem()
-        self.ai_brain = AIBrain()
-        self.automation = SmartAutomation()
-        self.advanced_features = AdvancedFeatures()
-        self.learning_system = LearningSystem()
-        self.emergency_security = EmergencySecuritySystem()
-        
-        # Initialize face recognition
-        self.setup_face_recognition()
+        configure_tracing(self.config)
+        self.router = self.build_router()
+        self.background_started = False
         
         # System status
         self.is_authenticated = False
         self.is_active = False
         self.security_level = self.config.SECURITY_LEVEL
         
-        # Start automation scheduler
-        self.automation.start_scheduler()
-        
         print("JARVIS Enhanced System Initialized")
     
+    # Subsystems
+    
+    @lazy_subsystem
+    def voice_system(self):
+        from enhanced_voice import EnhancedVoiceSystem
+        return EnhancedVoiceSystem()
+    
+    @lazy_subsystem
+    def ai_brain(self):
+        from ai_brain import AIBrain
+        ai_brain = AIBrain()
+        
+        # The response cache's similarity tier reuses the learned TF-IDF vectors
+        if ai_brain.response_cache:
+            ai_brain.response_cache.vectorizer_fn = lambda: self.learning_system.fitted_vectorizer()
+        
+        # The local intent classifier also learns from the recorded utterances
+        ai_brain.attach_intent_history(
+            self.learning_system.training_utterances,
+            self.learning_system.store.interaction_count()
+        )
+        return ai_brain
+    
+    @lazy_subsystem
+    def learning_system(self):
+        from learning_system import LearningSystem
+        return LearningSystem()
+    
+    @lazy_subsystem
+    def automation(self):
+        from smart_automation import SmartAutomation
+        automation = SmartAutomation()
+        automation.start_scheduler()
+        return automation
+    
+    @lazy_subsystem
+    def advanced_features(self):
+        from advanced_features import AdvancedFeatures
+        return AdvancedFeatures()
+    
+    @lazy_subsystem
+    def emergency_security(self):
+        from emergency_security import EmergencySecuritySystem
+        return EmergencySecuritySystem()
+    
+    @lazy_subsystem
+    def prefetcher(self):
+        """Briefing data fetched ahead of the user's usual hours"""
+        prefetcher = PrefetchScheduler(
+            lambda: self.learning_system.active_hours(),
+            lead_minutes=self.config.PREFETCH_LEAD_MINUTES
+        )
+        prefetcher.register("weather", weather_report, self.config.PREFETCH_WEATHER_TTL)
+        prefetcher.register("news", get_headlines, self.config.PREFETCH_NEWS_TTL)
+        prefetcher.register("system_status", self.system_status_text, self.config.PREFETCH_STATUS_TTL)
+        prefetcher.register(
+            "suggestions", lambda hour: self.ai_brain.get_smart_suggestions(hour=hour), 3600, hourly=True
+        )
+        return prefetcher
+    
+    @lazy_subsystem
+    def recognizer(self):
+        """LBPH face recognizer, loaded only when face authentication is used"""
+        return self.setup_face_recognition()
+    
+    def start_background_services(self):
+        """Start the prefetcher and warm up the remaining subsystems in the background"""
+        if self.background_started:
+            return
+        self.background_started = True
+        if self.config.PREFETCH_ENABLED:
+            self.prefetcher.start()
+        if self.config.WARMUP_ENABLED:
+            warm_up(self, self.config.WARMUP_SUBSYSTEMS)
+    
     def setup_face_recognition(self):
         """Setup face recognition system"""
         try:
-            self.recognizer = cv2.face.LBPHFaceRecognizer_create()
-            self.recognizer.read('./Face-Recognition/trainer/trainer.yml')
+            import cv2
+            recognizer = cv2.face.LBPHFaceRecognizer_create()
+            recognizer.read('./Face-Recognition/trainer/trainer.yml')
             self.cascadePath = "./Face-Recognition/haarcascade_frontalface_default.xml"
             self.faceCascade = cv2.CascadeClassifier(self.cascadePath)
             self.font = cv2.FONT_HERSHEY_SIMPLEX
             self.names = ['', 'Sir']  # Update with actual user names
             print("Face recognition system loaded")
+            return recognizer
         except Exception as e:
             print(f"Face recognition setup error: {e}")
-            self.recognizer = None
+            return None
     
     def authenticate_user(self):
         """Enhanced authentication system"""
@@ -93,6 +167,7 @@ class EnhancedJARVIS:
         if not self.recognizer:
             return True  # Skip if face recognition not available
         
+        import cv2
         cam = cv2.VideoCapture(0, cv2.CAP_DSHOW)
         cam.set(3, 640)
         cam.set(4, 480)
@@ -153,11 +228,18 @@ class EnhancedJARVIS:
             greeting = "Good Evening, Sir"
         
         self.voice_system.speak(greeting)
+        self.start_background_services()
         
-        # Get weather and system status
+        # Weather, status and suggestions are normally prefetched already;
+        # a suggestion is only offered once the AI brain has been loaded
         try:
-            weather()
-            self.get_system_status()
+            # The weather report speaks through its own engine, after the greeting
+            self.voice_system.wait_for_speech()
+            weather(self.prefetcher.get("weather"))
+            self.voice_system.speak(self.prefetcher.get("system_status"))
+            suggestions = self.prefetcher.get("suggestions") if is_loaded(self, "ai_brain") else None
+            if suggestions:
+                self.voice_system.speak(suggestions[0], priority=PRIORITY_LOW)
         except:
             pass
         
@@ -166,72 +248,105 @@ class EnhancedJARVIS:
     def get_system_status(self):
         """Get comprehensive system status"""
         try:
-            cpu_percent = psutil.cpu_percent()
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            
-            status = f"System Status: CPU at {cpu_percent}%, Memory at {memory.percent}%, Disk at {disk.percent}%"
-            self.voice_system.speak(status)
+            self.voice_system.speak(self.system_status_text())
         except Exception as e:
             print(f"System status error: {e}")
     
-    def execute_enhanced_query(self, query):
+    def system_status_text(self):
+        """Current CPU, memory and disk usage as one sentence"""
+        cpu_percent = psutil.cpu_percent()
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage('/')
+        
+        return f"System Status: CPU at {cpu_percent}%, Memory at {memory.percent}%, Disk at {disk.percent}%"
+    
+    def respond(self, query):
+        """Execute a query and speak the answer; AI replies are spoken while they stream in.
+        
+        Callers open the turn span around listening and this call, so
+        recognition, handling and speech are traced as one turn.
+        """
+        spoken = []
+        
+        def speak_sentence(sentence):
+            self.voice_system.speak(sentence, add_prefix=not spoken)
+            spoken.append(sentence)
+        
+        on_sentence = speak_sentence if self.config.STREAM_RESPONSES else None
+        response = self.execute_enhanced_query(query, on_sentence=on_sentence)
+        # Queued only: the voice loop goes back to listening while the answer is spoken
+        if not spoken:
+            self.voice_system.speak(response)
+        return response
+    
+    def build_router(self):
+        """Command table: keyword intents first, then phrase commands, in priority order"""
+        router = CommandRouter()
+        router.add("emergency", self.handle_emergency, tags=["emergency"])
+        router.add("system_control", self.handle_system_control, tags=["system_control"])
+        router.add("file_management", self.handle_file_management, tags=["file_management"])
+        router.add("web_search", self.handle_web_search, tags=["web_search"])
+        router.add("entertainment", self.handle_entertainment, tags=["entertainment"])
+        router.add("productivity", self.handle_productivity, tags=["productivity"])
+        router.add("information", self.handle_information, tags=["information"])
+        router.add("communication", self.handle_communication, tags=["communication"])
+        router.add("calendar", self.handle_calendar, ["calendar"])
+        router.add("email", self.handle_email_advanced, ["email"])
+        router.add("web_scraping", self.handle_web_scraping, [("web", "scrape")])
+        router.add("learning", self.handle_learning, ["learning", "insights"])
+        router.add("emergency_advanced", self.handle_emergency_advanced, ["emergency"])
+        return router
+    
+    def execute_enhanced_query(self, query, on_sentence=None):
         """Enhanced query execution with AI integration"""
         try:
-            # Analyze intent
-            intents = self.ai_brain.analyze_intent(query)
-            
-            # Process based on intent
-            if "emergency" in intents:
-                return self.handle_emergency(query)
-            elif "system_control" in intents:
-                return self.handle_system_control(query)
-            elif "file_management" in intents:
-                return self.handle_file_management(query)
-            elif "web_search" in intents:
-                return self.handle_web_search(query)
-            elif "entertainment" in intents:
-                return self.handle_entertainment(query)
-            elif "productivity" in intents:
-                return self.handle_productivity(query)
-            elif "information" in intents:
-                return self.handle_information(query)
-            elif "communication" in intents:
-                return self.handle_communication(query)
-            elif "calendar" in query.lower():
-                return self.handle_calendar(query)
-            elif "email" in query.lower():
-                return self.handle_email_advanced(query)
-            elif "web" in query.lower() and "scrape" in query.lower():
-                return self.handle_web_scraping(query)
-            elif "learning" in query.lower() or "insights" in query.lower():
-                return self.handle_learning(query)
-            elif "emergency" in query.lower():
-                return self.handle_emergency_advanced(query)
-            else:
-                # Use AI brain for general conversation
-                response = self.ai_brain.process_command(query)
-                
-                # Record interaction for learning
-                self.learning_system.record_interaction(query, response)
-                
-                return response
+            return self.dispatch_query(query, on_sentence)
                 
         except Exception as e:
             return f"I apologize, Sir. An error occurred: {str(e)}"
     
+    def dispatch_query(self, query, on_sentence=None):
+        """Run the query's handler (or converse()); a failing handler's error propagates"""
+        # Keyword intents and command phrases are matched in one routing pass;
+        # the AI brain is only built if the query falls through to converse()
+        with span("intent.analyze"):
+            intents = match_keywords(query).intents
+        return self.router.dispatch(
+            query, tags=intents, default=lambda query: self.converse(query, on_sentence)
+        )
+    
+    def converse(self, query, on_sentence=None):
+        """Fallback for queries no command matched"""
+        # A confident local intent prediction still avoids an LLM call
+        predicted = self.ai_brain.predict_intent(query)
+        if predicted:
+            return self.router.dispatch(query, tags=[predicted])
+        
+        # Use AI brain for general conversation, streaming sentences if asked to
+        if on_sentence:
+            response = self.ai_brain.process_command_streaming(query, on_sentence)
+        else:
+            response = self.ai_brain.process_command(query)
+        
+        # Record interaction for learning
+        with span("learning.record_interaction"):
+            self.learning_system.record_interaction(query, response)
+        
+        return response
+    
     def handle_emergency(self, query):
         """Handle emergency situations"""
-        self.voice_system.speak("Emergency protocols activated, Sir. What assistance do you require?")
+        self.voice_system.speak("Emergency protocols activated, Sir. What assistance do you require?",
+                                priority=PRIORITY_URGENT)
         
         # Implement emergency procedures
         if "police" in query or "911" in query:
-            self.voice_system.speak("Contacting emergency services...")
+            self.voice_system.speak("Contacting emergency services...", priority=PRIORITY_URGENT)
             # Add actual emergency contact functionality
         elif "fire" in query:
-            self.voice_system.speak("Fire emergency detected. Initiating safety protocols...")
+            self.voice_system.speak("Fire emergency detected. Initiating safety protocols...", priority=PRIORITY_URGENT)
         elif "medical" in query:
-            self.voice_system.speak("Medical emergency detected. Contacting medical services...")
+            self.voice_system.speak("Medical emergency detected. Contacting medical services...", priority=PRIORITY_URGENT)
         
         return "Emergency protocols activated"
     
@@ -303,6 +418,7 @@ class EnhancedJARVIS:
             else:
                 return "Music directory not found, Sir"
         elif "joke" in query:
+            self.voice_system.wait_for_speech()
             joke()
             return "Telling jokes, Sir"
         else:
@@ -325,11 +441,14 @@ class EnhancedJARVIS:
     
     def handle_information(self, query):
         """Handle information requests"""
+        # News and weather speak through their own engine, so earlier speech goes first
         if "news" in query:
-            speak_news()
+            self.voice_system.wait_for_speech()
+            speak_news(self.prefetcher.get("news"))
             return "News briefing complete, Sir"
         elif "weather" in query:
-            weather()
+            self.voice_system.wait_for_speech()
+            weather(self.prefetcher.get("weather"))
             return "Weather information provided, Sir"
         elif "time" in query:
             strTime = datetime.now().strftime("%H:%M:%S")
@@ -488,6 +607,7 @@ class EnhancedJARVIS:
     
     def run_gui_mode(self):
         """Run JARVIS in GUI mode"""
+        from jarvis_gui import JARVISGUI
         gui = JARVISGUI()
         gui.run()
     
@@ -500,19 +620,52 @@ class EnhancedJARVIS:
         
         self.wish_me()
         
+        if self.config.VOICE_PIPELINE_ENABLED:
+            self.run_voice_pipeline()
+            return
+        
         while True:
             try:
-                query = self.voice_system.listen_for_wake_word()
-                if query:
-                    response = self.execute_enhanced_query(query)
-                    self.voice_system.speak(response)
+                with span("turn"):
+                    query = self.voice_system.listen_for_wake_word()
+                    if query:
+                        self.respond(query)
             except KeyboardInterrupt:
-                self.voice_system.speak("Goodbye, Sir.")
+                self.voice_system.speak("Goodbye, Sir.").wait()
                 break
             except Exception as e:
                 print(f"Error: {e}")
                 time.sleep(1)
     
+    def run_voice_pipeline(self):
+        """Voice loop that keeps listening while earlier commands are handled and spoken"""
+        import asyncio
+        from voice_pipeline import VoicePipeline
+        
+        # The pipeline traces each phrase as a turn, from recognition to speech
+        def handle(query, on_sentence):
+            return self.execute_enhanced_query(
+                query, on_sentence=on_sentence if self.config.STREAM_RESPONSES else None
+            )
+        
+        pipeline = VoicePipeline(
+            capture=lambda: self.voice_system.capture_phrase(
+                phrase_time_limit=self.config.VOICE_PHRASE_TIME_LIMIT
+            ),
+            recognize=self.voice_system.recognize,
+            handle=handle,
+            speak=lambda text, first: self.voice_system.speak(text, add_prefix=first).wait(),
+            interrupt=self.voice_system.stop_speaking,
+            wake_word=self.voice_system.wake_word,
+            queue_size=self.config.VOICE_QUEUE_SIZE
+        )
+        try:
+            asyncio.run(pipeline.run())
+        except KeyboardInterrupt:
+            pass
+        print(f"Voice pipeline stats: {pipeline.stats()}")
+        self.voice_system.speak("Goodbye, Sir.").wait()
+    
     def run_continuous_mode(self):
         """Run JARVIS in continuous listening mode"""
         if not self.is_authenticated:
@@ -523,15 +676,32 @@ class EnhancedJARVIS:
         self.wish_me()
         self.voice_system.speak("Continuous listening mode activated, Sir.")
         
-        for command in self.voice_system.continuous_listening():
-            response = self.execute_enhanced_query(command)
-            self.voice_system.speak(response)
+        commands = self.voice_system.continuous_listening()
+        while True:
+            # Listening runs inside the turn, so its recognition spans belong to it
+            with span("turn"):
+                command = next(commands, None)
+                if command is None:
+                    break
+                self.respond(command)
 
 def main():
     """Main function to run JARVIS"""
+    if len(sys.argv) > 1 and sys.argv[1].lower() == "startup-profile":
+        from startup_profile import main as startup_profile
+        sys.exit(startup_profile(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1].lower() == "batch":
+        from batch_runner import main as batch
+        sys.exit(batch(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1].lower() == "trace-summary":
+        from tracing import main as trace_summary
+        sys.exit(trace_summary(sys.argv[2:]))
+    
     print("Initializing JARVIS Enhanced System...")
     
     jarvis = EnhancedJARVIS()
+    # Only the long-running modes below serve metrics
+    configure_metrics(jarvis.config)
     
     # Check command line arguments for mode
     if len(sys.argv) > 1:
@@ -544,7 +714,7 @@ def main():
         elif mode == "continuous":
             jarvis.run_continuous_mode()
         else:
-            print("Invalid mode. Use: gui, voice, or continuous")
+            print("Invalid mode. Use: gui, voice, continuous, batch, startup-profile or trace-summary")
     else:
         # Default to GUI mode
         jarvis.run_gui_mode()
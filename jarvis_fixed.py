@@ -20,6 +20,7 @@ import time
 from helpers import *
 from news import speak_news, getNewsUrl
 from youtube import youtube
+from command_router import CommandRouter
 
 class FixedJARVIS:
     def __init__(self):
@@ -41,6 +42,8 @@ class FixedJARVIS:
         # Setup browser
         self.setup_browser()
         
+        self.router = self.build_router()
+        
         print("JARVIS Fixed System Initialized")
     
     def test_microphone(self):
@@ -135,269 +138,242 @@ class FixedJARVIS:
         
         self.speak("I am JARVIS Fixed. How may I assist you today, Sir?")
     
+    def build_router(self):
+        """Command table, in the order commands are tried"""
+        router = CommandRouter(default=self.unknown_command)
+        router.add("wikipedia", self.search_wikipedia, ["wikipedia"])
+        router.add("search_youtube", self.search_youtube, ["search youtube"])
+        
+        # Open websites
+        router.add("open_youtube", lambda query: self.open_website('https://youtube.com', "YouTube"), ["open youtube"])
+        router.add("open_google", lambda query: self.open_website('https://google.com', "Google"), ["open google"])
+        router.add("open_amazon", lambda query: self.open_website('https://amazon.com', "Amazon"), ["open amazon"])
+        router.add("open_stackoverflow", lambda query: self.open_website('https://stackoverflow.com', "Stack Overflow"),
+                   ["open stackoverflow"])
+        
+        # System information
+        router.add("cpu", self.report_cpu, ["cpu"])
+        router.add("joke", self.tell_joke, ["joke"])
+        router.add("screenshot", self.take_screenshot, ["screenshot"])
+        router.add("time", self.tell_time, ["the time"])
+        router.add("search", self.search_google, ["search"])
+        router.add("location", self.show_location, ["location"])
+        router.add("news", self.read_news, ["news"])
+        router.add("voice", self.change_voice, ["voice"])
+        
+        # System control
+        router.add("shutdown", lambda query: self.run_system_command(
+            "Shutting down system in 30 seconds, Sir", "shutdown /s /t 30", "shutdown the system", "Shutdown"
+        ), ["shutdown"])
+        router.add("restart", lambda query: self.run_system_command(
+            "Restarting system in 30 seconds, Sir", "shutdown /r /t 30", "restart the system", "Restart"
+        ), ["restart"])
+        router.add("sleep", lambda query: self.run_system_command(
+            "Putting system to sleep, Sir", "rundll32.exe powrprof.dll,SetSuspendState 0,1,0",
+            "put the system to sleep", "Sleep"
+        ), ["sleep"])
+        router.add("lock", lambda query: self.run_system_command(
+            "Locking system, Sir", "rundll32.exe user32.dll,LockWorkStation", "lock the system", "Lock"
+        ), ["lock"])
+        
+        # Volume control
+        router.add("volume_up", lambda query: self.press_key(
+            'volumeup', "Volume increased, Sir", "increase the volume", "Volume"
+        ), ["volume up"])
+        router.add("volume_down", lambda query: self.press_key(
+            'volumedown', "Volume decreased, Sir", "decrease the volume", "Volume"
+        ), ["volume down"])
+        router.add("mute", lambda query: self.press_key(
+            'volumemute', "Audio muted, Sir", "mute the audio", "Mute"
+        ), ["mute"])
+        
+        # JARVIS responses
+        router.add("are_you_there", lambda query: self.speak("Yes Sir, at your service"), ["jarvis are you there"])
+        router.add("jarvis_who_made_you", lambda query: self.speak("Yes Sir, my master built me with AI"),
+                   ["jarvis who made you"])
+        router.add("your_name", lambda query: self.speak('My name is JARVIS'), ["your name"])
+        router.add("who_made_you", lambda query: self.speak('I was created by my AI master'), ["who made you"])
+        router.add("stands_for", lambda query: self.speak('J.A.R.V.I.S stands for JUST A RATHER VERY INTELLIGENT SYSTEM'),
+                   ["stands for"])
+        router.add("your_friend", lambda query: self.speak('My friends are Google assistant, Alexa and Siri'),
+                   ["your friend"])
+        
+        # File operations
+        router.add("remember", self.remember, ["remember that"])
+        router.add("recall", self.recall, ["do you remember anything"])
+        
+        # Exit ('sleep' is taken by the system sleep command above)
+        router.add("goodbye", self.goodbye, ["goodbye", "exit"])
+        return router
+    
     def execute_command(self, query):
         """Execute voice commands"""
         try:
             print(f"Executing command: {query}")
             
-            # Wikipedia search
-            if 'wikipedia' in query:
-                self.speak('Searching Wikipedia....')
-                query = query.replace('wikipedia', '')
-                try:
-                    results = wikipedia.summary(query, sentences=2)
-                    self.speak('According to Wikipedia')
-                    print(results)
-                    self.speak(results)
-                except Exception as e:
-                    self.speak("Sorry, I couldn't find information on that topic")
-                    print(f"Wikipedia error: {e}")
-            
-            # YouTube search
-            elif 'search youtube' in query:
-                self.speak('What you want to search on Youtube?')
-                search_term = self.listen()
-                if search_term:
-                    try:
-                        youtube(search_term)
-                        self.speak(f"Searching YouTube for {search_term}")
-                    except Exception as e:
-                        self.speak("Sorry, I couldn't search YouTube")
-                        print(f"YouTube error: {e}")
-            
-            # Open websites
-            elif 'open youtube' in query:
-                try:
-                    webbrowser.open('https://youtube.com')
-                    self.speak("Opening YouTube, Sir")
-                except Exception as e:
-                    self.speak("Sorry, I couldn't open YouTube")
-                    print(f"Browser error: {e}")
-            
-            elif 'open google' in query:
-                try:
-                    webbrowser.open('https://google.com')
-                    self.speak("Opening Google, Sir")
-                except Exception as e:
-                    self.speak("Sorry, I couldn't open Google")
-                    print(f"Browser error: {e}")
-            
-            elif 'open amazon' in query:
-                try:
-                    webbrowser.open('https://amazon.com')
-                    self.speak("Opening Amazon, Sir")
-                except Exception as e:
-                    self.speak("Sorry, I couldn't open Amazon")
-                    print(f"Browser error: {e}")
-            
-            elif 'open stackoverflow' in query:
-                try:
-                    webbrowser.open('https://stackoverflow.com')
-                    self.speak("Opening Stack Overflow, Sir")
-                except Exception as e:
-                    self.speak("Sorry, I couldn't open Stack Overflow")
-                    print(f"Browser error: {e}")
-            
-            # System information
-            elif 'cpu' in query:
-                try:
-                    cpu()
-                except Exception as e:
-                    self.speak("Sorry, I couldn't get CPU information")
-                    print(f"CPU error: {e}")
-            
-            elif 'joke' in query:
-                try:
-                    joke()
-                except Exception as e:
-                    self.speak("Sorry, I couldn't tell a joke")
-                    print(f"Joke error: {e}")
-            
-            elif 'screenshot' in query:
-                self.speak("Taking screenshot")
-                try:
-                    screenshot()
-                except Exception as e:
-                    self.speak("Sorry, I couldn't take a screenshot")
-                    print(f"Screenshot error: {e}")
-            
-            # Time
-            elif 'the time' in query:
-                strTime = datetime.datetime.now().strftime("%H:%M:%S")
-                self.speak(f'Sir, the time is {strTime}')
-            
-            # Search
-            elif 'search' in query:
-                self.speak('What do you want to search for?')
-                search_term = self.listen()
-                if search_term:
-                    try:
-                        url = f'https://google.com/search?q={search_term}'
-                        webbrowser.open(url)
-                        self.speak(f'Here is what I found for {search_term}')
-                    except Exception as e:
-                        self.speak("Sorry, I couldn't perform the search")
-                        print(f"Search error: {e}")
-            
-            # Location
-            elif 'location' in query:
-                self.speak('What is the location?')
-                location = self.listen()
-                if location:
-                    try:
-                        url = f'https://google.nl/maps/place/{location}/&amp;'
-                        webbrowser.open(url)
-                        self.speak(f'Here is the location {location}')
-                    except Exception as e:
-                        self.speak("Sorry, I couldn't find the location")
-                        print(f"Location error: {e}")
-            
-            # News
-            elif 'news' in query:
-                self.speak('Of course sir..')
-                try:
-                    speak_news()
-                    self.speak('Do you want to read the full news...')
-                    test = self.listen()
-                    if test and 'yes' in test:
-                        self.speak('Ok Sir, Opening browser...')
-                        webbrowser.open(getNewsUrl())
-                        self.speak('You can now read the full news from this website.')
-                    else:
-                        self.speak('No Problem Sir')
-                except Exception as e:
-                    self.speak("Sorry, I couldn't get the news")
-                    print(f"News error: {e}")
-            
-            # Voice change
-            elif 'voice' in query:
-                try:
-                    voices = self.engine.getProperty('voices')
-                    if voices and len(voices) > 1:
-                        if 'female' in query:
-                            self.engine.setProperty('voice', voices[1].id)
-                        else:
-                            self.engine.setProperty('voice', voices[0].id)
-                        self.speak("Hello Sir, I have switched my voice. How is it?")
-                    else:
-                        self.speak("Sorry, I only have one voice available")
-                except Exception as e:
-                    self.speak("Sorry, I couldn't change my voice")
-                    print(f"Voice change error: {e}")
-            
-            # System control
-            elif 'shutdown' in query:
-                self.speak("Shutting down system in 30 seconds, Sir")
-                try:
-                    os.system("shutdown /s /t 30")
-                except Exception as e:
-                    self.speak("Sorry, I couldn't shutdown the system")
-                    print(f"Shutdown error: {e}")
-            
-            elif 'restart' in query:
-                self.speak("Restarting system in 30 seconds, Sir")
-                try:
-                    os.system("shutdown /r /t 30")
-                except Exception as e:
-                    self.speak("Sorry, I couldn't restart the system")
-                    print(f"Restart error: {e}")
-            
-            elif 'sleep' in query:
-                self.speak("Putting system to sleep, Sir")
-                try:
-                    os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
-                except Exception as e:
-                    self.speak("Sorry, I couldn't put the system to sleep")
-                    print(f"Sleep error: {e}")
-            
-            elif 'lock' in query:
-                self.speak("Locking system, Sir")
-                try:
-                    os.system("rundll32.exe user32.dll,LockWorkStation")
-                except Exception as e:
-                    self.speak("Sorry, I couldn't lock the system")
-                    print(f"Lock error: {e}")
-            
-            # Volume control
-            elif 'volume up' in query:
-                try:
-                    pyautogui.press('volumeup')
-                    self.speak("Volume increased, Sir")
-                except Exception as e:
-                    self.speak("Sorry, I couldn't increase the volume")
-                    print(f"Volume error: {e}")
-            
-            elif 'volume down' in query:
-                try:
-                    pyautogui.press('volumedown')
-                    self.speak("Volume decreased, Sir")
-                except Exception as e:
-                    self.speak("Sorry, I couldn't decrease the volume")
-                    print(f"Volume error: {e}")
-            
-            elif 'mute' in query:
-                try:
-                    pyautogui.press('volumemute')
-                    self.speak("Audio muted, Sir")
-                except Exception as e:
-                    self.speak("Sorry, I couldn't mute the audio")
-                    print(f"Mute error: {e}")
-            
-            # JARVIS responses
-            elif 'jarvis are you there' in query:
-                self.speak("Yes Sir, at your service")
-            
-            elif 'jarvis who made you' in query:
-                self.speak("Yes Sir, my master built me with AI")
-            
-            elif 'your name' in query:
-                self.speak('My name is JARVIS')
-            
-            elif 'who made you' in query:
-                self.speak('I was created by my AI master')
-            
-            elif 'stands for' in query:
-                self.speak('J.A.R.V.I.S stands for JUST A RATHER VERY INTELLIGENT SYSTEM')
-            
-            elif 'your friend' in query:
-                self.speak('My friends are Google assistant, Alexa and Siri')
-            
-            # File operations
-            elif 'remember that' in query:
-                self.speak("What should I remember sir")
-                remember_message = self.listen()
-                if remember_message:
-                    self.speak(f"You said me to remember {remember_message}")
-                    try:
-                        with open('data.txt', 'w') as f:
-                            f.write(remember_message)
-                    except Exception as e:
-                        self.speak("Sorry, I couldn't save that")
-                        print(f"Save error: {e}")
-            
-            elif 'do you remember anything' in query:
-                try:
-                    with open('data.txt', 'r') as f:
-                        content = f.read()
-                    self.speak(f"You said me to remember that {content}")
-                except:
-                    self.speak("I don't remember anything, Sir")
-            
-            # Exit
-            elif 'sleep' in query or 'goodbye' in query or 'exit' in query:
-                self.speak("Goodbye Sir, have a great day!")
-                return False
-            
-            else:
-                self.speak("I didn't understand that command, Sir. Could you try again?")
-            
-            return True
+            # Handlers return False only to end the session
+            return self.router.dispatch(query) is not False
             
         except Exception as e:
             self.speak(f"I apologize, Sir. An error occurred: {str(e)}")
             print(f"Command execution error: {e}")
             return True
     
+    def search_wikipedia(self, query):
+        self.speak('Searching Wikipedia....')
+        query = query.replace('wikipedia', '')
+        try:
+            results = wikipedia.summary(query, sentences=2)
+            self.speak('According to Wikipedia')
+            print(results)
+            self.speak(results)
+        except Exception as e:
+            self.speak("Sorry, I couldn't find information on that topic")
+            print(f"Wikipedia error: {e}")
+    
+    def search_youtube(self, query):
+        self.speak('What you want to search on Youtube?')
+        search_term = self.listen()
+        if search_term:
+            try:
+                youtube(search_term)
+                self.speak(f"Searching YouTube for {search_term}")
+            except Exception as e:
+                self.speak("Sorry, I couldn't search YouTube")
+                print(f"YouTube error: {e}")
+    
+    def open_website(self, url, name):
+        try:
+            webbrowser.open(url)
+            self.speak(f"Opening {name}, Sir")
+        except Exception as e:
+            self.speak(f"Sorry, I couldn't open {name}")
+            print(f"Browser error: {e}")
+    
+    def report_cpu(self, query):
+        try:
+            cpu()
+        except Exception as e:
+            self.speak("Sorry, I couldn't get CPU information")
+            print(f"CPU error: {e}")
+    
+    def tell_joke(self, query):
+        try:
+            joke()
+        except Exception as e:
+            self.speak("Sorry, I couldn't tell a joke")
+            print(f"Joke error: {e}")
+    
+    def take_screenshot(self, query):
+        self.speak("Taking screenshot")
+        try:
+            screenshot()
+        except Exception as e:
+            self.speak("Sorry, I couldn't take a screenshot")
+            print(f"Screenshot error: {e}")
+    
+    def tell_time(self, query):
+        strTime = datetime.datetime.now().strftime("%H:%M:%S")
+        self.speak(f'Sir, the time is {strTime}')
+    
+    def search_google(self, query):
+        self.speak('What do you want to search for?')
+        search_term = self.listen()
+        if search_term:
+            try:
+                url = f'https://google.com/search?q={search_term}'
+                webbrowser.open(url)
+                self.speak(f'Here is what I found for {search_term}')
+            except Exception as e:
+                self.speak("Sorry, I couldn't perform the search")
+                print(f"Search error: {e}")
+    
+    def show_location(self, query):
+        self.speak('What is the location?')
+        location = self.listen()
+        if location:
+            try:
+                url = f'https://google.nl/maps/place/{location}/&amp;'
+                webbrowser.open(url)
+                self.speak(f'Here is the location {location}')
+            except Exception as e:
+                self.speak("Sorry, I couldn't find the location")
+                print(f"Location error: {e}")
+    
+    def read_news(self, query):
+        self.speak('Of course sir..')
+        try:
+            speak_news()
+            self.speak('Do you want to read the full news...')
+            test = self.listen()
+            if test and 'yes' in test:
+                self.speak('Ok Sir, Opening browser...')
+                webbrowser.open(getNewsUrl())
+                self.speak('You can now read the full news from this website.')
+            else:
+                self.speak('No Problem Sir')
+        except Exception as e:
+            self.speak("Sorry, I couldn't get the news")
+            print(f"News error: {e}")
+    
+    def change_voice(self, query):
+        try:
+            voices = self.engine.getProperty('voices')
+            if voices and len(voices) > 1:
+                if 'female' in query:
+                    self.engine.setProperty('voice', voices[1].id)
+                else:
+                    self.engine.setProperty('voice', voices[0].id)
+                self.speak("Hello Sir, I have switched my voice. How is it?")
+            else:
+                self.speak("Sorry, I only have one voice available")
+        except Exception as e:
+            self.speak("Sorry, I couldn't change my voice")
+            print(f"Voice change error: {e}")
+    
+    def run_system_command(self, announcement, command, action, label):
+        self.speak(announcement)
+        try:
+            os.system(command)
+        except Exception as e:
+            self.speak(f"Sorry, I couldn't {action}")
+            print(f"{label} error: {e}")
+    
+    def press_key(self, key, confirmation, action, label):
+        try:
+            pyautogui.press(key)
+            self.speak(confirmation)
+        except Exception as e:
+            self.speak(f"Sorry, I couldn't {action}")
+            print(f"{label} error: {e}")
+    
+    def remember(self, query):
+        self.speak("What should I remember sir")
+        remember_message = self.listen()
+        if remember_message:
+            self.speak(f"You said me to remember {remember_message}")
+            try:
+                with open('data.txt', 'w') as f:
+                    f.write(remember_message)
+            except Exception as e:
+                self.speak("Sorry, I couldn't save that")
+                print(f"Save error: {e}")
+    
+    def recall(self, query):
+        try:
+            with open('data.txt', 'r') as f:
+                content = f.read()
+            self.speak(f"You said me to remember that {content}")
+        except:
+            self.speak("I don't remember anything, Sir")
+    
+    def goodbye(self, query):
+        self.speak("Goodbye Sir, have a great day!")
+        return False
+    
+    def unknown_command(self, query):
+        self.speak("I didn't understand that command, Sir. Could you try again?")
+    
     def run(self):
         """Main run function"""
         self.wish_me()
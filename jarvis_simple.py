@@ -19,6 +19,7 @@ import cv2
 from helpers import *
 from news import speak_news, getNewsUrl
 from youtube import youtube
+from command_router import CommandRouter
 
 class SimpleJARVIS:
     def __init__(self):
@@ -35,6 +36,8 @@ class SimpleJARVIS:
         # Setup browser
         self.setup_browser()
         
+        self.router = self.build_router()
+        
         print("JARVIS Simple System Initialized")
     
     def setup_browser(self):
@@ -96,178 +99,167 @@ class SimpleJARVIS:
         
         self.speak("I am JARVIS Simple. How may I assist you today, Sir?")
     
+    def build_router(self):
+        """Command table, in the order commands are tried"""
+        router = CommandRouter(default=self.unknown_command)
+        router.add("wikipedia", self.search_wikipedia, ["wikipedia"])
+        router.add("search_youtube", self.search_youtube, ["search youtube"])
+        
+        # Open websites
+        router.add("open_youtube", lambda query: self.open_website('https://youtube.com', "YouTube"), ["open youtube"])
+        router.add("open_google", lambda query: self.open_website('https://google.com', "Google"), ["open google"])
+        router.add("open_amazon", lambda query: self.open_website('https://amazon.com', "Amazon"), ["open amazon"])
+        router.add("open_stackoverflow", lambda query: self.open_website('https://stackoverflow.com', "Stack Overflow"),
+                   ["open stackoverflow"])
+        
+        # System information
+        router.add("cpu", lambda query: cpu(), ["cpu"])
+        router.add("joke", lambda query: joke(), ["joke"])
+        router.add("screenshot", self.take_screenshot, ["screenshot"])
+        router.add("time", self.tell_time, ["the time"])
+        router.add("search", self.search_google, ["search"])
+        router.add("location", self.show_location, ["location"])
+        router.add("news", self.read_news, ["news"])
+        router.add("voice", self.change_voice, ["voice"])
+        
+        # System control
+        router.add("shutdown", lambda query: self.run_system_command("Shutting down system in 30 seconds, Sir",
+                                                                     "shutdown /s /t 30"), ["shutdown"])
+        router.add("restart", lambda query: self.run_system_command("Restarting system in 30 seconds, Sir",
+                                                                    "shutdown /r /t 30"), ["restart"])
+        router.add("sleep", lambda query: self.run_system_command("Putting system to sleep, Sir",
+                                                                  "rundll32.exe powrprof.dll,SetSuspendState 0,1,0"),
+                   ["sleep"])
+        router.add("lock", lambda query: self.run_system_command("Locking system, Sir",
+                                                                 "rundll32.exe user32.dll,LockWorkStation"), ["lock"])
+        
+        # Volume control
+        router.add("volume_up", lambda query: self.press_key('volumeup', "Volume increased, Sir"), ["volume up"])
+        router.add("volume_down", lambda query: self.press_key('volumedown', "Volume decreased, Sir"), ["volume down"])
+        router.add("mute", lambda query: self.press_key('volumemute', "Audio muted, Sir"), ["mute"])
+        
+        # JARVIS responses
+        router.add("are_you_there", lambda query: self.speak("Yes Sir, at your service"), ["jarvis are you there"])
+        router.add("jarvis_who_made_you", lambda query: self.speak("Yes Sir, my master built me with AI"),
+                   ["jarvis who made you"])
+        router.add("your_name", lambda query: self.speak('My name is JARVIS'), ["your name"])
+        router.add("who_made_you", lambda query: self.speak('I was created by my AI master'), ["who made you"])
+        router.add("stands_for", lambda query: self.speak('J.A.R.V.I.S stands for JUST A RATHER VERY INTELLIGENT SYSTEM'),
+                   ["stands for"])
+        router.add("your_friend", lambda query: self.speak('My friends are Google assistant, Alexa and Siri'),
+                   ["your friend"])
+        
+        # File operations
+        router.add("remember", self.remember, ["remember that"])
+        router.add("recall", self.recall, ["do you remember anything"])
+        
+        # Exit ('sleep' is taken by the system sleep command above)
+        router.add("goodbye", self.goodbye, ["goodbye", "exit"])
+        return router
+    
     def execute_command(self, query):
         """Execute voice commands"""
         try:
-            # Wikipedia search
-            if 'wikipedia' in query:
-                self.speak('Searching Wikipedia....')
-                query = query.replace('wikipedia', '')
-                results = wikipedia.summary(query, sentences=2)
-                self.speak('According to Wikipedia')
-                print(results)
-                self.speak(results)
-            
-            # YouTube search
-            elif 'search youtube' in query:
-                self.speak('What you want to search on Youtube?')
-                search_term = self.listen()
-                if search_term:
-                    youtube(search_term)
-            
-            # Open websites
-            elif 'open youtube' in query:
-                webbrowser.open('https://youtube.com')
-                self.speak("Opening YouTube, Sir")
-            
-            elif 'open google' in query:
-                webbrowser.open('https://google.com')
-                self.speak("Opening Google, Sir")
-            
-            elif 'open amazon' in query:
-                webbrowser.open('https://amazon.com')
-                self.speak("Opening Amazon, Sir")
-            
-            elif 'open stackoverflow' in query:
-                webbrowser.open('https://stackoverflow.com')
-                self.speak("Opening Stack Overflow, Sir")
-            
-            # System information
-            elif 'cpu' in query:
-                cpu()
-            
-            elif 'joke' in query:
-                joke()
-            
-            elif 'screenshot' in query:
-                self.speak("Taking screenshot")
-                screenshot()
-            
-            # Time
-            elif 'the time' in query:
-                strTime = datetime.datetime.now().strftime("%H:%M:%S")
-                self.speak(f'Sir, the time is {strTime}')
-            
-            # Search
-            elif 'search' in query:
-                self.speak('What do you want to search for?')
-                search_term = self.listen()
-                if search_term:
-                    url = f'https://google.com/search?q={search_term}'
-                    webbrowser.open(url)
-                    self.speak(f'Here is what I found for {search_term}')
-            
-            # Location
-            elif 'location' in query:
-                self.speak('What is the location?')
-                location = self.listen()
-                if location:
-                    url = f'https://google.nl/maps/place/{location}/&amp;'
-                    webbrowser.open(url)
-                    self.speak(f'Here is the location {location}')
-            
-            # News
-            elif 'news' in query:
-                self.speak('Of course sir..')
-                speak_news()
-                self.speak('Do you want to read the full news...')
-                test = self.listen()
-                if test and 'yes' in test:
-                    self.speak('Ok Sir, Opening browser...')
-                    webbrowser.open(getNewsUrl())
-                    self.speak('You can now read the full news from this website.')
-                else:
-                    self.speak('No Problem Sir')
-            
-            # Voice change
-            elif 'voice' in query:
-                voices = self.engine.getProperty('voices')
-                if 'female' in query:
-                    self.engine.setProperty('voice', voices[1].id)
-                else:
-                    self.engine.setProperty('voice', voices[0].id)
-                self.speak("Hello Sir, I have switched my voice. How is it?")
-            
-            # System control
-            elif 'shutdown' in query:
-                self.speak("Shutting down system in 30 seconds, Sir")
-                os.system("shutdown /s /t 30")
-            
-            elif 'restart' in query:
-                self.speak("Restarting system in 30 seconds, Sir")
-                os.system("shutdown /r /t 30")
-            
-            elif 'sleep' in query:
-                self.speak("Putting system to sleep, Sir")
-                os.system("rundll32.exe powrprof.dll,SetSuspendState 0,1,0")
-            
-            elif 'lock' in query:
-                self.speak("Locking system, Sir")
-                os.system("rundll32.exe user32.dll,LockWorkStation")
-            
-            # Volume control
-            elif 'volume up' in query:
-                pyautogui.press('volumeup')
-                self.speak("Volume increased, Sir")
-            
-            elif 'volume down' in query:
-                pyautogui.press('volumedown')
-                self.speak("Volume decreased, Sir")
-            
-            elif 'mute' in query:
-                pyautogui.press('volumemute')
-                self.speak("Audio muted, Sir")
-            
-            # JARVIS responses
-            elif 'jarvis are you there' in query:
-                self.speak("Yes Sir, at your service")
-            
-            elif 'jarvis who made you' in query:
-                self.speak("Yes Sir, my master built me with AI")
-            
-            elif 'your name' in query:
-                self.speak('My name is JARVIS')
-            
-            elif 'who made you' in query:
-                self.speak('I was created by my AI master')
-            
-            elif 'stands for' in query:
-                self.speak('J.A.R.V.I.S stands for JUST A RATHER VERY INTELLIGENT SYSTEM')
-            
-            elif 'your friend' in query:
-                self.speak('My friends are Google assistant, Alexa and Siri')
-            
-            # File operations
-            elif 'remember that' in query:
-                self.speak("What should I remember sir")
-                remember_message = self.listen()
-                if remember_message:
-                    self.speak(f"You said me to remember {remember_message}")
-                    with open('data.txt', 'w') as f:
-                        f.write(remember_message)
-            
-            elif 'do you remember anything' in query:
-                try:
-                    with open('data.txt', 'r') as f:
-                        content = f.read()
-                    self.speak(f"You said me to remember that {content}")
-                except:
-                    self.speak("I don't remember anything, Sir")
-            
-            # Exit
-            elif 'sleep' in query or 'goodbye' in query or 'exit' in query:
-                self.speak("Goodbye Sir, have a great day!")
-                return False
-            
-            else:
-                self.speak("I didn't understand that command, Sir. Could you try again?")
-            
-            return True
+            # Handlers return False only to end the session
+            return self.router.dispatch(query) is not False
             
         except Exception as e:
             self.speak(f"I apologize, Sir. An error occurred: {str(e)}")
             return True
     
+    def search_wikipedia(self, query):
+        self.speak('Searching Wikipedia....')
+        query = query.replace('wikipedia', '')
+        results = wikipedia.summary(query, sentences=2)
+        self.speak('According to Wikipedia')
+        print(results)
+        self.speak(results)
+    
+    def search_youtube(self, query):
+        self.speak('What you want to search on Youtube?')
+        search_term = self.listen()
+        if search_term:
+            youtube(search_term)
+    
+    def open_website(self, url, name):
+        webbrowser.open(url)
+        self.speak(f"Opening {name}, Sir")
+    
+    def take_screenshot(self, query):
+        self.speak("Taking screenshot")
+        screenshot()
+    
+    def tell_time(self, query):
+        strTime = datetime.datetime.now().strftime("%H:%M:%S")
+        self.speak(f'Sir, the time is {strTime}')
+    
+    def search_google(self, query):
+        self.speak('What do you want to search for?')
+        search_term = self.listen()
+        if search_term:
+            url = f'https://google.com/search?q={search_term}'
+            webbrowser.open(url)
+            self.speak(f'Here is what I found for {search_term}')
+    
+    def show_location(self, query):
+        self.speak('What is the location?')
+        location = self.listen()
+        if location:
+            url = f'https://google.nl/maps/place/{location}/&amp;'
+            webbrowser.open(url)
+            self.speak(f'Here is the location {location}')
+    
+    def read_news(self, query):
+        self.speak('Of course sir..')
+        speak_news()
+        self.speak('Do you want to read the full news...')
+        test = self.listen()
+        if test and 'yes' in test:
+            self.speak('Ok Sir, Opening browser...')
+            webbrowser.open(getNewsUrl())
+            self.speak('You can now read the full news from this website.')
+        else:
+            self.speak('No Problem Sir')
+    
+    def change_voice(self, query):
+        voices = self.engine.getProperty('voices')
+        if 'female' in query:
+            self.engine.setProperty('voice', voices[1].id)
+        else:
+            self.engine.setProperty('voice', voices[0].id)
+        self.speak("Hello Sir, I have switched my voice. How is it?")
+    
+    def run_system_command(self, announcement, command):
+        self.speak(announcement)
+        os.system(command)
+    
+    def press_key(self, key, confirmation):
+        pyautogui.press(key)
+        self.speak(confirmation)
+    
+    def remember(self, query):
+        self.speak("What should I remember sir")
+        remember_message = self.listen()
+        if remember_message:
+            self.speak(f"You said me to remember {remember_message}")
+            with open('data.txt', 'w') as f:
+                f.write(remember_message)
+    
+    def recall(self, query):
+        try:
+            with open('data.txt', 'r') as f:
+                content = f.read()
+            self.speak(f"You said me to remember that {content}")
+        except:
+            self.speak("I don't remember anything, Sir")
+    
+    def goodbye(self, query):
+        self.speak("Goodbye Sir, have a great day!")
+        return False
+    
+    def unknown_command(self, query):
+        self.speak("I didn't understand that command, Sir. Could you try again?")
+    
     def run(self):
         """Main run function"""
         self.wish_me()
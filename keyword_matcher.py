@@ -0,0 +1,137 @@
+"""
+JARVIS Keyword Matcher
+Single-pass matching of intent, interest and command keywords
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+INTENT_KEYWORDS = {
+    "system_control": ["shutdown", "restart", "sleep", "lock", "volume", "brightness"],
+    "web_search": ["search", "google", "find", "look up", "what is"],
+    "entertainment": ["play", "music", "video", "movie", "youtube", "netflix"],
+    "productivity": ["schedule", "reminder", "calendar", "email", "document"],
+    "information": ["weather", "news", "time", "date", "stock", "price"],
+    "communication": ["call", "message", "email", "text", "contact"],
+    "file_management": ["file", "folder", "document", "save", "delete", "organize"],
+    "security": ["security", "lock", "encrypt", "backup", "scan"],
+    "emergency": ["help", "emergency", "urgent", "911", "police", "fire"]
+}
+
+INTEREST_KEYWORDS = {
+    "technology": ["tech", "computer", "programming", "software", "ai", "robot"],
+    "music": ["music", "song", "play", "artist", "album", "concert"],
+    "news": ["news", "headlines", "current", "events", "politics"],
+    "weather": ["weather", "temperature", "rain", "sunny", "forecast"],
+    "sports": ["sports", "game", "team", "player", "match", "score"],
+    "movies": ["movie", "film", "cinema", "actor", "director", "watch"],
+    "travel": ["travel", "trip", "vacation", "hotel", "flight", "destination"],
+    "food": ["food", "restaurant", "recipe", "cook", "eat", "meal"]
+}
+
+COMMAND_VERBS = ["open", "search", "play", "send", "create", "find", "show", "tell"]
+
+KeywordMatches = namedtuple("KeywordMatches", ["intents", "interests", "commands"])
+
+
+class KeywordMatcher:
+    """Compiles keyword tables into one word-level matching automaton.
+
+    Every keyword of every table (and its plural/verb inflections) is put
+    in a single lookup keyed by word, with multi-word keywords hanging off
+    their first word like a trie. An utterance is tokenized once and walked
+    left to right, so all tables are matched in one linear, word-bounded
+    pass; each hit maps back to the (table, label) pairs it belongs to.
+    """
+
+    WORD = re.compile(r'[a-z0-9]+')
+    SUFFIXES = ("s", "es", "ing", "ed")
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.label_order = {
+            table: {label: position for position, label in enumerate(labels)}
+            for table, labels in tables.items()
+        }
+        self.keyword_labels = {}
+        for table, labels in tables.items():
+            for label, keywords in labels.items():
+                for keyword in keywords:
+                    keyword = ' '.join(self.WORD.findall(keyword.lower()))
+                    self.keyword_labels.setdefault(keyword, []).append((table, label))
+
+        # Inflected form -> base word; exact keyword words always win
+        words = {word for keyword in self.keyword_labels for word in keyword.split()}
+        self.forms = {}
+        for word in words:
+            for suffix in self.SUFFIXES:
+                self.forms.setdefault(word + suffix, word)
+        self.forms.update({word: word for word in words})
+
+        # First word -> remaining words of multi-word keywords, longest first
+        self.phrases = {}
+        for keyword in self.keyword_labels:
+            first, *rest = keyword.split()
+            if rest:
+                self.phrases.setdefault(first, []).append(tuple(rest))
+        for rests in self.phrases.values():
+            rests.sort(key=len, reverse=True)
+
+    def match(self, text):
+        """Return {table: [labels]} in table order, plus matched keywords in text order"""
+        tokens = [self.forms.get(token, token) for token in self.WORD.findall(text.lower())]
+        found = {table: set() for table in self.tables}
+        keywords = []
+
+        position = 0
+        while position < len(tokens):
+            token = tokens[position]
+            keyword, width = None, 1
+            for rest in self.phrases.get(token, ()):
+                if tuple(tokens[position + 1:position + 1 + len(rest)]) == rest:
+                    keyword, width = ' '.join((token,) + rest), 1 + len(rest)
+                    break
+            if keyword is None and token in self.keyword_labels:
+                keyword = token
+
+            if keyword is not None:
+                keywords.append(keyword)
+                for table, label in self.keyword_labels[keyword]:
+                    found[table].add(label)
+            position += width
+
+        labels = {
+            table: sorted(hits, key=self.label_order[table].__getitem__)
+            for table, hits in found.items()
+        }
+        return labels, keywords
+
+
+DEFAULT_MATCHER = KeywordMatcher({
+    "intents": INTENT_KEYWORDS,
+    "interests": INTEREST_KEYWORDS,
+    "commands": {verb: [verb] for verb in COMMAND_VERBS}
+})
+
+
+def match_keywords(text):
+    """Intents, interests and command verbs of an utterance in one pass.
+
+    Results are cached on the lowercased text, so the brain's intent
+    analysis and the learning system's preference update share a single
+    scan of the same utterance.
+    """
+    return _match_lowered(text.lower())
+
+
+@lru_cache(maxsize=256)
+def _match_lowered(text):
+    labels, keywords = DEFAULT_MATCHER.match(text)
+    commands = tuple(keyword for keyword in keywords if keyword in COMMAND_VERBS)
+    return KeywordMatches(tuple(labels["intents"]), tuple(labels["interests"]), commands)
+
+
+def normalize_utterance(text):
+    """Lowercase words only, so punctuation and spacing variants compare equal"""
+    return ' '.join(KeywordMatcher.WORD.findall(text.lower()))
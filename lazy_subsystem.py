@@ -0,0 +1,68 @@
+"""
+JARVIS Lazy Subsystems
+Subsystems built on first use, with optional background warm-up
+"""
+
+import threading
+import time
+
+from metrics import SUBSYSTEM_LOAD_SECONDS
+
+
+class lazy_subsystem:
+    """Decorator turning a builder method into an attribute built on first use.
+
+    The builder runs once per instance, under a per-instance lock, so the
+    main loop and a warm-up thread asking at the same time do not build
+    twice. The result is stored in the instance ``__dict__``, which takes
+    precedence over this (non-data) descriptor: later accesses are plain
+    attribute lookups. Build times are kept in ``subsystem_load_times``.
+    """
+
+    def __init__(self, build):
+        self.build = build
+        self.name = build.__name__
+        self.__doc__ = build.__doc__
+        self.lock = threading.Lock()
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        with self.lock:
+            lock = instance.__dict__.setdefault(f"_{self.name}_lock", threading.Lock())
+        with lock:
+            if self.name not in instance.__dict__:
+                start = time.perf_counter()
+                value = self.build(instance)
+                instance.__dict__[self.name] = value
+                load_times(instance)[self.name] = time.perf_counter() - start
+                SUBSYSTEM_LOAD_SECONDS.set(load_times(instance)[self.name], subsystem=self.name)
+        return instance.__dict__[self.name]
+
+
+def load_times(instance):
+    """Seconds each subsystem of instance took to build, in build order"""
+    return instance.__dict__.setdefault("subsystem_load_times", {})
+
+
+def is_loaded(instance, name):
+    return name in instance.__dict__
+
+
+def warm_up(instance, names, on_done=None):
+    """Build the named subsystems on a daemon thread; returns the thread"""
+    def run():
+        for name in names:
+            try:
+                getattr(instance, name)
+            except Exception as e:
+                print(f"Warm-up error ({name}): {e}")
+        if on_done:
+            on_done()
+
+    thread = threading.Thread(target=run, name="jarvis-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,121 @@
+"""
+JARVIS Learning Aggregates
+Running counters behind insights and improvement suggestions
+"""
+
+import math
+from collections import Counter
+from datetime import datetime
+
+
+class LearningAggregates:
+    """Aggregates maintained on the write path of LearningSystem.
+
+    Each recorded interaction updates per-hour and per-day counters,
+    success/failure totals, a command frequency table and an exponentially
+    decayed success rate (so recent behaviour outweighs old history). Reads
+    are O(1) and the whole state round-trips through the JSON snapshot.
+    """
+
+    def __init__(self, decay_hours=168.0):
+        self.decay_hours = decay_hours
+        self.hour_counts = [0] * 24
+        self.day_counts = [0] * 7
+        self.successes = 0
+        self.failures = 0
+        self.command_counts = Counter()
+        self.decayed_successes = 0.0
+        self.decayed_total = 0.0
+        self.last_timestamp = None
+
+    @property
+    def total(self):
+        return self.successes + self.failures
+
+    def record(self, interaction, commands=()):
+        """Fold one interaction into the aggregates"""
+        self.hour_counts[interaction["hour"]] += 1
+        self.day_counts[interaction["day_of_week"]] += 1
+        if interaction["success"]:
+            self.successes += 1
+        else:
+            self.failures += 1
+        self.command_counts.update(commands)
+
+        self._decay_to(datetime.fromisoformat(interaction["timestamp"]))
+        self.decayed_successes += 1.0 if interaction["success"] else 0.0
+        self.decayed_total += 1.0
+
+    def record_summary(self, summary):
+        """Fold a daily roll-up record (see learning_retention) into the aggregates"""
+        for hour, count in summary["hour_counts"].items():
+            self.hour_counts[int(hour)] += count
+        self.day_counts[summary["day_of_week"]] += summary["interactions"]
+        self.successes += summary["successes"]
+        self.failures += summary["interactions"] - summary["successes"]
+        self.command_counts.update(summary["commands"])
+
+        # Treat the whole day as happening at noon for the decayed rate
+        self._decay_to(datetime.fromisoformat(summary["date"]).replace(hour=12))
+        self.decayed_successes += summary["successes"]
+        self.decayed_total += summary["interactions"]
+
+    def _decay_to(self, timestamp):
+        """Exponential decay by elapsed wall-clock time since the last update"""
+        if self.last_timestamp is not None:
+            elapsed_hours = max((timestamp - self.last_timestamp).total_seconds() / 3600, 0)
+            factor = math.exp(-elapsed_hours / self.decay_hours)
+            self.decayed_successes *= factor
+            self.decayed_total *= factor
+        if self.last_timestamp is None or timestamp > self.last_timestamp:
+            self.last_timestamp = timestamp
+
+    def most_active_hour(self):
+        return max(range(24), key=lambda hour: self.hour_counts[hour]) if self.total else None
+
+    def most_active_day(self):
+        return max(range(7), key=lambda day: self.day_counts[day]) if self.total else None
+
+    def success_rate(self):
+        return self.successes / self.total if self.total else None
+
+    def recent_success_rate(self):
+        return self.decayed_successes / self.decayed_total if self.decayed_total else None
+
+    def top_commands(self, limit=5):
+        return [command for command, _ in self.command_counts.most_common(limit)]
+
+    def is_active_hour(self, hour):
+        return self.hour_counts[hour] > 0
+
+    def active_hours(self, min_share=0.05):
+        """Hours holding at least min_share of all interactions"""
+        return [hour for hour in range(24)
+                if self.hour_counts[hour] and self.hour_counts[hour] >= min_share * self.total]
+
+    def to_dict(self):
+        return {
+            "decay_hours": self.decay_hours,
+            "hour_counts": self.hour_counts,
+            "day_counts": self.day_counts,
+            "successes": self.successes,
+            "failures": self.failures,
+            "command_counts": dict(self.command_counts),
+            "decayed_successes": self.decayed_successes,
+            "decayed_total": self.decayed_total,
+            "last_timestamp": self.last_timestamp.isoformat() if self.last_timestamp else None
+        }
+
+    @classmethod
+    def from_dict(cls, data, decay_hours=None):
+        aggregates = cls(decay_hours if decay_hours is not None else data.get("decay_hours", 168.0))
+        aggregates.hour_counts = list(data["hour_counts"])
+        aggregates.day_counts = list(data["day_counts"])
+        aggregates.successes = data["successes"]
+        aggregates.failures = data["failures"]
+        aggregates.command_counts = Counter(data["command_counts"])
+        aggregates.decayed_successes = data["decayed_successes"]
+        aggregates.decayed_total = data["decayed_total"]
+        if data.get("last_timestamp"):
+            aggregates.last_timestamp = datetime.fromisoformat(data["last_timestamp"])
+        return aggregates
@@ -0,0 +1,86 @@
+"""
+JARVIS Learning Retention
+Roll-up of old and duplicate interactions into daily summaries
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+
+from keyword_matcher import normalize_utterance
+
+
+class RetentionPolicy:
+    """Decides which raw interactions to keep and summarizes the rest.
+
+    Interactions older than ``raw_days`` (counted from midnight) are folded
+    into one summary record per day, holding interaction/success counts,
+    an hour histogram and per-command counts. With ``dedupe`` enabled, a
+    retained interaction whose normalized utterance and outcome repeat a
+    newer one is folded too, so the raw history keeps one example of each
+    phrasing. Summaries are additive: several records for the same date
+    simply add up.
+    """
+
+    def __init__(self, raw_days=90, dedupe=True):
+        self.raw_days = raw_days
+        self.dedupe = dedupe
+
+    def cutoff(self, now=None):
+        """Start of the oldest day whose raw interactions are kept"""
+        now = now or datetime.now()
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        return midnight - timedelta(days=self.raw_days)
+
+    def plan(self, rows, now=None):
+        """Split (row_id, interaction) pairs; returns (fold_row_ids, folded_interactions)"""
+        cutoff = self.cutoff(now).isoformat() if self.raw_days > 0 else None
+        seen = set()
+        fold_ids, folded = [], []
+
+        # Walk newest first so the most recent copy of a duplicate survives
+        for row_id, interaction in reversed(list(rows)):
+            if cutoff is not None and interaction["timestamp"] < cutoff:
+                fold_ids.append(row_id)
+                folded.append(interaction)
+                continue
+            if self.dedupe:
+                key = (normalize_utterance(interaction["user_input"]), bool(interaction["success"]))
+                if key in seen:
+                    fold_ids.append(row_id)
+                    folded.append(interaction)
+                    continue
+                seen.add(key)
+
+        fold_ids.reverse()
+        folded.reverse()
+        return fold_ids, folded
+
+    @staticmethod
+    def summarize(interactions, find_commands):
+        """One summary record per day for the given interactions"""
+        days = {}
+        for interaction in interactions:
+            date = interaction["timestamp"][:10]
+            summary = days.get(date)
+            if summary is None:
+                summary = days[date] = {
+                    "date": date,
+                    "day_of_week": interaction["day_of_week"],
+                    "interactions": 0,
+                    "successes": 0,
+                    "hour_counts": Counter(),
+                    "commands": Counter()
+                }
+            summary["interactions"] += 1
+            summary["hour_counts"][str(interaction["hour"])] += 1
+            if interaction["success"]:
+                summary["successes"] += 1
+                summary["commands"].update(find_commands(interaction["user_input"].lower()))
+
+        summaries = []
+        for date in sorted(days):
+            summary = days[date]
+            summary["hour_counts"] = dict(summary["hour_counts"])
+            summary["commands"] = dict(summary["commands"])
+            summaries.append(summary)
+        return summaries
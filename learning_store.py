@@ -0,0 +1,564 @@
+"""
+JARVIS Learning Store
+Journal and SQLite persistence backends for the learning system
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+
+from metrics import FLUSH_SECONDS
+
+
+def atomic_write_json(path, data, indent=None, fsync=True):
+    """Write JSON to a temp file, fsync it (unless fsync is False) and rename it over the target"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=indent, separators=None if indent else (',', ':'))
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class JournalStore:
+    """Append-only interaction journal plus a small JSON snapshot.
+
+    Interactions are appended as one compact JSON line each to numbered
+    segment files (``interactions-000001.jsonl``). Everything else in the
+    user data (preferences, learning stats) lives in ``snapshot.json``, which
+    is rewritten atomically and stays small no matter how long the history
+    gets. Closed segments are merged (by ``compact``, which callers run off
+    the append path once ``needs_compaction``) into a single
+    ``compacted-<n>.jsonl`` file that replaces every segment up to ``n``.
+    Daily summaries of rolled-up interactions go to ``rollups.jsonl``.
+
+    The retained history is kept in memory; row ids are list positions, so
+    they are renumbered when interactions are folded away.
+    """
+
+    SEGMENT_PATTERN = re.compile(r'^interactions-(\d+)\.jsonl$')
+    COMPACTED_PATTERN = re.compile(r'^compacted-(\d+)\.jsonl$')
+
+    def __init__(self, data_dir, legacy_file=None, segment_max_bytes=4 * 1024 * 1024,
+                 compact_segments=8, fsync=False):
+        self.data_dir = data_dir
+        self.legacy_file = legacy_file
+        self.snapshot_file = os.path.join(data_dir, 'snapshot.json')
+        self.rollups_file = os.path.join(data_dir, 'rollups.jsonl')
+        self.segment_max_bytes = segment_max_bytes
+        self.compact_segments = compact_segments
+        self.fsync = fsync
+
+        self._lock = threading.RLock()
+        self.interactions = []
+        self._segment = None
+        self._segment_number = 0
+        self._compacted_number = 0
+        self._closed_segments = 0
+
+    # Paths
+
+    def segment_path(self, number):
+        return os.path.join(self.data_dir, f"interactions-{number:06d}.jsonl")
+
+    def compacted_path(self, number):
+        return os.path.join(self.data_dir, f"compacted-{number:06d}.jsonl")
+
+    def _scan(self):
+        """Return (compacted numbers, segment numbers) found on disk"""
+        compacted, segments = [], []
+        for name in os.listdir(self.data_dir):
+            match = self.COMPACTED_PATTERN.match(name)
+            if match:
+                compacted.append(int(match.group(1)))
+                continue
+            match = self.SEGMENT_PATTERN.match(name)
+            if match:
+                segments.append(int(match.group(1)))
+        return sorted(compacted), sorted(segments)
+
+    # Loading and recovery
+
+    def load(self, default_data):
+        """Load user data, recovering from interrupted writes"""
+        with self._lock:
+            os.makedirs(self.data_dir, exist_ok=True)
+            self._remove_temp_files()
+
+            snapshot = self._read_snapshot()
+            if snapshot is None and self.legacy_file and os.path.exists(self.legacy_file):
+                snapshot = self._migrate_legacy_file()
+
+            interactions = self._recover_interactions()
+            self.interactions = interactions
+
+            data = snapshot if snapshot is not None else default_data
+            data.pop("interactions", None)
+
+            # The snapshot may lag the journal by the last write before a crash
+            stats = data.setdefault("learning_stats", {})
+            if stats.get("total_interactions", 0) < len(interactions):
+                stats["total_interactions"] = len(interactions)
+
+            return data
+
+    def _remove_temp_files(self):
+        for name in os.listdir(self.data_dir):
+            if name.endswith('.tmp'):
+                os.remove(os.path.join(self.data_dir, name))
+
+    def _read_snapshot(self):
+        try:
+            with open(self.snapshot_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError as e:
+            print(f"Learning snapshot corrupted, starting from defaults: {e}")
+            return None
+
+    def _migrate_legacy_file(self):
+        """Import a pre-journal user_learning_data.json file"""
+        with open(self.legacy_file, 'r') as f:
+            legacy = json.load(f)
+
+        interactions = legacy.pop("interactions", [])
+        _, segments = self._scan()
+        number = (segments[-1] if segments else 0) + 1
+        self._write_records(self.segment_path(number), interactions)
+        atomic_write_json(self.snapshot_file, legacy)
+        os.replace(self.legacy_file, f"{self.legacy_file}.migrated")
+
+        print(f"Migrated {len(interactions)} interactions to the learning journal")
+        return legacy
+
+    def _recover_interactions(self):
+        """Read the newest compacted file and every live segment after it"""
+        compacted, segments = self._scan()
+
+        base = compacted[-1] if compacted else 0
+        for number in compacted[:-1]:
+            os.remove(self.compacted_path(number))
+        for number in segments:
+            if number <= base:
+                os.remove(self.segment_path(number))
+        live = [number for number in segments if number > base]
+
+        interactions = []
+        if base:
+            interactions.extend(self._read_records(self.compacted_path(base)))
+        for number in live:
+            interactions.extend(self._read_records(self.segment_path(number), repair=True))
+
+        self._compacted_number = base
+        self._segment_number = live[-1] if live else base + 1
+        self._closed_segments = max(len(live) - 1, 0)
+        return interactions
+
+    def _read_records(self, path, repair=False):
+        """Read JSON lines, truncating a torn tail left by a crash"""
+        with open(path, 'rb') as f:
+            lines = f.readlines()
+
+        records = []
+        good_offset = 0
+        for position, line in enumerate(lines):
+            is_last = position == len(lines) - 1
+            try:
+                if not line.endswith(b'\n'):
+                    raise ValueError("unterminated record")
+                records.append(json.loads(line))
+            except ValueError:
+                if is_last:
+                    if repair:
+                        print(f"Repairing torn journal segment: {path}")
+                        with open(path, 'r+b') as f:
+                            f.truncate(good_offset)
+                    break
+                print(f"Skipping corrupted journal record in {path}")
+            good_offset += len(line)
+        return records
+
+    def _write_records(self, path, records):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            for record in records:
+                f.write(json.dumps(record, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    # Writing
+
+    def append_interaction(self, interaction):
+        """Append one interaction record and return its row id.
+
+        Cost is independent of history size.
+        """
+        line = json.dumps(interaction, separators=(',', ':')) + '\n'
+        with self._lock, FLUSH_SECONDS.time(store="interactions"):
+            segment = self._open_segment()
+            segment.write(line)
+            segment.flush()
+            if self.fsync:
+                os.fsync(segment.fileno())
+
+            if segment.tell() >= self.segment_max_bytes:
+                self._rotate()
+
+            self.interactions.append(interaction)
+            return len(self.interactions) - 1
+
+    def _open_segment(self):
+        if self._segment is None:
+            self._segment = open(self.segment_path(self._segment_number), 'a')
+        return self._segment
+
+    def _rotate(self):
+        self._segment.close()
+        self._segment = None
+        self._segment_number += 1
+        self._closed_segments += 1
+
+    def needs_compaction(self):
+        """True once enough closed segments have piled up to merge them"""
+        return self._closed_segments >= self.compact_segments
+
+    def save_snapshot(self, user_data):
+        """Persist everything except the interaction history (fsynced only if fsync is set)"""
+        snapshot = {key: value for key, value in user_data.items() if key != "interactions"}
+        with self._lock, FLUSH_SECONDS.time(store="learning_snapshot"):
+            atomic_write_json(self.snapshot_file, snapshot, fsync=self.fsync)
+
+    def compact(self):
+        """Merge the compacted file and all closed segments into one file"""
+        with self._lock, FLUSH_SECONDS.time(store="compaction"):
+            last_closed = self._segment_number - 1
+            if last_closed <= self._compacted_number:
+                return
+
+            records = []
+            if self._compacted_number:
+                records.extend(self._read_records(self.compacted_path(self._compacted_number)))
+            _, segments = self._scan()
+            closed = [n for n in segments if self._compacted_number < n <= last_closed]
+            for number in closed:
+                records.extend(self._read_records(self.segment_path(number)))
+
+            # The new compacted file supersedes everything up to last_closed,
+            # so a crash after this rename is resolved the same way on load
+            self._write_records(self.compacted_path(last_closed), records)
+
+            if self._compacted_number:
+                os.remove(self.compacted_path(self._compacted_number))
+            for number in closed:
+                os.remove(self.segment_path(number))
+
+            self._compacted_number = last_closed
+            self._closed_segments = 0
+
+    def fold_interactions(self, row_ids, rollups):
+        """Replace the given rows by summary records, rewriting the journal.
+
+        The retained history is written as one compacted file, so the
+        removed rows are gone from disk as well; remaining rows are
+        renumbered.
+        """
+        with self._lock:
+            if rollups:
+                with open(self.rollups_file, 'a') as f:
+                    for rollup in rollups:
+                        f.write(json.dumps(rollup, separators=(',', ':')) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            drop = set(row_ids)
+            self.interactions = [
+                interaction for row_id, interaction in enumerate(self.interactions)
+                if row_id not in drop
+            ]
+
+            self.close()
+            compacted, segments = self._scan()
+            last = max(compacted + segments + [self._segment_number])
+            self._write_records(self.compacted_path(last), self.interactions)
+            for number in compacted:
+                if number != last:
+                    os.remove(self.compacted_path(number))
+            for number in segments:
+                if number <= last:
+                    os.remove(self.segment_path(number))
+
+            self._compacted_number = last
+            self._segment_number = last + 1
+            self._closed_segments = 0
+
+    def iter_rollups(self):
+        """Yield the daily summary records of folded interactions"""
+        with self._lock:
+            if not os.path.exists(self.rollups_file):
+                return
+            records = self._read_records(self.rollups_file, repair=True)
+        yield from records
+
+    def reset(self, user_data):
+        """Drop the whole journal and write a fresh snapshot"""
+        with self._lock:
+            self.close()
+            compacted, segments = self._scan()
+            for number in compacted:
+                os.remove(self.compacted_path(number))
+            for number in segments:
+                os.remove(self.segment_path(number))
+            if os.path.exists(self.rollups_file):
+                os.remove(self.rollups_file)
+
+            self._compacted_number = 0
+            self._segment_number = 1
+            self._closed_segments = 0
+            self.interactions = []
+            self.save_snapshot(user_data)
+
+    # Reading
+
+    def interaction_count(self):
+        return len(self.interactions)
+
+    def get_interaction(self, row_id):
+        return self.interactions[row_id]
+
+    def iter_interactions(self, after=-1):
+        """Yield (row_id, interaction) for rows after the given id"""
+        start = after + 1
+        for offset, interaction in enumerate(self.interactions[start:]):
+            yield start + offset, interaction
+
+    def recent_interactions(self, limit):
+        return self.interactions[-limit:] if limit > 0 else []
+
+    def close(self):
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+
+
+class SQLiteStore:
+    """SQLite (WAL mode) interaction store with indexed analytics.
+
+    Interactions are rows in an indexed table, so insights become aggregate
+    queries and the history does not have to be resident in memory. The
+    preferences/stats snapshot is a single JSON row. On first use, data from
+    the JSON journal (or a legacy user_learning_data.json) is imported.
+    """
+
+    COLUMNS = ("timestamp", "user_input", "jarvis_response", "user_feedback",
+               "execution_time", "hour", "day_of_week", "success")
+
+    def __init__(self, db_file, journal_dir=None, legacy_file=None):
+        self.db_file = db_file
+        self.journal_dir = journal_dir
+        self.legacy_file = legacy_file
+        self._lock = threading.RLock()
+        self.connection = None
+
+    def _connect(self):
+        directory = os.path.dirname(self.db_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(self.db_file, check_same_thread=False)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript("""
+            CREATE TABLE IF NOT EXISTS interactions (
+                id INTEGER PRIMARY KEY,
+                timestamp TEXT NOT NULL,
+                user_input TEXT NOT NULL,
+                jarvis_response TEXT,
+                user_feedback TEXT,
+                execution_time REAL,
+                hour INTEGER NOT NULL,
+                day_of_week INTEGER NOT NULL,
+                success INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_interactions_timestamp ON interactions(timestamp);
+            -- Served the histogram queries the running aggregates replaced; only slowed inserts
+            DROP INDEX IF EXISTS idx_interactions_hour;
+            DROP INDEX IF EXISTS idx_interactions_day;
+            DROP INDEX IF EXISTS idx_interactions_success;
+            CREATE TABLE IF NOT EXISTS rollups (
+                id INTEGER PRIMARY KEY,
+                date TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_rollups_date ON rollups(date);
+            CREATE TABLE IF NOT EXISTS snapshot (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                data TEXT NOT NULL
+            );
+        """)
+        return connection
+
+    def _row_values(self, interaction):
+        values = [interaction.get(column) for column in self.COLUMNS]
+        values[-1] = int(bool(values[-1]))
+        return values
+
+    @staticmethod
+    def _row_to_interaction(row):
+        interaction = {key: row[key] for key in row.keys() if key != "id"}
+        interaction["success"] = bool(interaction["success"])
+        return interaction
+
+    # Loading and migration
+
+    def load(self, default_data):
+        """Load the preferences/stats snapshot, migrating older stores once"""
+        with self._lock:
+            if self.connection is None:
+                self.connection = self._connect()
+
+            row = self.connection.execute("SELECT data FROM snapshot WHERE id = 1").fetchone()
+            if row is not None:
+                data = json.loads(row["data"])
+            else:
+                data = self._migrate(default_data)
+
+            stats = data.setdefault("learning_stats", {})
+            count = self.interaction_count()
+            if stats.get("total_interactions", 0) < count:
+                stats["total_interactions"] = count
+            return data
+
+    def _migrate(self, default_data):
+        """Import the JSON journal (which itself imports the legacy file)"""
+        has_journal = self.journal_dir and os.path.exists(os.path.join(self.journal_dir, 'snapshot.json'))
+        has_legacy = self.legacy_file and os.path.exists(self.legacy_file)
+        if not (has_journal or has_legacy):
+            self.save_snapshot(default_data)
+            return default_data
+
+        journal = JournalStore(self.journal_dir, legacy_file=self.legacy_file)
+        data = journal.load(default_data)
+        journal.close()
+
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        with self.connection:
+            self.connection.executemany(
+                f"INSERT INTO interactions ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+                (self._row_values(interaction) for interaction in journal.interactions)
+            )
+            self.connection.executemany(
+                "INSERT INTO rollups (date, data) VALUES (?, ?)",
+                ((rollup["date"], json.dumps(rollup, separators=(',', ':')))
+                 for rollup in journal.iter_rollups())
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO snapshot (id, data) VALUES (1, ?)",
+                (json.dumps(data, separators=(',', ':')),)
+            )
+
+        print(f"Migrated {len(journal.interactions)} interactions to SQLite")
+        return data
+
+    # Writing
+
+    def append_interaction(self, interaction):
+        """Insert one interaction and return its row id"""
+        placeholders = ", ".join("?" for _ in self.COLUMNS)
+        with self._lock, self.connection, FLUSH_SECONDS.time(store="interactions"):
+            cursor = self.connection.execute(
+                f"INSERT INTO interactions ({', '.join(self.COLUMNS)}) VALUES ({placeholders})",
+                self._row_values(interaction)
+            )
+            return cursor.lastrowid
+
+    def save_snapshot(self, user_data):
+        snapshot = {key: value for key, value in user_data.items() if key != "interactions"}
+        with self._lock, self.connection, FLUSH_SECONDS.time(store="learning_snapshot"):
+            self.connection.execute(
+                "INSERT OR REPLACE INTO snapshot (id, data) VALUES (1, ?)",
+                (json.dumps(snapshot, separators=(',', ':')),)
+            )
+
+    def fold_interactions(self, row_ids, rollups):
+        """Delete the given rows and store their summaries in one transaction"""
+        with self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO rollups (date, data) VALUES (?, ?)",
+                ((rollup["date"], json.dumps(rollup, separators=(',', ':'))) for rollup in rollups)
+            )
+            self.connection.executemany(
+                "DELETE FROM interactions WHERE id = ?", ((row_id,) for row_id in row_ids)
+            )
+
+    def iter_rollups(self):
+        """Yield the daily summary records of folded interactions"""
+        with self._lock:
+            rows = self.connection.execute("SELECT data FROM rollups ORDER BY date, id").fetchall()
+        for row in rows:
+            yield json.loads(row["data"])
+
+    def needs_compaction(self):
+        """SQLite checkpoints its WAL automatically; compact() only truncates it"""
+        return False
+
+    def compact(self):
+        """Checkpoint the WAL back into the main database file"""
+        with self._lock, FLUSH_SECONDS.time(store="compaction"):
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def reset(self, user_data):
+        with self._lock:
+            with self.connection:
+                self.connection.execute("DELETE FROM interactions")
+                self.connection.execute("DELETE FROM rollups")
+            self.save_snapshot(user_data)
+
+    # Reading
+
+    def interaction_count(self):
+        with self._lock:
+            return self.connection.execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
+
+    def get_interaction(self, row_id):
+        with self._lock:
+            row = self.connection.execute(
+                "SELECT * FROM interactions WHERE id = ?", (row_id,)
+            ).fetchone()
+        return self._row_to_interaction(row) if row is not None else None
+
+    def iter_interactions(self, after=-1, batch_size=1000):
+        """Yield (row_id, interaction) in id order, streaming in batches"""
+        last_id = after
+        while True:
+            with self._lock:
+                rows = self.connection.execute(
+                    "SELECT * FROM interactions WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield row["id"], self._row_to_interaction(row)
+            last_id = rows[-1]["id"]
+
+    def recent_interactions(self, limit):
+        if limit <= 0:
+            return []
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT * FROM interactions ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self._row_to_interaction(row) for row in reversed(rows)]
+
+    def close(self):
+        with self._lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
@@ -7,63 +7,250 @@ import json
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import KMeans
-from sklearn.metrics.pairwise import cosine_similarity
-from datetime import datetime, timedelta
+from datetime import datetime
 import pickle
 import os
-from collections import defaultdict, Counter
-import re
+import heapq
+import threading
+from config import Config
+from learning_store import JournalStore, SQLiteStore
+from interaction_index import InteractionIndex
+from model_trainer import BackgroundTrainer
+from online_learning import OnlineIntentModel
+from ann_index import LSHInteractionIndex
+from learning_aggregates import LearningAggregates
+from learning_retention import RetentionPolicy
+from keyword_matcher import match_keywords
+from model_artifact import (ModelArtifact, ModelArtifactError, restore_kmeans,
+                            restore_vectorizer, vectorizer_arrays)
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 
 class LearningSystem:
     def __init__(self):
+        self.config = Config()
         self.user_data_file = 'user_learning_data.json'
-        self.model_file = 'jarvis_model.pkl'
+        self.model_dir = 'jarvis_model'
+        self.legacy_model_file = 'jarvis_model.pkl'
+        self.online_model_file = 'jarvis_online_model.pkl'
+        self.online_mode = self.config.LEARNING_MODEL_MODE == 'online'
+        self.store = self.new_store()
         self.user_data = self.load_user_data()
-        self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+        self.aggregates = self.load_aggregates()
+        self.vectorizer = self.new_vectorizer()
         self.preference_model = None
+        self.online_model = None
+        self.interaction_index = self.new_interaction_index()
+        self.model_lock = threading.RLock()
+        self.history_version = 0
         self.load_model()
+        self.trainer = BackgroundTrainer(
+            self.build_model,
+            self.swap_model,
+            debounce_seconds=self.config.TRAINING_DEBOUNCE_SECONDS
+        )
+        self.retention = RetentionPolicy(
+            raw_days=self.config.RETENTION_RAW_DAYS,
+            dedupe=self.config.RETENTION_DEDUPE
+        )
+        self.retention_date = None
+        self.maintenance_worker = BackgroundTrainer(
+            self.run_maintenance,
+            lambda result: None,
+            debounce_seconds=self.config.TRAINING_DEBOUNCE_SECONDS,
+            name="jarvis-maintenance"
+        )
+        if not self.online_mode and not self.is_vectorizer_fitted() and self.store.interaction_count() >= 5:
+            # No model artifact yet (e.g. only a legacy pickle without its vectorizer)
+            self.trainer.request()
         
+    def new_store(self):
+        """Create the configured interaction store (journal or SQLite)"""
+        if self.config.LEARNING_STORE_BACKEND == 'sqlite':
+            return SQLiteStore(
+                os.path.join(self.config.LEARNING_DATA_DIR, 'learning.db'),
+                journal_dir=self.config.LEARNING_DATA_DIR,
+                legacy_file=self.user_data_file
+            )
+        return JournalStore(
+            self.config.LEARNING_DATA_DIR,
+            legacy_file=self.user_data_file,
+            segment_max_bytes=self.config.JOURNAL_SEGMENT_MAX_BYTES,
+            compact_segments=self.config.JOURNAL_COMPACT_SEGMENTS,
+            fsync=self.config.JOURNAL_FSYNC
+        )
+    
+    def default_user_data(self):
+        """Fresh preferences and stats (interactions live in the store)"""
+        return {
+            "preferences": {
+                "voice_speed": 200,
+                "voice_volume": 0.8,
+                "preferred_voice": "male",
+                "common_commands": [],
+                "time_patterns": {},
+                "interests": [],
+                "dislikes": []
+            },
+            "learning_stats": {
+                "total_interactions": 0,
+                "accuracy_score": 0.0,
+                "last_updated": None
+            }
+        }
+    
     def load_user_data(self):
-        """Load user interaction data"""
+        """Load preferences and stats from the interaction store"""
         try:
-            with open(self.user_data_file, 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {
-                "interactions": [],
-                "preferences": {
-                    "voice_speed": 200,
-                    "voice_volume": 0.8,
-                    "preferred_voice": "male",
-                    "common_commands": [],
-                    "time_patterns": {},
-                    "interests": [],
-                    "dislikes": []
-                },
-                "learning_stats": {
-                    "total_interactions": 0,
-                    "accuracy_score": 0.0,
-                    "last_updated": None
-                }
-            }
+            return self.store.load(self.default_user_data())
+        except Exception as e:
+            print(f"Learning data load error: {e}")
+            return self.default_user_data()
     
     def save_user_data(self):
-        """Save user data to file"""
-        with open(self.user_data_file, 'w') as f:
-            json.dump(self.user_data, f, indent=2)
+        """Save preferences, stats and aggregates snapshot (interactions are journaled)"""
+        self.user_data["aggregates"] = self.aggregates.to_dict()
+        self.store.save_snapshot(self.user_data)
+    
+    def load_aggregates(self):
+        """Restore running aggregates from the snapshot, rebuilding them once if missing"""
+        saved = self.user_data.get("aggregates")
+        if saved:
+            return LearningAggregates.from_dict(saved, self.config.AGGREGATE_DECAY_HOURS)
+        
+        # Replay daily roll-ups (dated at noon) and raw rows in time order
+        aggregates = LearningAggregates(self.config.AGGREGATE_DECAY_HOURS)
+        rollups = sorted(self.store.iter_rollups(), key=lambda rollup: rollup["date"])
+        interactions = (interaction for _, interaction in self.store.iter_interactions())
+        records = heapq.merge(
+            rollups, interactions,
+            key=lambda record: record.get("timestamp") or f"{record['date']}T12:00:00"
+        )
+        for record in records:
+            if "timestamp" not in record:
+                aggregates.record_summary(record)
+                continue
+            commands = self.find_commands(record["user_input"].lower()) if record["success"] else []
+            aggregates.record(record, commands)
+        return aggregates
     
     def load_model(self):
         """Load trained model"""
+        if self.online_mode:
+            self.load_online_model()
+            self.interaction_index.load()
+            if self.interaction_index.n_features != self.vectorizer.n_features:
+                # Index was built by another vectorizer; re-index with hashed features
+                self.interaction_index.clear(self.vectorizer.n_features)
+        else:
+            self.load_model_artifact()
+        
+        if self.is_vectorizer_fitted():
+            self.interaction_index.add_interactions(
+                self.vectorizer,
+                self.store.iter_interactions(after=self.interaction_index.last_row_id)
+            )
+    
+    def load_model_artifact(self):
+        """Restore vectorizer, clusters and index from the memory-mapped model artifact"""
         try:
-            with open(self.model_file, 'rb') as f:
-                self.preference_model = pickle.load(f)
-        except FileNotFoundError:
-            self.preference_model = None
+            artifact = ModelArtifact.open(self.model_dir, verify=self.config.MODEL_VERIFY_CHECKSUMS)
+            if artifact is None:
+                return False
+            
+            vectorizer = restore_vectorizer(self.new_vectorizer(), artifact)
+            index = self.new_interaction_index()
+            index.from_arrays(artifact, prefix='index_')
+            model = None
+            if "cluster_centers" in artifact:
+                model = restore_kmeans(KMeans(n_clusters=2, random_state=42), artifact["cluster_centers"])
+        except (ModelArtifactError, OSError, ValueError, KeyError) as e:
+            print(f"Model load error: {e}")
+            return False
+        
+        self.vectorizer = vectorizer
+        self.interaction_index = index
+        self.preference_model = model
+        return True
     
     def save_model(self):
-        """Save trained model"""
-        with open(self.model_file, 'wb') as f:
-            pickle.dump(self.preference_model, f)
+        """Save vectorizer vocabulary/IDF, cluster centers and index as one artifact"""
+        with self.model_lock:
+            if not self.is_vectorizer_fitted():
+                return
+            index = self.interaction_index
+            saved_rows = len(index)
+            arrays = vectorizer_arrays(self.vectorizer)
+            arrays.update(index.to_arrays(prefix='index_'))
+            if self.preference_model is not None:
+                arrays["cluster_centers"] = self.preference_model.cluster_centers_
+            metadata = {
+                "index_n_features": index.n_features,
+                "accuracy": self.user_data["learning_stats"]["accuracy_score"]
+            }
+        
+        # The arrays are views of rows that are never rewritten, so this can run unlocked
+        ModelArtifact.save(self.model_dir, arrays, metadata)
+        index.saved_rows = saved_rows
+        if os.path.exists(self.legacy_model_file):
+            os.remove(self.legacy_model_file)
+    
+    def new_vectorizer(self):
+        """Create an unfitted TF-IDF vectorizer"""
+        return TfidfVectorizer(max_features=1000, stop_words='english')
+    
+    def new_interaction_index(self):
+        """Create the configured similarity index (exact or LSH)"""
+        if self.config.LEARNING_INDEX_BACKEND == 'lsh':
+            return LSHInteractionIndex(
+                n_tables=self.config.LSH_TABLES,
+                n_bits=self.config.LSH_BITS,
+                multi_probe=self.config.LSH_MULTI_PROBE
+            )
+        return InteractionIndex()
+    
+    def new_online_model(self):
+        """Create an empty online learning model"""
+        return OnlineIntentModel(
+            n_features=self.config.ONLINE_HASH_FEATURES,
+            batch_size=self.config.ONLINE_BATCH_SIZE
+        )
+    
+    def load_online_model(self):
+        """Load the online model; its hashing vectorizer never needs refitting"""
+        try:
+            with open(self.online_model_file, 'rb') as f:
+                self.online_model = pickle.load(f)
+        except FileNotFoundError:
+            self.online_model = self.new_online_model()
+        
+        # Replay interactions journaled after the model was last saved
+        missing = self.user_data["learning_stats"]["total_interactions"] - self.online_model.vectorizer.n_docs
+        if 0 < missing <= self.store.interaction_count():
+            for interaction in self.store.recent_interactions(missing):
+                self.online_model.partial_fit(interaction["user_input"], int(interaction["success"]))
+        
+        self.vectorizer = self.online_model.vectorizer
+        self.preference_model = self.online_model
+    
+    def save_online_model(self):
+        """Save the online model, and the index once it has doubled in size"""
+        with self.model_lock:
+            with open(self.online_model_file, 'wb') as f:
+                pickle.dump(self.online_model, f)
+            if len(self.interaction_index) >= 2 * self.interaction_index.saved_rows:
+                self.interaction_index.save()
+    
+    def fitted_vectorizer(self):
+        """The live vectorizer, or None until it has been fitted"""
+        with self.model_lock:
+            return self.vectorizer if self.is_vectorizer_fitted() else None
+    
+    def is_vectorizer_fitted(self):
+        """Check whether the TF-IDF vectorizer has a vocabulary"""
+        if self.online_mode:
+            return self.vectorizer.n_docs > 0
+        return hasattr(self.vectorizer, 'vocabulary_')
     
     def record_interaction(self, user_input, jarvis_response, user_feedback=None, execution_time=None):
         """Record user interaction for learning"""
@@ -78,35 +265,52 @@ class LearningSystem:
             "success": user_feedback is None or user_feedback.lower() in ['good', 'yes', 'correct', 'thanks']
         }
         
-        self.user_data["interactions"].append(interaction)
+        # Keep the similarity index current without refitting; the lock also
+        # keeps the new row id valid while retention renumbers rows
+        with self.model_lock:
+            row_id = self.store.append_interaction(interaction)
+            if self.online_mode:
+                self.online_model.partial_fit(user_input, int(interaction["success"]))
+                self.user_data["learning_stats"]["accuracy_score"] = self.online_model.accuracy
+            if interaction["success"] and self.is_vectorizer_fitted():
+                self.interaction_index.add(self.vectorizer, row_id, user_input)
+        
         self.user_data["learning_stats"]["total_interactions"] += 1
         self.user_data["learning_stats"]["last_updated"] = datetime.now().isoformat()
         
         # Update preferences based on interaction
         self.update_preferences(interaction)
         
-        # Save data
+        # Refresh the small preferences/stats snapshot
         self.save_user_data()
         
-        # Retrain model periodically
-        if len(self.user_data["interactions"]) % 10 == 0:
-            self.train_model()
+        # Online mode learns per interaction; batch mode retrains off the voice loop
+        if self.online_mode:
+            if self.user_data["learning_stats"]["total_interactions"] % self.config.ONLINE_SAVE_EVERY == 0:
+                self.save_online_model()
+        elif self.user_data["learning_stats"]["total_interactions"] % 10 == 0:
+            self.trainer.request()
+        
+        # Retention (once a day) and journal compaction run in the background
+        if self.retention_date != datetime.now().date() or self.store.needs_compaction():
+            self.maintenance_worker.request()
     
     def update_preferences(self, interaction):
         """Update user preferences based on interaction"""
         user_input = interaction["user_input"].lower()
         
         # Extract common commands
+        commands = []
         if interaction["success"]:
-            self.extract_common_commands(user_input)
+            commands = self.extract_common_commands(user_input)
         
-        # Update time patterns
-        hour = interaction["hour"]
-        day = interaction["day_of_week"]
+        # Update running aggregates used by insights and suggestions
+        self.aggregates.record(interaction, commands)
         
-        if hour not in self.user_data["preferences"]["time_patterns"]:
-            self.user_data["preferences"]["time_patterns"][hour] = 0
-        self.user_data["preferences"]["time_patterns"][hour] += 1
+        # Update time patterns (string keys, as they come back from JSON)
+        hour = str(interaction["hour"])
+        time_patterns = self.user_data["preferences"]["time_patterns"]
+        time_patterns[hour] = time_patterns.get(hour, 0) + 1
         
         # Extract interests
         self.extract_interests(user_input)
@@ -124,88 +328,153 @@ class LearningSystem:
             elif "quiet" in feedback or "quieter" in feedback:
                 self.user_data["preferences"]["voice_volume"] -= 0.1
     
+    def training_utterances(self, limit=2000):
+        """Distinct recent user utterances, newest first, for training other models"""
+        seen = set()
+        utterances = []
+        for interaction in reversed(self.store.recent_interactions(limit)):
+            text = interaction["user_input"]
+            if text.lower() not in seen:
+                seen.add(text.lower())
+                utterances.append(text)
+        return utterances
+    
+    def find_commands(self, user_input):
+        """Find command verbs in an utterance"""
+        return list(match_keywords(user_input).commands)
+    
     def extract_common_commands(self, user_input):
         """Extract common command patterns"""
         # Simple command extraction
-        commands = re.findall(r'\b(open|search|play|send|create|find|show|tell)\b', user_input)
+        commands = self.find_commands(user_input)
         
         for command in commands:
             if command not in self.user_data["preferences"]["common_commands"]:
                 self.user_data["preferences"]["common_commands"].append(command)
+        
+        return commands
     
     def extract_interests(self, user_input):
         """Extract user interests from interactions"""
-        interest_keywords = {
-            "technology": ["tech", "computer", "programming", "software", "ai", "robot"],
-            "music": ["music", "song", "play", "artist", "album", "concert"],
-            "news": ["news", "headlines", "current", "events", "politics"],
-            "weather": ["weather", "temperature", "rain", "sunny", "forecast"],
-            "sports": ["sports", "game", "team", "player", "match", "score"],
-            "movies": ["movie", "film", "cinema", "actor", "director", "watch"],
-            "travel": ["travel", "trip", "vacation", "hotel", "flight", "destination"],
-            "food": ["food", "restaurant", "recipe", "cook", "eat", "meal"]
-        }
+        # Keyword tables live in keyword_matcher.INTEREST_KEYWORDS
+        for category in match_keywords(user_input).interests:
+            if category not in self.user_data["preferences"]["interests"]:
+                self.user_data["preferences"]["interests"].append(category)
+    
+    def build_model(self):
+        """Fit a new vectorizer, index and model without touching the live ones"""
+        if self.online_mode:
+            return None  # The online model is updated per interaction
+        
+        history_version = self.history_version
+        rows = list(self.store.iter_interactions())
+        if len(rows) < 5:
+            return None  # Need more data
+        
+        # Prepare training data
+        texts = [interaction["user_input"] for _, interaction in rows]
+        labels = [1 if interaction["success"] else 0 for _, interaction in rows]
+        
+        # Vectorize texts
+        vectorizer = self.new_vectorizer()
+        X = vectorizer.fit_transform(texts)
+        
+        # Vocabulary changed, so the similarity index must be rebuilt
+        index = self.new_interaction_index()
+        index.rebuild(vectorizer, rows)
         
-        for category, keywords in interest_keywords.items():
-            if any(keyword in user_input for keyword in keywords):
-                if category not in self.user_data["preferences"]["interests"]:
-                    self.user_data["preferences"]["interests"].append(category)
+        trained = {"vectorizer": vectorizer, "index": index, "model": None, "accuracy": None,
+                   "history_version": history_version}
+        
+        # Train simple clustering model
+        if len(set(labels)) > 1:  # Need at least 2 different labels
+            model = KMeans(n_clusters=2, random_state=42)
+            model.fit(X)
+            
+            # Calculate accuracy
+            predictions = model.predict(X)
+            trained["model"] = model
+            trained["accuracy"] = float(np.mean(predictions == labels))
+        
+        return trained
+    
+    def swap_model(self, trained):
+        """Atomically replace the live vectorizer, index and model"""
+        index = trained["index"]
+        with self.model_lock:
+            if trained["history_version"] != self.history_version:
+                # Retention renumbered the rows this model was trained on
+                self.trainer.request()
+                return
+            
+            # Pick up interactions recorded while training was running
+            index.add_interactions(trained["vectorizer"], self.store.iter_interactions(after=index.last_row_id))
+            self.vectorizer = trained["vectorizer"]
+            self.interaction_index = index
+            if trained["model"] is not None:
+                self.preference_model = trained["model"]
+                self.user_data["learning_stats"]["accuracy_score"] = trained["accuracy"]
+        
+        self.save_model()
+    
+    def run_maintenance(self):
+        """Background pass: daily retention roll-up, then store compaction"""
+        today = datetime.now().date()
+        if self.retention_date != today:
+            self.retention_date = today
+            self.apply_retention()
+        self.store.compact()
+    
+    def apply_retention(self):
+        """Fold expired and duplicate interactions into daily summaries"""
+        try:
+            with self.model_lock:
+                fold_ids, folded = self.retention.plan(self.store.iter_interactions())
+                if fold_ids:
+                    self.store.fold_interactions(fold_ids, self.retention.summarize(folded, self.find_commands))
+                    self.history_version += 1
+                    
+                    # Row ids changed; re-index the retained rows with the live vectorizer
+                    index = self.new_interaction_index()
+                    if self.is_vectorizer_fitted():
+                        index.add_interactions(self.vectorizer, self.store.iter_interactions())
+                    self.interaction_index = index
+            
+            if fold_ids:
+                if self.online_mode:
+                    self.save_online_model()
+                else:
+                    self.save_model()
+                print(f"Rolled up {len(fold_ids)} interactions into daily summaries")
+        except Exception as e:
+            print(f"Retention error: {e}")
     
     def train_model(self):
-        """Train machine learning model for user preferences"""
+        """Train machine learning model for user preferences (blocking)"""
         try:
-            if len(self.user_data["interactions"]) < 5:
-                return  # Need more data
-            
-            # Prepare training data
-            interactions = self.user_data["interactions"]
-            texts = [interaction["user_input"] for interaction in interactions]
-            labels = [1 if interaction["success"] else 0 for interaction in interactions]
-            
-            # Vectorize texts
-            X = self.vectorizer.fit_transform(texts)
-            
-            # Train simple clustering model
-            if len(set(labels)) > 1:  # Need at least 2 different labels
-                self.preference_model = KMeans(n_clusters=2, random_state=42)
-                self.preference_model.fit(X)
-                
-                # Calculate accuracy
-                predictions = self.preference_model.predict(X)
-                accuracy = np.mean(predictions == labels)
-                self.user_data["learning_stats"]["accuracy_score"] = accuracy
-                
-                # Save model
-                self.save_model()
-                
+            trained = self.build_model()
+            if trained:
+                self.swap_model(trained)
         except Exception as e:
             print(f"Model training error: {e}")
     
     def predict_user_intent(self, user_input):
         """Predict user intent based on learned patterns"""
         try:
-            if not self.preference_model:
+            if not self.is_vectorizer_fitted() or not len(self.interaction_index):
                 return None
             
-            # Vectorize input
-            X = self.vectorizer.transform([user_input])
+            # Serve from the current model version even while retraining
+            with self.model_lock:
+                vectorizer, index = self.vectorizer, self.interaction_index
             
-            # Predict cluster
-            cluster = self.preference_model.predict(X)[0]
-            
-            # Find similar successful interactions
-            similar_interactions = []
-            for interaction in self.user_data["interactions"]:
-                if interaction["success"]:
-                    interaction_vector = self.vectorizer.transform([interaction["user_input"]])
-                    similarity = cosine_similarity(X, interaction_vector)[0][0]
-                    if similarity > 0.3:  # Threshold for similarity
-                        similar_interactions.append((interaction, similarity))
+            # Vectorize input
+            X = vectorizer.transform([user_input])
             
-            # Sort by similarity
-            similar_interactions.sort(key=lambda x: x[1], reverse=True)
+            # Find similar successful interactions with one sparse product
+            matches = index.query(X, k=3, threshold=0.3)
             
-            return similar_interactions[:3]  # Return top 3 similar interactions
+            return [(self.store.get_interaction(row_id), similarity) for row_id, similarity in matches]
             
         except Exception as e:
             print(f"Intent prediction error: {e}")
@@ -247,23 +516,28 @@ class LearningSystem:
         
         return None
     
+    def active_hours(self):
+        """Hours of the day the user is historically active in"""
+        return self.aggregates.active_hours(self.config.PREFETCH_MIN_ACTIVITY_SHARE)
+    
     def get_user_insights(self):
         """Generate insights about user behavior"""
         try:
-            interactions = self.user_data["interactions"]
-            if not interactions:
+            # All figures are read from the running aggregates
+            total_interactions = self.aggregates.total
+            if not total_interactions:
                 return "No interaction data available yet."
             
             # Analyze time patterns
-            hours = [interaction["hour"] for interaction in interactions]
-            most_active_hour = Counter(hours).most_common(1)[0][0]
+            most_active_hour = self.aggregates.most_active_hour()
+            most_active_day = self.aggregates.most_active_day()
             
             # Analyze success rate
-            successful_interactions = sum(1 for i in interactions if i["success"])
-            success_rate = (successful_interactions / len(interactions)) * 100
+            success_rate = self.aggregates.success_rate() * 100
+            recent_success_rate = self.aggregates.recent_success_rate() * 100
             
-            # Analyze common commands
-            common_commands = self.user_data["preferences"]["common_commands"]
+            # Analyze common commands, most frequent first
+            common_commands = self.aggregates.top_commands(5)
             
             # Analyze interests
             interests = self.user_data["preferences"]["interests"]
@@ -271,10 +545,11 @@ class LearningSystem:
             insights = f"""
             User Insights:
             - Most active hour: {most_active_hour}:00
-            - Success rate: {success_rate:.1f}%
+            - Most active day: {DAY_NAMES[most_active_day]}
+            - Success rate: {success_rate:.1f}% (recent: {recent_success_rate:.1f}%)
             - Common commands: {', '.join(common_commands[:5])}
             - Interests: {', '.join(interests[:5])}
-            - Total interactions: {len(interactions)}
+            - Total interactions: {total_interactions}
             """
             
             return insights
@@ -288,9 +563,10 @@ class LearningSystem:
             suggestions = []
             
             # Check success rate
-            interactions = self.user_data["interactions"]
-            if interactions:
-                success_rate = sum(1 for i in interactions if i["success"]) / len(interactions)
+            # Recent (decayed) success rate reflects current performance
+            total_interactions = self.aggregates.total
+            if total_interactions:
+                success_rate = self.aggregates.recent_success_rate()
                 
                 if success_rate < 0.7:
                     suggestions.append("Consider improving voice recognition accuracy")
@@ -306,7 +582,7 @@ class LearningSystem:
                 suggestions.append("Voice speed might be too slow")
             
             # Check interaction patterns
-            if len(interactions) < 10:
+            if total_interactions < 10:
                 suggestions.append("Need more interaction data for better learning")
             
             return suggestions if suggestions else ["System is performing well"]
@@ -322,8 +598,7 @@ class LearningSystem:
             current_day = datetime.now().weekday()
             
             # Adjust response based on time patterns
-            time_patterns = self.user_data["preferences"]["time_patterns"]
-            if current_hour in time_patterns:
+            if self.aggregates.is_active_hour(current_hour):
                 # User is active at this time, use learned preferences
                 return self.get_personalized_response(user_input)
             else:
@@ -340,8 +615,12 @@ class LearningSystem:
             if not filename:
                 filename = f"jarvis_learning_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             
+            export = dict(self.user_data)
+            export["interactions"] = [interaction for _, interaction in self.store.iter_interactions()]
+            export["rollups"] = list(self.store.iter_rollups())
+            
             with open(filename, 'w') as f:
-                json.dump(self.user_data, f, indent=2)
+                json.dump(export, f, indent=2)
             
             return f"Learning data exported to {filename}"
             
@@ -351,29 +630,28 @@ class LearningSystem:
     def reset_learning_data(self):
         """Reset all learning data"""
         try:
-            self.user_data = {
-                "interactions": [],
-                "preferences": {
-                    "voice_speed": 200,
-                    "voice_volume": 0.8,
-                    "preferred_voice": "male",
-                    "common_commands": [],
-                    "time_patterns": {},
-                    "interests": [],
-                    "dislikes": []
-                },
-                "learning_stats": {
-                    "total_interactions": 0,
-                    "accuracy_score": 0.0,
-                    "last_updated": None
-                }
-            }
-            
-            self.save_user_data()
-            
-            # Remove model file
-            if os.path.exists(self.model_file):
-                os.remove(self.model_file)
+            self.user_data = self.default_user_data()
+            self.aggregates = LearningAggregates(self.config.AGGREGATE_DECAY_HOURS)
+            self.user_data["aggregates"] = self.aggregates.to_dict()
+            self.store.reset(self.user_data)
+            
+            # Remove model files
+            for model_file in (self.legacy_model_file, self.online_model_file):
+                if os.path.exists(model_file):
+                    os.remove(model_file)
+            ModelArtifact.remove(self.model_dir)
+            
+            # Drop the fitted model and the similarity index
+            with self.model_lock:
+                if self.online_mode:
+                    self.online_model = self.new_online_model()
+                    self.vectorizer = self.online_model.vectorizer
+                    self.preference_model = self.online_model
+                else:
+                    self.vectorizer = self.new_vectorizer()
+                    self.preference_model = None
+                self.interaction_index.clear()
+            ModelArtifact.remove(self.interaction_index.index_dir)
             
             return "Learning data reset successfully"
             
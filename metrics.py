@@ -0,0 +1,333 @@
+"""
+JARVIS Metrics
+In-process counters, gauges and latency histograms served in Prometheus text format
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Prometheus "le" bounds (seconds) for latency histograms
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# HDR-style recording: values in microseconds, 64 linear sub-buckets per power of two (< 1.6% error)
+SUB_BUCKET_BITS = 7
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+HALF_SUB_BUCKETS = SUB_BUCKETS // 2
+
+
+def bucket_index(value):
+    """Index of the log-linear bucket holding an integer value"""
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return SUB_BUCKETS + (shift - 1) * HALF_SUB_BUCKETS + (value >> shift) - HALF_SUB_BUCKETS
+
+
+def bucket_bounds(index):
+    """Lowest and highest integer value recorded in a bucket"""
+    if index < SUB_BUCKETS:
+        return index, index
+    shift = (index - SUB_BUCKETS) // HALF_SUB_BUCKETS + 1
+    top = (index - SUB_BUCKETS) % HALF_SUB_BUCKETS + HALF_SUB_BUCKETS
+    return top << shift, ((top + 1) << shift) - 1
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def format_labels(names, values, extra=()):
+    pairs = [*zip(names, values), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{escape(value)}"' for name, value in pairs) + "}"
+
+
+def format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """A named metric with one value per combination of label values"""
+
+    kind = "untyped"
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def key(self, labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return lines
+
+    def samples(self):
+        with self.lock:
+            items = sorted(self.values.items())
+        return [f"{self.name}{format_labels(self.labelnames, key)} {format_value(value)}" for key, value in items]
+
+
+class Counter(Metric):
+    """A count that only goes up, e.g. routing hits"""
+
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        if not self.registry.enabled:
+            return
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """A value that goes up and down, set directly or read from a function at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        super().__init__(registry, name, documentation, labelnames)
+        self.functions = {}
+
+    def set(self, value, **labels):
+        if not self.registry.enabled:
+            return
+        key = self.key(labels)
+        with self.lock:
+            self.values[key] = value
+
+    def set_function(self, function, **labels):
+        """Report function() (e.g. a queue's qsize) whenever the metrics are scraped"""
+        key = self.key(labels)
+        with self.lock:
+            self.functions[key] = function
+
+    def samples(self):
+        with self.lock:
+            values = dict(self.values)
+            functions = dict(self.functions)
+        for key, function in functions.items():
+            try:
+                values[key] = function()
+            except Exception:
+                continue  # The owner has gone away; report nothing rather than fail the scrape
+        return [f"{self.name}{format_labels(self.labelnames, key)} {format_value(value)}"
+                for key, value in sorted(values.items())]
+
+
+class LatencyRecorder:
+    """Counts of observed durations in HDR-style log-linear microsecond buckets.
+
+    Percentiles come from the log-linear buckets; the Prometheus ``le``
+    buckets (``bounds``, seconds) are counted exactly as well, since their
+    edges do not line up with the log-linear ones.
+    """
+
+    __slots__ = ("counts", "bounds", "bound_counts", "count", "total")
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.counts = {}
+        self.bounds = bounds
+        self.bound_counts = [0] * (len(bounds) + 1)  # The last one is above every bound
+        self.count = 0
+        self.total = 0.0
+
+    def record(self, seconds):
+        index = bucket_index(max(0, int(seconds * 1e6)))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.bound_counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, fraction):
+        """Approximate duration (seconds) below which fraction of observations fall"""
+        if not self.count:
+            return None
+        rank = max(1, round(self.count * fraction))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                low, high = bucket_bounds(index)
+                return (low + high) / 2 / 1e6
+        return None
+
+    def cumulative(self):
+        """Observation count at or below each bound, for Prometheus buckets"""
+        result = []
+        seen = 0
+        for count in self.bound_counts[:-1]:
+            seen += count
+            result.append(seen)
+        return result
+
+
+class Histogram(Metric):
+    """Latency distribution; exported as Prometheus buckets, percentiles available in process"""
+
+    kind = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, seconds, **labels):
+        if not self.registry.enabled:
+            return
+        key = self.key(labels)
+        with self.lock:
+            recorder = self.values.get(key)
+            if recorder is None:
+                recorder = self.values[key] = LatencyRecorder(self.buckets)
+            recorder.record(seconds)
+
+    def time(self, **labels):
+        """Context manager that observes the duration of its block"""
+        if not self.registry.enabled:
+            return nullcontext()
+        return _Timer(self, labels)
+
+    def percentile(self, fraction, **labels):
+        with self.lock:
+            recorder = self.values.get(self.key(labels))
+            return recorder.percentile(fraction) if recorder else None
+
+    def samples(self):
+        lines = []
+        with self.lock:
+            items = sorted(self.values.items())
+            snapshot = [(key, recorder.cumulative(), recorder.count, recorder.total)
+                        for key, recorder in items]
+        for key, cumulative, count, total in snapshot:
+            for bound, seen in zip((*self.buckets, float("inf")), (*cumulative, count)):
+                labels = format_labels(self.labelnames, key, (("le", format_value(float(bound))),))
+                lines.append(f"{self.name}_bucket{labels} {seen}")
+            labels = format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """The process's metrics; recording is a no-op until enabled"""
+
+    def __init__(self):
+        self.enabled = False
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(self, name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets)
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self.lock:
+            metrics = list(self.metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# Hot-path metrics
+ROUTE_HITS = registry.counter("jarvis_route_hits_total", "Utterances dispatched per command route", ["route"])
+HANDLER_SECONDS = registry.histogram("jarvis_handler_seconds", "Command handler duration per route", ["route"])
+LLM_SECONDS = registry.histogram("jarvis_llm_request_seconds", "LLM call duration (to the full reply)", ["mode"])
+LLM_CACHE = registry.counter("jarvis_llm_cache_total", "Response cache lookups", ["result"])
+LLM_FALLBACKS = registry.counter("jarvis_llm_fallbacks_total", "LLM calls answered with a canned fallback")
+STT_SECONDS = registry.histogram("jarvis_stt_seconds", "Speech-to-text duration", ["kind"])
+TTS_SECONDS = registry.histogram("jarvis_tts_seconds", "Text-to-speech duration per utterance")
+TTS_QUEUE_DEPTH = registry.gauge("jarvis_tts_queue_depth", "Utterances waiting to be spoken")
+VOICE_QUEUE_DEPTH = registry.gauge("jarvis_voice_queue_depth", "Items waiting per voice pipeline stage", ["stage"])
+MONITOR_LOOP_SECONDS = registry.histogram("jarvis_monitor_loop_seconds", "Duration of one background loop pass", ["loop"])
+FLUSH_SECONDS = registry.histogram("jarvis_persistence_flush_seconds", "Duration of a write to disk", ["store"])
+SUBSYSTEM_LOAD_SECONDS = registry.gauge("jarvis_subsystem_load_seconds", "Time taken to build a subsystem", ["subsystem"])
+
+
+# HTTP endpoint
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    registry = registry
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes would flood the console
+
+
+def start_metrics_server(port, host="127.0.0.1"):
+    """Serve /metrics on a daemon thread; returns the server (call shutdown() to stop it)"""
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="jarvis-metrics").start()
+    return server
+
+
+def configure_metrics(config):
+    """Enable recording and the endpoint from METRICS_* settings; returns the server or None"""
+    if not config.METRICS_ENABLED or registry.enabled:
+        return None
+    registry.enabled = True
+    try:
+        server = start_metrics_server(config.METRICS_PORT, config.METRICS_HOST)
+        print(f"Metrics at http://{config.METRICS_HOST}:{config.METRICS_PORT}/metrics")
+        return server
+    except OSError as e:
+        print(f"Metrics endpoint error: {e}")
+        return None
@@ -0,0 +1,191 @@
+"""
+JARVIS Model Artifacts
+Versioned, memory-mappable storage for trained models and indexes
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from learning_store import atomic_write_json
+
+FORMAT_VERSION = 1
+
+
+class ModelArtifactError(Exception):
+    """A saved artifact is unreadable, corrupt or from a newer format"""
+
+
+def file_checksum(path, chunk_size=1024 * 1024):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelArtifact:
+    """One saved generation: raw ``.npy`` arrays plus a JSON manifest.
+
+    On disk an artifact root looks like::
+
+        <root>/CURRENT               {"generation": n}
+        <root>/gen-000007/manifest.json
+        <root>/gen-000007/<name>.npy
+
+    The manifest carries the format version, free-form metadata and the
+    dtype, shape and SHA-256 of every array. Arrays are opened with
+    ``np.load(mmap_mode='r')`` on first access and their checksum is
+    verified then, so opening an artifact only reads the manifest.
+    """
+
+    MANIFEST = 'manifest.json'
+
+    def __init__(self, path, manifest, verify=True):
+        self.path = path
+        self.manifest = manifest
+        self.verify = verify
+        self._arrays = {}
+
+    @property
+    def generation(self):
+        return self.manifest["generation"]
+
+    @property
+    def metadata(self):
+        return self.manifest["metadata"]
+
+    def __contains__(self, name):
+        return name in self.manifest["arrays"]
+
+    def __getitem__(self, name):
+        if name not in self._arrays:
+            entry = self.manifest["arrays"][name]
+            array_file = os.path.join(self.path, entry["file"])
+            if self.verify and file_checksum(array_file) != entry["sha256"]:
+                raise ModelArtifactError(f"Checksum mismatch for {name} in {self.path}")
+            array = np.load(array_file, mmap_mode='r', allow_pickle=False)
+            if str(array.dtype) != entry["dtype"] or list(array.shape) != entry["shape"]:
+                raise ModelArtifactError(f"Unexpected dtype/shape for {name} in {self.path}")
+            self._arrays[name] = array
+        return self._arrays[name]
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    # Reading and writing whole artifacts
+
+    @classmethod
+    def generation_path(cls, root, generation):
+        return os.path.join(root, f"gen-{generation:06d}")
+
+    @classmethod
+    def current_generation(cls, root):
+        try:
+            with open(os.path.join(root, 'CURRENT')) as f:
+                return int(json.load(f)["generation"])
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError) as e:
+            raise ModelArtifactError(f"Unreadable CURRENT pointer in {root}: {e}")
+
+    @classmethod
+    def open(cls, root, verify=True):
+        """Open the current generation under root, or return None if there is none"""
+        generation = cls.current_generation(root)
+        if generation is None:
+            return None
+
+        path = cls.generation_path(root, generation)
+        try:
+            with open(os.path.join(path, cls.MANIFEST)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ModelArtifactError(f"Unreadable manifest in {path}: {e}")
+        if manifest.get("format_version") != FORMAT_VERSION:
+            raise ModelArtifactError(
+                f"Unsupported artifact format {manifest.get('format_version')} in {path}"
+            )
+        return cls(path, manifest, verify=verify)
+
+    @classmethod
+    def save(cls, root, arrays, metadata=None, keep=2):
+        """Write a new generation and atomically make it current.
+
+        Older generations beyond ``keep`` are removed; ones that are still
+        memory-mapped elsewhere (which Windows refuses to delete) are left
+        for the next save.
+        """
+        os.makedirs(root, exist_ok=True)
+        generation = (cls.current_generation(root) or 0) + 1
+        path = cls.generation_path(root, generation)
+        if os.path.exists(path):
+            shutil.rmtree(path)  # Leftover from an interrupted save
+        os.makedirs(path)
+
+        entries = {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            file_name = f"{name}.npy"
+            array_file = os.path.join(path, file_name)
+            with open(array_file, 'wb') as f:
+                np.save(f, array, allow_pickle=False)
+                f.flush()
+                os.fsync(f.fileno())
+            entries[name] = {
+                "file": file_name,
+                "dtype": str(array.dtype),
+                "shape": list(array.shape),
+                "sha256": file_checksum(array_file)
+            }
+
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "generation": generation,
+            "created": time.time(),
+            "metadata": metadata or {},
+            "arrays": entries
+        }
+        atomic_write_json(os.path.join(path, cls.MANIFEST), manifest, indent=2)
+        atomic_write_json(os.path.join(root, 'CURRENT'), {"generation": generation})
+
+        for name in os.listdir(root):
+            if name.startswith('gen-') and name[4:].isdigit() and int(name[4:]) <= generation - keep:
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+        return cls(path, manifest)
+
+    @classmethod
+    def remove(cls, root):
+        """Delete every generation under root"""
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def vectorizer_arrays(vectorizer):
+    """Vocabulary (ordered by feature index) and IDF weights of a fitted TfidfVectorizer"""
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    return {
+        "vocabulary": np.array(terms, dtype=str),
+        "idf": np.asarray(vectorizer.idf_, dtype=np.float64)
+    }
+
+
+def restore_vectorizer(vectorizer, artifact):
+    """Make an unfitted TfidfVectorizer usable from saved vocabulary/IDF arrays"""
+    terms = artifact["vocabulary"].tolist()
+    vectorizer.vocabulary_ = {term: position for position, term in enumerate(terms)}
+    vectorizer.idf_ = artifact["idf"]
+    return vectorizer
+
+
+def restore_kmeans(model, centers):
+    """Make an unfitted KMeans predict with saved cluster centers"""
+    model.cluster_centers_ = centers
+    model.n_features_in_ = centers.shape[1]
+    model._n_threads = 1  # Normally set by fit()
+    return model
@@ -0,0 +1,97 @@
+"""
+JARVIS Background Model Trainer
+Debounced retraining worker that keeps model refits off the voice loop
+"""
+
+import threading
+import time
+
+
+class BackgroundTrainer:
+    """Runs a training function on a daemon thread.
+
+    Requests are debounced: the worker waits until no new request has
+    arrived for ``debounce_seconds`` and then trains once, so a burst of
+    interactions results in a single refit. ``on_trained`` receives the
+    training result and is responsible for swapping it in.
+    """
+
+    def __init__(self, train_fn, on_trained, debounce_seconds=5.0, name="jarvis-trainer"):
+        self.train_fn = train_fn
+        self.on_trained = on_trained
+        self.debounce_seconds = debounce_seconds
+        self.name = name
+
+        self._condition = threading.Condition()
+        self._requested_at = None
+        self._training = False
+        self._running = False
+        self._thread = None
+        self.completed_runs = 0
+
+    def request(self):
+        """Ask for a retrain; returns immediately"""
+        with self._condition:
+            self._requested_at = time.monotonic()
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    @property
+    def is_busy(self):
+        with self._condition:
+            return self._training or self._requested_at is not None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and self._requested_at is None:
+                    self._condition.wait()
+                if not self._running:
+                    return
+
+                # Debounce: keep waiting while requests keep arriving
+                while self._running:
+                    remaining = self._requested_at + self.debounce_seconds - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if not self._running:
+                    return
+
+                self._requested_at = None
+                self._training = True
+
+            try:
+                result = self.train_fn()
+                if result is not None:
+                    self.on_trained(result)
+            except Exception as e:
+                print(f"Background training error: {e}")
+            finally:
+                with self._condition:
+                    self._training = False
+                    self.completed_runs += 1
+                    self._condition.notify_all()
+
+    def wait_idle(self, timeout=None):
+        """Block until no training is pending or running"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._training or self._requested_at is not None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def stop(self):
+        """Stop the worker after any in-flight training finishes"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
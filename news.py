@@ -1,26 +1,37 @@
-import requests
 import json
-import pyttsx3
-engine = pyttsx3.init()
-voices = engine.getProperty('voices')
-engine.setProperty('voice', voices[0].id)
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def tts_engine():
+    import pyttsx3
+    engine = pyttsx3.init()
+    voices = engine.getProperty('voices')
+    engine.setProperty('voice', voices[0].id)
+    return engine
 
 
 def speak(audio):
+    engine = tts_engine()
     engine.say(audio)
     engine.runAndWait()
 
 
-def speak_news():
-    url = 'http://newsapi.org/v2/top-headlines?sources=the-times-of-india&apiKey=yourapikey'
-    news = requests.get(url).text
+def get_headlines():
+    import requests
+    news = requests.get(getNewsUrl()).text
     news_dict = json.loads(news)
-    arts = news_dict['articles']
+    return [articles['title'] for articles in news_dict['articles']]
+
+
+def speak_news(headlines=None):
+    if headlines is None:
+        headlines = get_headlines()
     speak('Source: The Times Of India')
     speak('Todays Headlines are..')
-    for index, articles in enumerate(arts):
-        speak(articles['title'])
-        if index == len(arts)-1:
+    for index, title in enumerate(headlines):
+        speak(title)
+        if index == len(headlines)-1:
             break
         speak('Moving on the next news headline..')
     speak('These were the top headlines, Have a nice day Sir!!..')
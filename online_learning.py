@@ -0,0 +1,99 @@
+"""
+JARVIS Online Learning
+Constant-time incremental model updates using hashing features
+"""
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.preprocessing import normalize
+
+
+class OnlineTfidfVectorizer:
+    """TF-IDF over stateless hashed features with incrementally kept IDF.
+
+    Unlike TfidfVectorizer there is no vocabulary to fit: document
+    frequencies are counted per hash bucket as texts arrive, so adding a
+    document costs O(terms in that document).
+    """
+
+    def __init__(self, n_features=2 ** 16, stop_words='english'):
+        self.n_features = n_features
+        self.stop_words = stop_words
+        self.hasher = HashingVectorizer(
+            n_features=n_features,
+            stop_words=stop_words,
+            alternate_sign=False,
+            norm=None
+        )
+        self.doc_freq = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+
+    def partial_fit(self, texts):
+        """Update document frequencies with new texts"""
+        counts = self.hasher.transform(texts)
+        counts.sum_duplicates()
+        np.add.at(self.doc_freq, counts.indices, 1)
+        self.n_docs += counts.shape[0]
+        return self
+
+    @property
+    def idf_(self):
+        # Same smoothed IDF as TfidfVectorizer(smooth_idf=True)
+        return np.log((1 + self.n_docs) / (1 + self.doc_freq)) + 1
+
+    def transform(self, texts):
+        counts = self.hasher.transform(texts).astype(np.float64)
+        # Only the buckets present in these texts need an IDF lookup
+        doc_freq = self.doc_freq[counts.indices]
+        counts.data *= np.log((1 + self.n_docs) / (1 + doc_freq)) + 1
+        return normalize(counts, norm='l2', copy=False)
+
+
+class OnlineIntentModel:
+    """Hashing TF-IDF plus MiniBatchKMeans updated with partial_fit.
+
+    Interactions are buffered into fixed-size mini-batches, so each
+    interaction costs amortized O(1) regardless of history length. The
+    accuracy score is prequential: each batch is scored against the labels
+    before the model learns from it.
+    """
+
+    def __init__(self, n_features=2 ** 16, batch_size=8, n_clusters=2):
+        self.vectorizer = OnlineTfidfVectorizer(n_features=n_features)
+        self.batch_size = max(batch_size, n_clusters)
+        self.model = MiniBatchKMeans(n_clusters=n_clusters, random_state=42, n_init=3)
+        self.is_trained = False
+        self.pending_texts = []
+        self.pending_labels = []
+        self.correct = 0
+        self.scored = 0
+
+    @property
+    def accuracy(self):
+        return self.correct / self.scored if self.scored else 0.0
+
+    def partial_fit(self, text, label):
+        """Learn from one interaction; returns True when a batch was applied"""
+        self.vectorizer.partial_fit([text])
+        self.pending_texts.append(text)
+        self.pending_labels.append(label)
+
+        if len(self.pending_texts) < self.batch_size:
+            return False
+
+        X = self.vectorizer.transform(self.pending_texts)
+        labels = np.array(self.pending_labels)
+
+        if self.is_trained:
+            self.correct += int(np.sum(self.model.predict(X) == labels))
+            self.scored += len(labels)
+
+        self.model.partial_fit(X)
+        self.is_trained = True
+        self.pending_texts = []
+        self.pending_labels = []
+        return True
+
+    def predict(self, X):
+        return self.model.predict(X)
@@ -0,0 +1,160 @@
+"""
+JARVIS Preference Store
+Write-behind persistence of user preferences plus an append-only feedback log
+"""
+
+import atexit
+import copy
+import json
+import os
+import threading
+import time
+
+from learning_store import atomic_write_json
+from metrics import FLUSH_SECONDS
+
+DEFAULT_PREFERENCES = {
+    "name": "Sir",
+    "preferred_voice": "male",
+    "interests": [],
+    "schedule": {},
+    "security_level": "high"
+}
+
+
+class PreferenceStore:
+    """Small preference document written behind, feedback appended to a log.
+
+    Changes to ``data`` (made under ``lock``) only set a dirty flag via
+    ``mark_dirty``; a daemon thread writes the document at most once per
+    ``flush_interval`` seconds, however many changes arrived in between,
+    using a temp file and rename so a crash never leaves it half written.
+    Feedback events are one JSON line each in a separate append-only log,
+    so recording one costs a single small append instead of rewriting an
+    ever-growing file. Pending changes are flushed on ``close`` and at exit.
+    """
+
+    def __init__(self, path='user_preferences.json', feedback_file='user_feedback.jsonl',
+                 flush_interval=2.0, fsync=False):
+        self.path = path
+        self.feedback_file = feedback_file
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+
+        self.lock = threading.RLock()
+        self._condition = threading.Condition(self.lock)
+        self._dirty_since = None
+        self._feedback_handle = None
+        self._thread = None
+        self._running = False
+        self.writes = 0
+
+        self.data = self.load()
+        atexit.register(self.close)
+
+    def load(self):
+        """Read the preference document, moving any embedded feedback into the log"""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return copy.deepcopy(DEFAULT_PREFERENCES)
+        except ValueError as e:
+            print(f"Preferences load error: {e}")
+            return copy.deepcopy(DEFAULT_PREFERENCES)
+
+        # Older versions kept every feedback event inside the document
+        legacy_feedback = data.pop("feedback", None)
+        if legacy_feedback:
+            for entry in legacy_feedback:
+                self.append_feedback(entry)
+            atomic_write_json(self.path, data, indent=2)
+        return data
+
+    # Preference document
+
+    def mark_dirty(self):
+        """Schedule a write of the document; returns immediately"""
+        with self._condition:
+            if self._dirty_since is None:
+                self._dirty_since = time.monotonic()
+            if not self._running:
+                self._running = True
+                self._thread = threading.Thread(target=self._run, name="jarvis-preferences", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    @property
+    def is_dirty(self):
+        with self.lock:
+            return self._dirty_since is not None
+
+    def flush(self):
+        """Write the document now if it has unsaved changes"""
+        with self.lock:
+            if self._dirty_since is None:
+                return False
+            snapshot = copy.deepcopy(self.data)
+            self._dirty_since = None
+        try:
+            with FLUSH_SECONDS.time(store="preferences"):
+                atomic_write_json(self.path, snapshot, indent=2)
+            self.writes += 1
+            return True
+        except OSError as e:
+            print(f"Preferences save error: {e}")
+            self.mark_dirty()  # Try again on the next interval
+            return False
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._running and self._dirty_since is None:
+                    self._condition.wait()
+                # Coalesce: changes arriving during the interval share one write
+                while self._running and self._dirty_since is not None:
+                    remaining = self._dirty_since + self.flush_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if not self._running:
+                    return
+            self.flush()
+
+    # Feedback log
+
+    def append_feedback(self, entry):
+        """Append one feedback event to the log"""
+        with self.lock, FLUSH_SECONDS.time(store="feedback"):
+            if self._feedback_handle is None:
+                self._feedback_handle = open(self.feedback_file, 'a', encoding='utf-8')
+            self._feedback_handle.write(json.dumps(entry, separators=(',', ':')) + "\n")
+            self._feedback_handle.flush()
+            if self.fsync:
+                os.fsync(self._feedback_handle.fileno())
+
+    def iter_feedback(self):
+        """Yield logged feedback events, oldest first"""
+        try:
+            with open(self.feedback_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line after a crash
+        except FileNotFoundError:
+            return
+
+    def close(self):
+        """Stop the writer and flush anything pending"""
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self.lock:
+            if self._feedback_handle is not None:
+                self._feedback_handle.close()
+                self._feedback_handle = None
@@ -0,0 +1,140 @@
+"""
+JARVIS Prefetch Scheduler
+Warms briefing caches (weather, news, status, suggestions) before active hours
+"""
+
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from metrics import MONITOR_LOOP_SECONDS
+
+Fetcher = namedtuple("Fetcher", ["fetch", "ttl", "hourly"])
+CacheEntry = namedtuple("CacheEntry", ["value", "expires"])
+
+
+class PrefetchScheduler:
+    """Speculatively fetches slow briefing data ahead of when it is needed.
+
+    Each registered fetcher has a time-to-live. A daemon thread wakes every
+    ``check_interval`` seconds; when the hour starting ``lead_minutes`` from
+    now is one of the user's active hours (``active_hours_fn``, typically
+    from LearningSystem), or the current hour is, every entry that is
+    missing or would expire within the lead window is fetched again. So by
+    the time the user usually shows up, ``get`` answers from memory.
+
+    ``hourly`` fetchers are called with the hour they are for (e.g. time of
+    day suggestions) and cached per hour; the others take no arguments. A
+    ``get`` that misses fetches synchronously; if that fails, a stale value
+    is served when there is one.
+    """
+
+    def __init__(self, active_hours_fn, lead_minutes=10, check_interval=60.0, clock=datetime.now):
+        self.active_hours_fn = active_hours_fn
+        self.lead = timedelta(minutes=lead_minutes)
+        self.check_interval = check_interval
+        self.clock = clock
+        self.fetchers = {}
+        self.entries = {}
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.stats = {"hits": 0, "misses": 0, "prefetched": 0, "errors": 0}
+
+    def register(self, name, fetch, ttl_seconds, hourly=False):
+        self.fetchers[name] = Fetcher(fetch, timedelta(seconds=ttl_seconds), hourly)
+
+    # Serving
+
+    def get(self, name):
+        """The cached value for name, fetching it now if it is missing or expired"""
+        now = self.clock()
+        key = self._key(name, now.hour)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry.expires > now:
+                self.stats["hits"] += 1
+                return entry.value
+            self.stats["misses"] += 1
+
+        try:
+            return self._fetch(name, now.hour, now)
+        except Exception as e:
+            print(f"Prefetch error ({name}): {e}")
+            with self.lock:
+                self.stats["errors"] += 1
+            if entry is not None:
+                return entry.value
+            raise
+
+    def _key(self, name, hour):
+        return (name, hour) if self.fetchers[name].hourly else (name, None)
+
+    def _fetch(self, name, hour, now):
+        fetcher = self.fetchers[name]
+        value = fetcher.fetch(hour) if fetcher.hourly else fetcher.fetch()
+        with self.lock:
+            self.entries[self._key(name, hour)] = CacheEntry(value, now + fetcher.ttl)
+            if fetcher.hourly:
+                # Entries for hours that have passed are never served again
+                for key in [key for key in self.entries if key[0] == name and key[1] not in (hour, now.hour)]:
+                    del self.entries[key]
+        return value
+
+    # Warming
+
+    def warm(self, hour=None):
+        """Fetch every entry that is missing or expires within the lead window"""
+        now = self.clock()
+        hour = now.hour if hour is None else hour
+        for name in self.fetchers:
+            with self.lock:
+                entry = self.entries.get(self._key(name, hour))
+            if entry is not None and entry.expires > now + self.lead:
+                continue
+            try:
+                self._fetch(name, hour, now)
+                with self.lock:
+                    self.stats["prefetched"] += 1
+            except Exception as e:
+                print(f"Prefetch error ({name}): {e}")
+                with self.lock:
+                    self.stats["errors"] += 1
+
+    def due_hour(self):
+        """The active hour to warm for now, or None outside the lead window"""
+        now = self.clock()
+        active = set(self.active_hours_fn())
+        upcoming = (now + self.lead).hour
+        if upcoming in active:
+            return upcoming
+        if now.hour in active:
+            return now.hour
+        return None
+
+    def start(self, warm_now=True):
+        """Start the background scheduler, optionally warming everything once first"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(warm_now,), name="jarvis-prefetch", daemon=True)
+        self._thread.start()
+
+    def _run(self, warm_now):
+        if warm_now:
+            with MONITOR_LOOP_SECONDS.time(loop="prefetch"):
+                self.warm()
+        while not self._stop.wait(self.check_interval):
+            try:
+                with MONITOR_LOOP_SECONDS.time(loop="prefetch"):
+                    hour = self.due_hour()
+                    if hour is not None:
+                        self.warm(hour)
+            except Exception as e:
+                print(f"Prefetch scheduler error: {e}")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
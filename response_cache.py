@@ -0,0 +1,242 @@
+"""
+JARVIS Response Cache
+Exact and similarity caching of AI brain responses
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from sklearn.preprocessing import normalize
+
+from keyword_matcher import normalize_utterance
+
+# Prompts whose answer depends on the current time, date or fresh data
+TIME_SENSITIVE = re.compile(
+    r"\b(time|clock|date|day|today|tonight|tomorrow|yesterday|now|current|currently|"
+    r"latest|recent|news|weather|forecast|temperature|stock|price|score|week|month|year)\b"
+)
+
+# Follow-ups that only make sense against the conversation history
+FOLLOW_UP = re.compile(r"\b(tell me more|what about|and you|explain that|say that again|repeat that)\b")
+
+
+class ResponseCache:
+    """Caches AI responses for repeated (or near-identical) prompts.
+
+    Lookups try, in order:
+
+    * an in-memory LRU keyed on the normalized prompt text,
+    * a persistent SQLite tier with the same keys (hits are promoted),
+    * optionally, a similarity tier: the prompt is vectorized with the
+      learning system's TF-IDF vectorizer and matched against the cached
+      prompts by cosine similarity.
+
+    Entries expire after ``ttl_seconds``. Prompts that ask about the time,
+    date or other fresh data, and conversational follow-ups, bypass the
+    cache entirely. ``stats()`` reports hits per tier, the hit rate and the
+    model latency saved by hits.
+    """
+
+    def __init__(self, max_entries=256, ttl_seconds=24 * 3600, disk_file=None,
+                 max_disk_entries=5000, similarity_threshold=None, vectorizer_fn=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_file = disk_file
+        self.max_disk_entries = max_disk_entries
+        self.similarity_threshold = similarity_threshold
+        self.vectorizer_fn = vectorizer_fn
+
+        self._lock = threading.RLock()
+        self.entries = OrderedDict()
+        self.connection = None
+        self._vectors = None
+        self._vector_keys = []
+        self._vectorizer = None
+
+        self.counters = {
+            "exact_hits": 0,
+            "disk_hits": 0,
+            "similar_hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "latency_saved": 0.0
+        }
+
+    # Keys and bypass rules
+
+    @staticmethod
+    def make_key(prompt):
+        return normalize_utterance(prompt)
+
+    @staticmethod
+    def should_bypass(key):
+        """True for prompts whose answer depends on time or conversation state"""
+        return not key or bool(TIME_SENSITIVE.search(key) or FOLLOW_UP.search(key))
+
+    # Lookup
+
+    def get(self, prompt):
+        """Return a cached response for the prompt, or None"""
+        key = self.make_key(prompt)
+        with self._lock:
+            if self.should_bypass(key):
+                self.counters["bypassed"] += 1
+                return None
+
+            entry = self._get_memory(key)
+            tier = "exact_hits"
+            if entry is None:
+                entry = self._get_disk(key)
+                tier = "disk_hits"
+                if entry is not None:
+                    self._put_memory(key, entry)
+            if entry is None and self.similarity_threshold:
+                entry = self._get_similar(key)
+                tier = "similar_hits"
+
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+
+            self.counters[tier] += 1
+            self.counters["latency_saved"] += entry["latency"]
+            return entry["response"]
+
+    def _expired(self, entry):
+        return time.time() - entry["created"] > self.ttl_seconds
+
+    def _get_memory(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry):
+            self._remove(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def _get_disk(self, key):
+        if not self._connect():
+            return None
+        row = self.connection.execute(
+            "SELECT response, created, latency FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = {"response": row[0], "created": row[1], "latency": row[2]}
+        if self._expired(entry):
+            with self.connection:
+                self.connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        return entry
+
+    def _get_similar(self, key):
+        """Best cached prompt by TF-IDF cosine similarity above the threshold"""
+        vectorizer = self.vectorizer_fn() if self.vectorizer_fn else None
+        if vectorizer is None or not self.entries:
+            return None
+
+        if self._vectors is None or vectorizer is not self._vectorizer:
+            # Cached prompts are re-vectorized when the cache or the model changed
+            self._vector_keys = list(self.entries)
+            self._vectors = normalize(vectorizer.transform(self._vector_keys), norm='l2')
+            self._vectorizer = vectorizer
+
+        query = normalize(vectorizer.transform([key]), norm='l2')
+        if not query.nnz:
+            return None
+        scores = self._vectors.dot(query.T).toarray().ravel()
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+        return self._get_memory(self._vector_keys[best])
+
+    # Storing
+
+    def put(self, prompt, response, latency=0.0):
+        """Cache a response along with the model latency it took to produce"""
+        key = self.make_key(prompt)
+        if self.should_bypass(key):
+            return
+        entry = {"response": response, "created": time.time(), "latency": latency}
+        with self._lock:
+            self._put_memory(key, entry)
+            if self._connect():
+                with self.connection:
+                    self.connection.execute(
+                        "INSERT OR REPLACE INTO responses (key, response, created, latency) VALUES (?, ?, ?, ?)",
+                        (key, response, entry["created"], latency)
+                    )
+                    self.connection.execute(
+                        "DELETE FROM responses WHERE key IN ("
+                        "SELECT key FROM responses ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                        (self.max_disk_entries,)
+                    )
+
+    def _put_memory(self, key, entry):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+        elif self._vectors is not None:
+            self._vectors = None  # Similarity matrix is rebuilt lazily
+        self.entries[key] = entry
+        while len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+
+    def _remove(self, key):
+        del self.entries[key]
+        self._vectors = None
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self._vectors = None
+            if self._connect():
+                with self.connection:
+                    self.connection.execute("DELETE FROM responses")
+
+    def _connect(self):
+        """Open the disk tier on first use; returns False when it is disabled"""
+        if not self.disk_file:
+            return False
+        if self.connection is None:
+            directory = os.path.dirname(self.disk_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(self.disk_file, check_same_thread=False)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    created REAL NOT NULL,
+                    latency REAL NOT NULL
+                )
+            """)
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_created ON responses(created)"
+            )
+        return True
+
+    # Reporting
+
+    def stats(self):
+        """Hit/miss counters, hit rate and total model latency saved (seconds)"""
+        with self._lock:
+            stats = dict(self.counters)
+            hits = stats["exact_hits"] + stats["disk_hits"] + stats["similar_hits"]
+            lookups = hits + stats["misses"]
+            stats["hits"] = hits
+            stats["hit_rate"] = hits / lookups if lookups else 0.0
+            stats["entries"] = len(self.entries)
+            return stats
+
+    def close(self):
+        with self._lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
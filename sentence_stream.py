@@ -0,0 +1,90 @@
+"""
+JARVIS Sentence Stream
+Incremental sentence segmentation of streamed model output
+"""
+
+import re
+
+# Words that end with a period without ending the sentence
+ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "approx",
+    "e.g", "i.e", "a.m", "p.m", "u.s", "u.k", "no", "fig", "inc", "ltd"
+}
+
+TERMINATORS = ".!?…"
+CLOSERS = "\"')]”’"
+
+
+class SentenceSegmenter:
+    """Splits text fed in arbitrary chunks into complete sentences.
+
+    A sentence ends at ``.``, ``!``, ``?`` or an ellipsis (plus any closing
+    quotes or brackets) once the following character is whitespace, and at
+    every newline. The check waits for that following character, so a
+    decimal like "3.5" or an abbreviation like "Dr." split across tokens
+    is never cut. Text running past ``max_chars`` without a boundary is
+    split at the last comma or space so speech can start anyway.
+    """
+
+    def __init__(self, max_chars=250):
+        self.max_chars = max_chars
+        self.buffer = ""
+        self._scan_from = 0
+
+    def feed(self, text):
+        """Add a chunk and return the sentences it completed"""
+        self.buffer += text
+        sentences = []
+        position = self._scan_from
+        while position < len(self.buffer):
+            char = self.buffer[position]
+            if char == "\n":
+                sentences.extend(self._cut(position + 1))
+                position = 0
+                continue
+            if char in TERMINATORS:
+                end = position + 1
+                while end < len(self.buffer) and self.buffer[end] in CLOSERS + TERMINATORS:
+                    end += 1
+                if end == len(self.buffer):
+                    break  # Wait for the next chunk to see what follows
+                if self.buffer[end].isspace() and not self._is_abbreviation(position):
+                    sentences.extend(self._cut(end))
+                    position = 0
+                    continue
+                position = end
+                continue
+            position += 1
+        self._scan_from = min(position, len(self.buffer))
+
+        while len(self.buffer) > self.max_chars:
+            split = max(self.buffer.rfind(", ", 0, self.max_chars), self.buffer.rfind("; ", 0, self.max_chars))
+            if split <= 0:
+                split = self.buffer.rfind(" ", 0, self.max_chars)
+            sentences.extend(self._cut(split + 1 if split > 0 else self.max_chars))
+        return sentences
+
+    def flush(self):
+        """Return whatever is left once the stream has ended"""
+        return self._cut(len(self.buffer))
+
+    def _cut(self, end):
+        sentence = self.buffer[:end].strip()
+        self.buffer = self.buffer[end:]
+        self._scan_from = 0
+        return [sentence] if sentence else []
+
+    def _is_abbreviation(self, position):
+        if self.buffer[position] != ".":
+            return False
+        match = re.search(r"([A-Za-z][A-Za-z.]*)$", self.buffer[:position])
+        if not match:
+            return False
+        word = match.group(1).lower()
+        return word in ABBREVIATIONS or len(word) == 1
+
+
+def split_sentences(text):
+    """Segment a complete text the same way a stream of it would be"""
+    segmenter = SentenceSegmenter()
+    return segmenter.feed(text) + segmenter.flush()
@@ -13,6 +13,7 @@ import psutil
 import pyautogui
 import webbrowser
 from config import Config
+from metrics import MONITOR_LOOP_SECONDS
 import json
 import requests
 
@@ -322,7 +323,8 @@ class SmartAutomation:
         """Start the task scheduler"""
         def run_scheduler():
             while True:
-                schedule.run_pending()
+                with MONITOR_LOOP_SECONDS.time(loop="scheduler"):
+                    schedule.run_pending()
                 time.sleep(60)  # Check every minute
         
         threading.Thread(target=run_scheduler, daemon=True).start()
@@ -0,0 +1,185 @@
+"""
+JARVIS Startup Profiler
+Per-stage startup time, imports and memory, checked against a budget
+"""
+
+import argparse
+import importlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+from config import Config
+
+STAGE_MARKER = "startup-profile stage:"
+REPORT_MARKER = "startup-profile report:"
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+# Everything that has to happen before JARVIS can listen for the first time
+FIRST_LISTEN_STAGES = ("import", "construct", "voice_system")
+
+
+def parse_importtime(lines):
+    """Parse ``-X importtime`` output into one record per imported module.
+
+    Each record has the module, its own and cumulative import time in
+    microseconds, its nesting depth (0 for a top-level import statement)
+    and the startup stage it was imported in, taken from the stage marker
+    lines the profiled interpreter writes to the same stream.
+    """
+    stage = "interpreter"
+    imports = []
+    for line in lines:
+        if line.startswith(STAGE_MARKER):
+            stage = line[len(STAGE_MARKER):].strip()
+            continue
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append({
+                "stage": stage,
+                "module": module,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": len(indent) // 2
+            })
+    return imports
+
+
+def run_stages(subsystems):
+    """Run in the profiled interpreter: import, construct and build subsystems stage by stage"""
+    import psutil
+    process = psutil.Process()
+    stages = [{"stage": "interpreter", "seconds": 0.0, "rss_mb": process.memory_info().rss / 2**20, "error": None}]
+
+    def stage(name, action):
+        print(f"{STAGE_MARKER} {name}", file=sys.stderr, flush=True)
+        start = time.perf_counter()
+        result, error = None, None
+        try:
+            result = action()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        stages.append({
+            "stage": name,
+            "seconds": time.perf_counter() - start,
+            "rss_mb": process.memory_info().rss / 2**20,
+            "error": error
+        })
+        return result
+
+    module = stage("import", lambda: importlib.import_module("jarvis_enhanced"))
+    jarvis = stage("construct", module.EnhancedJARVIS) if module else None
+    if jarvis is not None:
+        # A subsystem's time includes the ones it builds first (ai_brain builds learning_system)
+        for name in ["voice_system", *subsystems]:
+            stage(name, lambda: getattr(jarvis, name))
+    print(REPORT_MARKER + json.dumps(stages), flush=True)
+
+
+def profile(subsystems, top=15, python=sys.executable):
+    """Profile a fresh JARVIS startup in a child interpreter and return the report"""
+    command = [python, "-X", "importtime", os.path.abspath(__file__), "--child",
+               "--subsystems", ",".join(subsystems)]
+    start = time.perf_counter()
+    completed = subprocess.run(command, capture_output=True, text=True)
+    wall_seconds = time.perf_counter() - start
+
+    stages = None
+    for line in completed.stdout.splitlines():
+        if line.startswith(REPORT_MARKER):
+            stages = json.loads(line[len(REPORT_MARKER):])
+    if stages is None:
+        raise RuntimeError(f"Profiled interpreter failed (exit {completed.returncode}):\n{completed.stderr[-2000:]}")
+
+    imports = parse_importtime(completed.stderr.splitlines())
+    for stage in stages:
+        own = [record for record in imports if record["stage"] == stage["stage"]]
+        stage["imports"] = len(own)
+        stage["import_seconds"] = sum(record["self_us"] for record in own) / 1e6
+    # The interpreter stage is only its imports; the others were timed directly
+    stages[0]["seconds"] = stages[0]["import_seconds"]
+
+    first_listen = [stage for stage in stages if stage["stage"] in FIRST_LISTEN_STAGES]
+    return {
+        "python": sys.version.split()[0],
+        "wall_seconds": wall_seconds,
+        "first_listen_seconds": sum(stage["seconds"] for stage in first_listen),
+        "first_listen_rss_mb": first_listen[-1]["rss_mb"] if first_listen else None,
+        "stages": stages,
+        "slowest_imports": sorted(
+            (record for record in imports if record["depth"] == 0 and record["stage"] != "interpreter"),
+            key=lambda record: record["cumulative_us"], reverse=True
+        )[:top],
+        "heaviest_modules": sorted(imports, key=lambda record: record["self_us"], reverse=True)[:top]
+    }
+
+
+def check_budget(report, budget_seconds, memory_budget_mb=0):
+    """Reasons the report breaks the startup budget (empty if it is within budget)"""
+    failures = []
+    reached = {stage["stage"] for stage in report["stages"]}
+    for name in FIRST_LISTEN_STAGES:
+        if name not in reached:
+            failures.append(f"stage {name} did not run")
+    for stage in report["stages"]:
+        if stage["stage"] in FIRST_LISTEN_STAGES and stage["error"]:
+            failures.append(f"stage {stage['stage']} failed: {stage['error']}")
+    if report["first_listen_seconds"] > budget_seconds:
+        failures.append(f"time to first listen {report['first_listen_seconds']:.3f}s exceeds {budget_seconds:.3f}s")
+    rss_mb = report["first_listen_rss_mb"]
+    if memory_budget_mb and rss_mb is not None and rss_mb > memory_budget_mb:
+        failures.append(f"memory at first listen {rss_mb:.1f} MB exceeds {memory_budget_mb:.1f} MB")
+    return failures
+
+
+def print_summary(report, failures, stream=sys.stderr):
+    print(f"{'stage':>20} {'seconds':>9} {'imports':>8} {'import s':>9} {'RSS MB':>8}", file=stream)
+    for stage in report["stages"]:
+        line = (f"{stage['stage']:>20} {stage['seconds']:>9.3f} {stage['imports']:>8} "
+                f"{stage['import_seconds']:>9.3f} {stage['rss_mb']:>8.1f}")
+        print(line + (f"  error: {stage['error']}" if stage["error"] else ""), file=stream)
+    print(f"time to first listen: {report['first_listen_seconds']:.3f}s", file=stream)
+    for failure in failures:
+        print(f"✗ {failure}", file=stream)
+    if not failures:
+        print("✓ Startup within budget", file=stream)
+
+
+def main(argv=None):
+    config = Config()
+    parser = argparse.ArgumentParser(prog="startup-profile", description=__doc__.splitlines()[2])
+    parser.add_argument("--budget", type=float, default=config.STARTUP_BUDGET_SECONDS,
+                        help="maximum seconds from import to first listen")
+    parser.add_argument("--memory-budget", type=float, default=config.STARTUP_MEMORY_BUDGET_MB,
+                        help="maximum RSS in MB at first listen (0 disables)")
+    parser.add_argument("--subsystems", default=",".join(config.WARMUP_SUBSYSTEMS),
+                        help="comma-separated subsystems to build after the first listen")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    parser.add_argument("--output", default="-", help="JSON report file ('-' for stdout)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    subsystems = [name for name in args.subsystems.split(",") if name]
+
+    if args.child:
+        run_stages(subsystems)
+        return 0
+
+    report = profile(subsystems, top=args.top)
+    failures = check_budget(report, args.budget, args.memory_budget)
+    report["budget"] = {"seconds": args.budget, "memory_mb": args.memory_budget, "failures": failures}
+
+    if args.output == "-":
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    print_summary(report, failures)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
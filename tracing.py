@@ -0,0 +1,221 @@
+"""
+JARVIS Tracing
+Per-utterance latency spans written to a rotating JSONL trace file
+"""
+
+import argparse
+import atexit
+import contextvars
+import glob
+import json
+import logging
+import os
+import queue
+import sys
+import time
+from collections import defaultdict
+from logging.handlers import QueueListener, RotatingFileHandler
+
+_current_span = contextvars.ContextVar("jarvis_span", default=None)
+
+
+class Span:
+    """One timed stage of a turn; use as a context manager.
+
+    Nested spans (on the same thread or asyncio task) share the trace id
+    of the outermost one and point at their parent, so a trace is one
+    JARVIS turn. Durations come from the monotonic perf counter; ``ts``
+    is the wall-clock start, for picking a time window.
+    """
+
+    __slots__ = ("tracer", "name", "attrs", "trace", "id", "parent", "ts", "start", "token")
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        parent = _current_span.get()
+        self.id = os.urandom(8).hex()
+        self.parent = parent.id if parent else None
+        self.trace = parent.trace if parent else self.id
+        self.ts = time.time()
+        self.token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.start
+        _current_span.reset(self.token)
+        record = {
+            "name": self.name,
+            "trace": self.trace,
+            "span": self.id,
+            "parent": self.parent,
+            "ts": self.ts,
+            "duration_ms": duration * 1000
+        }
+        if self.attrs:
+            record["attrs"] = self.attrs
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        self.tracer.emit(record)
+        return False
+
+
+class _NullSpan:
+    """What span() returns while tracing is off"""
+
+    def set(self, **attrs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _SpanRecord:
+    """The part of a logging.LogRecord the trace file handler uses, without its set-up cost"""
+
+    __slots__ = ("msg",)
+
+    def __init__(self, msg):
+        self.msg = msg
+
+
+class _JSONLineFormatter(logging.Formatter):
+    def format(self, record):
+        return json.dumps(record.msg)
+
+
+class Tracer:
+    """Hands finished spans to a background thread that appends them to a rotating file"""
+
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.queue = None
+        self.listener = None
+        self.handler = None
+
+    def configure(self, path, max_bytes=5 * 2**20, backup_count=3):
+        """Start writing spans to path, rotating it at max_bytes into path.1 ... path.N"""
+        self.close()
+        self.path = path
+        self.handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self.handler.setFormatter(_JSONLineFormatter())
+        self.queue = queue.SimpleQueue()
+        self.listener = QueueListener(self.queue, self.handler)
+        self.listener.start()
+        self.enabled = True
+        atexit.register(self.close)
+
+    def span(self, name, **attrs):
+        return Span(self, name, attrs) if self.enabled else NULL_SPAN
+
+    def emit(self, record):
+        # Serialized and written on the listener thread
+        self.queue.put(_SpanRecord(record))
+
+    def close(self):
+        """Write out pending spans and stop tracing"""
+        self.enabled = False
+        if self.listener is not None:
+            self.listener.stop()
+            self.handler.close()
+            self.listener = None
+
+
+tracer = Tracer()
+
+
+def span(name, **attrs):
+    """A span on the process-wide tracer (a no-op unless tracing is configured)"""
+    return tracer.span(name, **attrs)
+
+
+def configure_tracing(config):
+    """Enable the process-wide tracer from TRACE_* settings"""
+    if config.TRACE_ENABLED and not tracer.enabled:
+        tracer.configure(config.TRACE_FILE, config.TRACE_MAX_BYTES, config.TRACE_BACKUP_COUNT)
+
+
+# Summarizing
+
+def read_spans(path, since=None):
+    """Spans from the trace file and its rotated backups, oldest file first"""
+    backups = sorted(glob.glob(f"{glob.escape(path)}.*"),
+                     key=lambda name: int(name.rsplit(".", 1)[1]) if name.rsplit(".", 1)[1].isdigit() else 0,
+                     reverse=True)
+    for name in [*backups, path]:
+        if not os.path.exists(name):
+            continue
+        with open(name, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # A line cut short by a crash
+                if since is None or record["ts"] >= since:
+                    yield record
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else None
+
+
+def summarize(spans):
+    """Count, total and p50/p95/p99/max duration per span name, slowest total first"""
+    durations = defaultdict(list)
+    for record in spans:
+        durations[record["name"]].append(record["duration_ms"])
+    summary = {}
+    for name, values in sorted(durations.items(), key=lambda item: -sum(item[1])):
+        values.sort()
+        summary[name] = {
+            "count": len(values),
+            "total_ms": sum(values),
+            "p50": percentile(values, 0.50),
+            "p95": percentile(values, 0.95),
+            "p99": percentile(values, 0.99),
+            "max": values[-1]
+        }
+    return summary
+
+
+def main(argv=None):
+    from config import Config
+    parser = argparse.ArgumentParser(prog="trace-summary", description="Per-stage latency from the JARVIS trace file")
+    parser.add_argument("--file", default=Config.TRACE_FILE, help="trace file (rotated backups are read too)")
+    parser.add_argument("--window", type=float, default=60, help="minutes of history to include (0 for all)")
+    parser.add_argument("--prefix", default="", help="only spans whose name starts with this")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    since = time.time() - args.window * 60 if args.window else None
+    spans = (record for record in read_spans(args.file, since) if record["name"].startswith(args.prefix))
+    summary = summarize(spans)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return 0
+    if not summary:
+        print(f"No spans in {args.file}" + (f" from the last {args.window:g} minutes" if since else ""))
+        return 0
+    print(f"{'stage':>28} {'count':>7} {'total s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, values in summary.items():
+        print(f"{name:>28} {values['count']:>7} {values['total_ms'] / 1000:>9.2f} " + " ".join(
+            f"{values[key]:>9.1f}" for key in ("p50", "p95", "p99", "max")))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
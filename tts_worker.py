@@ -0,0 +1,229 @@
+"""
+JARVIS Speech Worker
+A thread that owns the text-to-speech engine, fed by a priority queue
+"""
+
+import contextvars
+import itertools
+import queue
+import threading
+
+from metrics import TTS_QUEUE_DEPTH, TTS_SECONDS
+from tracing import span
+
+PRIORITY_URGENT = 0  # Cuts off less urgent speech (emergency alerts)
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2  # Suggestions and chatter; spoken when nothing else is waiting
+
+_STOP = object()
+
+
+class SpeechHandle:
+    """One queued utterance; returned by speak() before it is spoken"""
+
+    __slots__ = ("text", "voice_type", "priority", "context", "done", "spoken", "interrupted")
+
+    def __init__(self, text, voice_type, priority, context=None):
+        self.text = text
+        self.voice_type = voice_type
+        self.priority = priority
+        self.context = context
+        self.done = threading.Event()
+        self.spoken = False
+        self.interrupted = False
+
+    def wait(self, timeout=None):
+        """Block until the utterance has been spoken, cut off or dropped; False on timeout"""
+        return self.done.wait(timeout)
+
+    def cancel(self):
+        """Drop the utterance if it is still queued, or cut it off if it is being spoken"""
+        self.interrupted = True
+
+    def __repr__(self):
+        state = "spoken" if self.spoken else "interrupted" if self.interrupted else "pending"
+        return f"<SpeechHandle {state} {self.text[:30]!r}>"
+
+
+class SpeechWorker:
+    """Speaks queued utterances on one thread, which creates and owns the engine.
+
+    ``speak()`` returns a SpeechHandle straight away. Utterances are spoken
+    most urgent first, then in the order they were queued; an urgent one
+    cuts off less urgent speech. Utterances of the same priority and voice
+    that are waiting together are coalesced into one ``say()`` (identical
+    ones are spoken once), up to ``coalesce_chars``. ``interrupt()`` cuts
+    off the current utterance at the next word and drops the queue, e.g.
+    when the user starts talking. The voice list is read once and each voice type's id
+    is cached; the voice is only switched when it changes.
+
+    ``engine_factory()`` is called on the worker thread (SAPI engines must
+    be used from the thread that created them); ``voice_profiles`` maps a
+    voice type to an index into the engine's voices.
+    """
+
+    def __init__(self, engine_factory, voice_profiles=None, coalesce_chars=400):
+        self.engine_factory = engine_factory
+        self.voice_profiles = voice_profiles or {}
+        self.coalesce_chars = coalesce_chars
+        self.queue = queue.PriorityQueue()
+        self.sequence = itertools.count()
+        self.engine = None
+        self.voice_ids = {}
+        self.current_voice = None
+        self.current = []
+        self.current_priority = None
+        self.pending = 0
+        self.idle = threading.Condition()
+        self.stats = {"queued": 0, "spoken": 0, "interrupted": 0, "failed": 0, "utterances": 0, "coalesced": 0}
+        self.thread = threading.Thread(target=self._run, name="jarvis-speech", daemon=True)
+        self.thread.start()
+        TTS_QUEUE_DEPTH.set_function(self.queue.qsize)
+
+    # Queueing
+
+    def speak(self, text, voice_type=None, priority=PRIORITY_NORMAL):
+        """Queue text and return its SpeechHandle; spans it produces join the caller's trace"""
+        handle = SpeechHandle(text, voice_type, priority, contextvars.copy_context())
+        with self.idle:
+            self.pending += 1
+            self.stats["queued"] += 1
+            preempt = self.current_priority is not None and priority < self.current_priority
+        self.queue.put((priority, next(self.sequence), handle))
+        if preempt:
+            self._cut_off()
+        return handle
+
+    def speaking(self):
+        """The utterances being spoken right now (several if coalesced)"""
+        return list(self.current)
+
+    def busy(self):
+        with self.idle:
+            return self.pending > 0
+
+    def wait(self, timeout=None):
+        """Block until everything queued has been spoken or dropped; False on timeout"""
+        with self.idle:
+            return self.idle.wait_for(lambda: self.pending == 0, timeout)
+
+    def interrupt(self, keep_urgent=True):
+        """Cut off the current utterance and drop the queue (urgent utterances are kept)"""
+        kept = []
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            handle = item[2]
+            if handle is _STOP or (keep_urgent and handle.priority == PRIORITY_URGENT):
+                kept.append(item)
+            else:
+                handle.interrupted = True
+                self._finish(handle)
+        for item in kept:
+            self.queue.put(item)
+        self._cut_off()
+
+    def close(self, timeout=None):
+        """Stop the worker once the queue has been spoken"""
+        self.queue.put((PRIORITY_LOW + 1, next(self.sequence), _STOP))
+        self.thread.join(timeout)
+
+    def _cut_off(self):
+        # Only flagged here: the engine belongs to the worker thread, which stops it at the next word
+        for handle in self.current:
+            handle.interrupted = True
+
+    def _finish(self, handle):
+        handle.done.set()
+        with self.idle:
+            self.stats["spoken" if handle.spoken else "interrupted" if handle.interrupted else "failed"] += 1
+            self.pending -= 1
+            if self.pending == 0:
+                self.idle.notify_all()
+
+    # Worker thread
+
+    def _run(self):
+        try:
+            self.engine = self.engine_factory()
+            voices = self.engine.getProperty('voices') or []
+            self.voice_ids = {
+                voice_type: voices[index].id
+                for voice_type, index in self.voice_profiles.items() if index < len(voices)
+            }
+            self.current_voice = self.engine.getProperty('voice')
+            self.engine.connect('started-word', self._on_word)
+        except Exception as e:
+            print(f"TTS Error: {e}")
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._say(batch)
+
+    def _next_batch(self):
+        """The most urgent utterance plus the waiting ones it can be coalesced with"""
+        while True:
+            priority, _, first = self.queue.get()
+            if first is _STOP:
+                return None
+            if not first.interrupted:
+                break
+            self._finish(first)
+        batch = [first]
+        length = len(first.text)
+        while True:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            handle = item[2]
+            if handle is not _STOP and handle.interrupted:
+                self._finish(handle)
+                continue
+            if (handle is _STOP or handle.priority != priority or handle.voice_type != first.voice_type
+                    or length + len(handle.text) > self.coalesce_chars):
+                self.queue.put(item)
+                break
+            batch.append(handle)
+            length += len(handle.text) + 1
+        return batch
+
+    def _say(self, batch):
+        texts = list(dict.fromkeys(handle.text for handle in batch))
+        text = " ".join(texts)
+        with self.idle:
+            self.current = batch
+            self.current_priority = batch[0].priority
+            self.stats["utterances"] += 1
+            self.stats["coalesced"] += len(batch) - 1
+        said = False
+        try:
+            if self.engine is not None:
+                batch[0].context.run(self._speak_text, text, batch[0].voice_type, len(batch))
+                said = True
+        except Exception as e:
+            print(f"TTS Error: {e}")
+        finally:
+            with self.idle:
+                self.current = []
+                self.current_priority = None
+            for handle in batch:
+                handle.spoken = said and not handle.interrupted
+                self._finish(handle)
+
+    def _speak_text(self, text, voice_type, count):
+        voice = self.voice_ids.get(voice_type)
+        if voice is not None and voice != self.current_voice:
+            self.engine.setProperty('voice', voice)
+            self.current_voice = voice
+        with span("tts.speak", chars=len(text), coalesced=count), TTS_SECONDS.time():
+            self.engine.say(text)
+            self.engine.runAndWait()
+
+    def _on_word(self, name, location, length):
+        # Runs on this thread inside runAndWait, where stopping the engine is always safe
+        if any(handle.interrupted for handle in self.current):
+            self.engine.stop()
@@ -0,0 +1,268 @@
+"""
+JARVIS Voice Pipeline
+Capture, recognition, command handling and speech overlapped on an event loop
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import VOICE_QUEUE_DEPTH
+from tracing import span
+
+Captured = namedtuple("Captured", ["audio", "at"])
+Heard = namedtuple("Heard", ["text", "at", "context", "span"])
+Utterance = namedtuple("Utterance", ["turn", "text", "first", "at", "context"])
+
+STAGES = ("capture", "recognize", "dispatch", "speak")
+
+
+class VoicePipeline:
+    """Voice loop whose stages run concurrently, joined by bounded queues.
+
+    ``capture() -> audio or None`` blocks for at most one phrase;
+    ``recognize(audio) -> text or None`` is speech-to-text;
+    ``handle(text, on_sentence) -> response`` runs a command and may stream
+    sentences through ``on_sentence``; ``speak(text, first)`` says one
+    sentence. Each runs on its own executor, driven by an asyncio task, so
+    the microphone keeps capturing while earlier utterances are still
+    being recognized, handled or spoken.
+
+    Only utterances containing the wake word become commands. One that
+    arrives while JARVIS is still handling or speaking the previous
+    command barges in: queued speech of the old turn is dropped, the
+    sentence being spoken is cut off with ``interrupt()``, and whatever
+    the old handler produces later is ignored (its thread cannot be
+    killed, so it finishes in the background). If recognition falls
+    behind, the oldest captured audio is dropped; the later queues apply
+    backpressure instead. Metrics are kept per stage, with the depth of
+    the queue feeding it.
+
+    Each command is traced as one ``turn`` span: it is opened before
+    recognition, and the stages after it run in its context (speech in a
+    copy taken when the sentence was produced), so the recognition,
+    handler and speech spans of the stages' threads join its trace.
+    """
+
+    def __init__(self, capture, recognize, handle, speak, interrupt=None, wake_word=None, queue_size=4):
+        self.capture = capture
+        self.recognize = recognize
+        self.handle = handle
+        self.speak = speak
+        self.interrupt = interrupt
+        self.wake_word = wake_word.lower() if wake_word else None
+        self.queue_size = queue_size
+        # The dispatch stage has a spare worker for a handler abandoned by a barge-in
+        self.executors = {
+            stage: ThreadPoolExecutor(max_workers=2 if stage == "dispatch" else 1,
+                                      thread_name_prefix=f"jarvis-{stage}")
+            for stage in STAGES
+        }
+        self.metrics = {
+            stage: {"processed": 0, "dropped": 0, "max_depth": 0, "busy_seconds": 0.0}
+            for stage in STAGES
+        }
+        self.latencies = []
+        self.barge_ins = 0
+        self.turn = 0
+        self.handling = None
+        self.speaking = False
+        self.stopped = threading.Event()
+        self.loop = None
+        self.queues = {}
+        self.futures = set()
+        self._stop_requested = None
+
+    # Running
+
+    async def run(self):
+        """Run until stop() is called or the task is cancelled"""
+        self.loop = asyncio.get_running_loop()
+        self._stop_requested = asyncio.Event()
+        # Each stage after capture reads from its own queue
+        self.queues = {stage: asyncio.Queue(self.queue_size) for stage in STAGES[1:]}
+        for stage, queue in self.queues.items():
+            VOICE_QUEUE_DEPTH.set_function(queue.qsize, stage=stage)
+        tasks = [
+            asyncio.create_task(self._stage(stage, step), name=f"jarvis-{stage}")
+            for stage, step in (("capture", self._capture), ("recognize", self._recognize),
+                                ("dispatch", self._dispatch), ("speak", self._speak))
+        ]
+        try:
+            await self._stop_requested.wait()
+        finally:
+            self.stopped.set()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # Work not started yet is dropped; running calls finish in the background
+            for future in list(self.futures):
+                future.cancel()
+            for executor in self.executors.values():
+                executor.shutdown(wait=False)
+
+    def stop(self):
+        """Stop the pipeline; safe to call from any thread"""
+        self.stopped.set()
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(self._stop_requested.set)
+
+    async def _stage(self, stage, step):
+        while True:
+            try:
+                await step()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Voice pipeline {stage} error: {e}")
+
+    async def _in_executor(self, stage, function, *args):
+        start = time.perf_counter()
+        future = self.executors[stage].submit(function, *args)
+        self.futures.add(future)
+        future.add_done_callback(self.futures.discard)
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            self.metrics[stage]["busy_seconds"] += time.perf_counter() - start
+
+    def _enqueue(self, stage, item):
+        queue = self.queues[stage]
+        if queue.full():
+            # The newest speech matters more than the oldest
+            queue.get_nowait()
+            self.metrics[stage]["dropped"] += 1
+        queue.put_nowait(item)
+        self.metrics[stage]["max_depth"] = max(self.metrics[stage]["max_depth"], queue.qsize())
+
+    async def _put(self, stage, item):
+        await self.queues[stage].put(item)
+        self.metrics[stage]["max_depth"] = max(self.metrics[stage]["max_depth"], self.queues[stage].qsize())
+
+    def _put_from_thread(self, stage, item):
+        """Queue item from a handler thread, waiting for room unless the pipeline stops"""
+        future = asyncio.run_coroutine_threadsafe(self._put(stage, item), self.loop)
+        while not self.stopped.is_set():
+            try:
+                return future.result(timeout=0.5)
+            except concurrent.futures.TimeoutError:
+                continue
+        future.cancel()
+
+    # Stages
+
+    async def _capture(self):
+        audio = await self._in_executor("capture", self.capture)
+        if audio is not None:
+            self.metrics["capture"]["processed"] += 1
+            self._enqueue("recognize", Captured(audio, time.perf_counter()))
+
+    async def _recognize(self):
+        captured = await self.queues["recognize"].get()
+        context = contextvars.copy_context()
+        turn = span("turn")
+        context.run(turn.__enter__)
+        text = await self._in_executor("recognize", context.run, self.recognize, captured.audio)
+        self.metrics["recognize"]["processed"] += 1
+        if not text or (self.wake_word and self.wake_word not in text.lower()):
+            # Not a command, so not a turn: the span is dropped unfinished and never written
+            return
+        if self.busy():
+            self.barge_in()
+        await self._put("dispatch", Heard(text, captured.at, context, turn))
+
+    async def _dispatch(self):
+        heard = await self.queues["dispatch"].get()
+        self.turn += 1
+        turn = self.turn
+        streamed = []
+
+        def on_sentence(sentence):
+            if turn == self.turn:
+                utterance = Utterance(turn, sentence, not streamed, heard.at, contextvars.copy_context())
+                self._put_from_thread("speak", utterance)
+                streamed.append(sentence)
+
+        def handle_turn():
+            # Runs in the turn's context; the span ends with the handler, even one abandoned by a barge-in
+            try:
+                response = self.handle(heard.text, on_sentence)
+            except BaseException as e:
+                heard.span.__exit__(type(e), e, e.__traceback__)
+                raise
+            speech_context = contextvars.copy_context()
+            heard.span.__exit__(None, None, None)
+            return response, speech_context
+
+        self.handling = asyncio.ensure_future(
+            self._in_executor("dispatch", heard.context.run, handle_turn)
+        )
+        try:
+            response, speech_context = await self.handling
+        except asyncio.CancelledError:
+            if self.stopped.is_set():
+                raise
+            return  # Barged in
+        finally:
+            self.metrics["dispatch"]["processed"] += 1
+        if response and not streamed and turn == self.turn:
+            await self._put("speak", Utterance(turn, response, True, heard.at, speech_context))
+
+    async def _speak(self):
+        utterance = await self.queues["speak"].get()
+        if utterance.turn != self.turn:
+            return
+        if utterance.first:
+            self.latencies.append(time.perf_counter() - utterance.at)
+        self.speaking = True
+        try:
+            await self._in_executor("speak", utterance.context.run, self.speak, utterance.text, utterance.first)
+        finally:
+            self.speaking = False
+            self.metrics["speak"]["processed"] += 1
+
+    # Barge-in
+
+    def busy(self):
+        """Whether a command is still being handled or spoken"""
+        handling = self.handling is not None and not self.handling.done()
+        return handling or self.speaking or not self.queues["speak"].empty()
+
+    def barge_in(self):
+        """Abandon the current turn: drop its queued speech and cut off the current sentence"""
+        self.barge_ins += 1
+        self.turn += 1
+        if self.handling is not None and not self.handling.done():
+            self.handling.cancel()
+        queue = self.queues["speak"]
+        while not queue.empty():
+            queue.get_nowait()
+            self.metrics["speak"]["dropped"] += 1
+        if self.speaking and self.interrupt:
+            try:
+                self.interrupt()
+            except Exception as e:
+                print(f"Voice pipeline interrupt error: {e}")
+
+    # Metrics
+
+    def stats(self):
+        """Per-stage counters and current queue depth, barge-ins and response latency"""
+        stages = {}
+        for stage in STAGES:
+            stages[stage] = dict(self.metrics[stage])
+            stages[stage]["busy_seconds"] = round(stages[stage]["busy_seconds"], 3)
+            queue = self.queues.get(stage)
+            stages[stage]["depth"] = queue.qsize() if queue is not None else 0
+        latencies = sorted(self.latencies)
+        return {
+            "stages": stages,
+            "barge_ins": self.barge_ins,
+            "turns": self.turn - self.barge_ins,
+            "latency_p50": latencies[len(latencies) // 2] if latencies else None,
+            "latency_p95": latencies[int(len(latencies) * 0.95)] if latencies else None
+        }